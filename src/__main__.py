@@ -0,0 +1,23 @@
+"""Command-line entry point for multi-report commands.
+
+Usage:
+    python -m src report --week 5 --matrix --rankings --predict
+    python -m src report --help
+"""
+import argparse
+
+from src import report
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m src', description='Fantasy basketball reports')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    report.add_arguments(subparsers.add_parser(
+        'report', help='Matrix, rankings and predictions for a week from one fetch'))
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
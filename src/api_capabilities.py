@@ -3,10 +3,11 @@
 Usage:
     python -m src.api_capabilities
 """
-from yahoo_oauth import OAuth2
-import yahoo_fantasy_api as yfa
+import argparse
 import json
 
+from src.auth import add_league_arguments, league_from_args
+
 
 def test_stat_categories(lg):
     """What stat categories are tracked?"""
@@ -80,10 +81,12 @@ def test_league_methods(lg):
 
 
 def main():
-    sc = OAuth2(None, None, from_file='oauth2.json')
-    gm = yfa.Game(sc, 'nba')
-    league_id = '466.l.51741'
-    lg = gm.to_league(league_id)
+    parser = argparse.ArgumentParser(description='Test yahoo_fantasy_api capabilities')
+    add_league_arguments(parser)
+    args = parser.parse_args()
+
+    # Authenticate
+    lg = league_from_args(args)
 
     print("\n" + "=" * 80)
     print("YAHOO FANTASY API CAPABILITIES TEST")
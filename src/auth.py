@@ -2,32 +2,107 @@
 
 Place your `oauth2.json` (with consumer_key and consumer_secret) in the project root.
 Run this to perform the first-time authorization which opens a browser.
+
+Sessions are shared per process (see src.session): repeated get_oauth or
+get_league calls reuse one token and one pooled HTTP connection, and the
+token is refreshed before it expires.
+
+yahoo_fantasy_api, yahoo_oauth and requests are imported only when a league
+or session is actually built, so analysis modules that import this one for
+its argparse helpers start without the network stack.
 """
 
-from yahoo_oauth import OAuth2
-import logging
 import os
 
+from src.profiling import add_profile_arguments, span
+from src.response_cache import DEFAULT_CACHE_DIR, DEFAULT_LIVE_TTL, ResponseCache
+from src.scheduler import DEFAULT_RATE, configure_scheduler
+
+
+LEAGUE_ID = '466.l.51741'
+
 
-def get_oauth(from_file: str = "oauth2.json") -> OAuth2:
-    """Create and return an OAuth2 object using the provided credentials file.
+def get_oauth(from_file: str = "oauth2.json") -> "OAuth2":
+    """Return the shared OAuth2 session for the provided credentials file.
 
     Args:
         from_file: Path to the oauth2.json file (relative to project root by default).
 
     Returns:
-        OAuth2 instance (may open a browser on first run to authorize).
+        OAuth2 instance (may open a browser on first run to authorize). The
+        same instance is returned for the same file for the rest of the process.
     """
     if not os.path.exists(from_file):
         raise FileNotFoundError(f"OAuth credentials file not found: {from_file}")
 
-    # oauth2 library will manage token storage automatically (in ~/.config or token file)
-    sc = OAuth2(None, None, from_file=from_file)
-    if not sc.token_is_valid():
-        logging.info("OAuth token not valid; this will open a browser to authorize.")
-        sc.refresh_access_token()
+    from src.session import shared_oauth
+
+    # Tokens are kept fresh in memory and saved back to from_file
+    return shared_oauth(from_file)
+
+
+def get_league(league_id: str = LEAGUE_ID, from_file: str = "oauth2.json",
+               record_dir: str = None, replay_dir: str = None, cache_dir: str = None,
+               cache_ttl: float = None) -> "yfa.League":
+    """Create a League handle, optionally recording or replaying raw responses.
+
+    Args:
+        league_id: Yahoo league key.
+        from_file: Path to the oauth2.json file.
+        record_dir: If set, every API response is also saved to this directory.
+        replay_dir: If set, responses are served from this directory and no
+            OAuth or network access happens at all.
+        cache_dir: If set, responses are cached on disk (see
+            src.response_cache) and OAuth is only set up on a cache miss.
+        cache_ttl: Seconds to reuse cached responses for live weeks.
+
+    Returns:
+        yahoo_fantasy_api League instance.
+    """
+    with span('import'):
+        import yahoo_fantasy_api as yfa
+        from src.recording import RecordingHandler, ReplayHandler
+        from src.session import SessionHandler
+
+    if replay_dir:
+        return yfa.League(None, league_id, handler=ReplayHandler(replay_dir))
+
+    options = {}
+    if cache_dir:
+        sc = None
+        options['cache'] = ResponseCache(cache_dir, DEFAULT_LIVE_TTL if cache_ttl is None else cache_ttl)
+        options['connect'] = lambda: get_oauth(from_file)
+    else:
+        sc = get_oauth(from_file)
+
+    handler = RecordingHandler(sc, record_dir, **options) if record_dir else SessionHandler(sc, **options)
+    return yfa.League(sc, league_id, handler=handler)
+
+
+def add_league_arguments(parser):
+    """Add the --record/--replay/--rate/--cache/--profile options shared by every league script."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--record', type=str, default=None, metavar='DIR',
+                       help='Save raw Yahoo responses to DIR while running')
+    group.add_argument('--replay', type=str, default=None, metavar='DIR',
+                       help='Serve Yahoo responses recorded in DIR (no OAuth or network)')
+    parser.add_argument('--rate', type=float, default=None, metavar='PER_SECOND',
+                        help='Yahoo requests per second allowed by the request scheduler '
+                             f'(default: {DEFAULT_RATE:g})')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_DIR, default=None, metavar='DIR',
+                        help='Cache Yahoo responses on disk: final weeks and league settings for good, '
+                             f'live weeks for --cache-ttl seconds (default DIR: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-ttl', type=float, default=None, metavar='SECONDS',
+                        help=f'How long cached live responses are reused (default: {DEFAULT_LIVE_TTL})')
+    add_profile_arguments(parser)
+
 
-    return sc
+def league_from_args(args) -> "yfa.League":
+    """Build the League handle described by add_league_arguments options."""
+    if args.rate is not None:
+        configure_scheduler(rate=args.rate, burst=max(1, round(args.rate * 2)))
+    return get_league(record_dir=args.record, replay_dir=args.replay,
+                      cache_dir=args.cache, cache_ttl=args.cache_ttl)
 
 
 if __name__ == "__main__":
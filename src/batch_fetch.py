@@ -0,0 +1,127 @@
+"""Batched team-week fetches through the raw Yahoo handler.
+
+lg.matchups(week=w) costs one request per week, and per-team lookups one per
+team per week. Yahoo's collection URLs take many teams and many weeks at
+once:
+
+    league/{league_key}/teams/matchups;weeks=1,2,3
+    teams;team_keys=K1,K2,.../matchups;weeks=1,2,3
+
+Each team's matchup for a week carries both teams' stat lines in the same
+shape as a scoreboard matchup, so the results parse with
+src.scoreboard.parse_matchups into the usual week tables. Every matchup comes
+back once per side and is kept once. Team keys are chunked to TEAM_CHUNK per
+request (Yahoo's collection limit) and weeks to WEEK_CHUNK, so a season of
+one league is one or two requests, and a multi-league corpus one per 25
+teams per chunk of weeks.
+
+Player stats already go through lg.player_stats, which batches 25 players
+per request.
+
+Usage:
+    from src.batch_fetch import fetch_league_weeks, fetch_team_weeks
+    tables = fetch_league_weeks(lg, range(1, 21))            # {week: table}
+    corpus = fetch_team_weeks(lg.yhandler, team_keys, weeks)  # {league_key: {week: table}}
+"""
+from src.prefetch import DEFAULT_MAX_WORKERS, map_weeks
+from src.scoreboard import get_team_key, parse_matchups
+
+# Yahoo caps collection keys per request at 25
+TEAM_CHUNK = 25
+WEEK_CHUNK = 25
+
+
+def chunked(items, size):
+    """Split items into consecutive lists of at most size."""
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def league_matchups_uri(league_key, weeks):
+    """URI for every team's matchups in weeks of one league."""
+    return f"league/{league_key}/teams/matchups;weeks={','.join(map(str, weeks))}"
+
+
+def teams_matchups_uri(team_keys, weeks):
+    """URI for the matchups in weeks of any set of team keys (any leagues)."""
+    return f"teams;team_keys={','.join(team_keys)}/matchups;weeks={','.join(map(str, weeks))}"
+
+
+def league_key_of(team_key):
+    """'466.l.51741.t.3' -> '466.l.51741'."""
+    return team_key.rsplit('.t.', 1)[0]
+
+
+def teams_container(raw):
+    """The teams collection of a league-scoped or top-level teams payload."""
+    content = raw['fantasy_content']
+    if 'teams' in content:
+        return content['teams']
+    return content['league'][1]['teams']
+
+
+def collect_matchups(container, by_week):
+    """Add each team's matchups to by_week: {week: {pair: matchup}}.
+
+    pair is the sorted pair of team keys, so the copy of a matchup returned
+    for the opponent is dropped.
+    """
+    for i in range(int(container['count'])):
+        team_data = container[str(i)]['team']
+        matchups = next((item['matchups'] for item in team_data[1:]
+                         if isinstance(item, dict) and 'matchups' in item), None)
+        if matchups is None:
+            continue
+
+        for j in range(int(matchups['count'])):
+            matchup = matchups[str(j)]['matchup']
+            teams = matchup['0']['teams']
+            pair = tuple(sorted(get_team_key(teams[side]['team']) for side in ('0', '1')))
+            by_week.setdefault(int(matchup['week']), {}).setdefault(pair, matchup)
+
+
+def week_tables(by_week):
+    """{week: parsed team-week table} from collected matchups."""
+    tables = {}
+    for week in sorted(by_week):
+        matchups = list(by_week[week].values())
+        container = {str(i): {'matchup': matchup} for i, matchup in enumerate(matchups)}
+        container['count'] = len(matchups)
+        tables[week] = parse_matchups(container, week)
+    return tables
+
+
+def fetch_league_weeks(lg, weeks, week_chunk=WEEK_CHUNK, max_workers=DEFAULT_MAX_WORKERS):
+    """{week: table} for every team in lg over weeks, WEEK_CHUNK weeks per request."""
+    chunks = chunked(sorted(set(weeks)), week_chunk)
+    raw = map_weeks(lambda c: lg.yhandler.get(league_matchups_uri(lg.league_id, chunks[c])),
+                    range(len(chunks)), max_workers)
+
+    by_week = {}
+    for payload in raw.values():
+        collect_matchups(teams_container(payload), by_week)
+    return week_tables(by_week)
+
+
+def fetch_team_weeks(yhandler, team_keys, weeks, team_chunk=TEAM_CHUNK, week_chunk=WEEK_CHUNK,
+                     max_workers=DEFAULT_MAX_WORKERS):
+    """{league_key: {week: table}} for team_keys (from any leagues) over weeks.
+
+    Each table holds the matchups involving at least one of team_keys.
+    Requests cover team_chunk teams by week_chunk weeks each.
+    """
+    requests = [
+        teams_matchups_uri(keys, week_group)
+        for keys in chunked(sorted(set(team_keys)), team_chunk)
+        for week_group in chunked(sorted(set(weeks)), week_chunk)
+    ]
+    raw = map_weeks(lambda r: yhandler.get(requests[r]), range(len(requests)), max_workers)
+
+    by_league = {}
+    for payload in raw.values():
+        container = teams_container(payload)
+        for i in range(int(container['count'])):
+            league_key = league_key_of(get_team_key(container[str(i)]['team']))
+            collect_matchups({'0': container[str(i)], 'count': 1}, by_league.setdefault(league_key, {}))
+
+    return {league_key: week_tables(by_week) for league_key, by_week in by_league.items()}
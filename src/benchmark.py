@@ -0,0 +1,234 @@
+"""Benchmarks for the analytics core on synthetic leagues.
+
+For each league size a seeded synthetic league (src.synthetic) is generated
+and these stages are timed on its last week:
+
+    parse         parse_scoreboard of the raw payload
+    matrix        generate_possibility_matrix
+    rankings      rank_teams_by_category
+    insights      analyze_matrix_insights (output discarded)
+    predict       predict_matchup for every matchup, season-total method
+
+Each stage runs --repeat times; the best and median times are kept. Startup
+is timed too: importing every offline analysis module in a fresh interpreter,
+best of --repeat, which fails the run if it exceeds --startup-budget seconds.
+Results are written as JSON, and --compare reports stages (and startup) that
+got slower than an earlier results file by more than --threshold.
+
+Usage:
+    python -m src.benchmark
+    python -m src.benchmark --teams 10 100 1000 --weeks 20 --output bench.json
+    python -m src.benchmark --compare bench.json --threshold 1.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.category_rankings import rank_teams_by_category
+from src.deltas import apply_exact_percentages
+from src.possibility_matrix import analyze_matrix_insights, generate_possibility_matrix
+from src.predict_matchups import predict_matchup
+from src.rolling import RollingAggregator
+from src.scoreboard import parse_scoreboard, scheduled_matchups, team_rows, teams_by_name
+from src.synthetic import generate_league
+
+DEFAULT_TEAMS = [10, 100, 1000]
+DEFAULT_WEEKS = 20
+DEFAULT_REPEAT = 3
+DEFAULT_SEED = 2025
+DEFAULT_OUTPUT = 'benchmark.json'
+DEFAULT_THRESHOLD = 1.25
+
+# Seconds to import every offline module in a fresh interpreter; numpy is
+# most of it (about 0.1s here, 0.25s before the network stack was made lazy)
+STARTUP_BUDGET = 0.5
+
+# Modules cron jobs and notebooks import for offline analysis, and the
+# network stack they must not pull in
+OFFLINE_MODULES = [
+    'src.report', 'src.possibility_matrix', 'src.category_rankings', 'src.predict_matchups',
+    'src.simulate_matchups', 'src.project_playoffs', 'src.trade_impact', 'src.season_store',
+    'src.season_matrix', 'src.live_matrix', 'src.current_matchups', 'src.ingest',
+]
+NETWORK_MODULES = ['yahoo_oauth', 'yahoo_fantasy_api', 'requests', 'rauth']
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def time_stage(fn, repeat):
+    """(best, median) seconds over repeat calls of fn."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times), statistics.median(times)
+
+
+def import_offline_modules():
+    """Import OFFLINE_MODULES in a fresh interpreter: {'elapsed': seconds, 'loaded': network modules}."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"for name in {OFFLINE_MODULES!r}:\n"
+        "    __import__(name)\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {NETWORK_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def league_stages(num_teams, num_weeks, seed):
+    """{stage: zero-argument callable} for one synthetic league."""
+    scoreboards = generate_league(num_teams, num_weeks, seed)
+    raw = scoreboards[num_weeks]
+    table = parse_scoreboard(raw)
+    teams = teams_by_name(table)
+    exact_teams = teams_by_name(apply_exact_percentages(parse_scoreboard(raw)))
+    matrix = generate_possibility_matrix(exact_teams)
+    matchups = scheduled_matchups(table)
+    history = {week: team_rows(parse_scoreboard(scoreboards[week])) for week in range(1, num_weeks)}
+
+    def insights():
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyze_matrix_insights(matrix, exact_teams)
+
+    def predict():
+        week_store = dict(history)
+        aggregator = RollingAggregator()
+        for matchup in matchups:
+            predict_matchup(None, matchup, num_weeks, 'total', week_store, aggregator)
+
+    return {
+        'parse': lambda: parse_scoreboard(raw),
+        'matrix': lambda: generate_possibility_matrix(exact_teams),
+        'rankings': lambda: rank_teams_by_category(teams),
+        'insights': insights,
+        'predict': predict,
+    }
+
+
+def run_benchmarks(team_counts=DEFAULT_TEAMS, num_weeks=DEFAULT_WEEKS, repeat=DEFAULT_REPEAT, seed=DEFAULT_SEED,
+                   stages=None):
+    """Time every stage at every league size; returns the results document."""
+    results = []
+    startup = None
+    if not stages or 'startup' in stages:
+        startup = min(import_offline_modules()['elapsed'] for _ in range(repeat))
+
+    for num_teams in team_counts:
+        for stage, fn in league_stages(num_teams, num_weeks, seed).items():
+            if stages and stage not in stages:
+                continue
+            best, median = time_stage(fn, repeat)
+            results.append({'teams': num_teams, 'weeks': num_weeks, 'stage': stage,
+                            'best': best, 'median': median, 'repeat': repeat})
+
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'seed': seed,
+        'startup': startup,
+        'results': results,
+    }
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """[(teams, stage, old, new)] for stages whose best time grew by more than threshold×.
+
+    Startup is reported with teams None.
+    """
+    old = {(r['teams'], r['weeks'], r['stage']): r['best'] for r in baseline['results']}
+    regressions = []
+    if current.get('startup') and baseline.get('startup') and current['startup'] > baseline['startup'] * threshold:
+        regressions.append((None, 'startup', baseline['startup'], current['startup']))
+    for r in current['results']:
+        key = (r['teams'], r['weeks'], r['stage'])
+        if key in old and r['best'] > old[key] * threshold:
+            regressions.append((r['teams'], r['stage'], old[key], r['best']))
+    return regressions
+
+
+def display_results(document):
+    """Print one row per league size with the best time of each stage."""
+    stages = list(dict.fromkeys(r['stage'] for r in document['results']))
+    best = {(r['teams'], r['stage']): r['best'] for r in document['results']}
+    sizes = list(dict.fromkeys(r['teams'] for r in document['results']))
+
+    if document.get('startup') is not None:
+        print(f"\nStartup (offline imports): {document['startup'] * 1000:.1f}ms")
+    if not stages:
+        return
+
+    print(f"\n{'Teams':>7}" + "".join(f"{stage:>12}" for stage in stages))
+    print("─" * (7 + 12 * len(stages)))
+    for num_teams in sizes:
+        print(f"{num_teams:>7}" + "".join(f"{best[(num_teams, stage)] * 1000:>10.2f}ms" for stage in stages))
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the analytics core on synthetic leagues')
+    parser.add_argument('--teams', type=int, nargs='+', default=DEFAULT_TEAMS,
+                        help=f'League sizes to run (even; default: {" ".join(map(str, DEFAULT_TEAMS))})')
+    parser.add_argument('--weeks', type=int, default=DEFAULT_WEEKS,
+                        help=f'Weeks per league; the last one is benchmarked (default: {DEFAULT_WEEKS})')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'Runs per stage (default: {DEFAULT_REPEAT})')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f'Seed for the synthetic leagues (default: {DEFAULT_SEED})')
+    parser.add_argument('--stage', action='append', default=None,
+                        choices=['startup', 'parse', 'matrix', 'rankings', 'insights', 'predict'],
+                        help='Only run this stage (repeatable)')
+    parser.add_argument('--output', type=str, default=DEFAULT_OUTPUT,
+                        help=f'Results JSON file (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--compare', type=str, default=None, metavar='JSON',
+                        help='Earlier results to check for regressions')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Slowdown factor counted as a regression (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--startup-budget', type=float, default=STARTUP_BUDGET, metavar='SECONDS',
+                        help=f'Fail if offline imports take longer (default: {STARTUP_BUDGET})')
+    args = parser.parse_args()
+
+    document = run_benchmarks(args.teams, args.weeks, args.repeat, args.seed, args.stage)
+    display_results(document)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    print(f"Results written to {args.output}.")
+
+    failed = False
+    if document['startup'] is not None and document['startup'] > args.startup_budget:
+        print(f"STARTUP over budget: {document['startup'] * 1000:.1f}ms > {args.startup_budget * 1000:.0f}ms")
+        failed = True
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(document, baseline, args.threshold)
+        for num_teams, stage, old, new in regressions:
+            where = f" @ {num_teams} teams" if num_teams is not None else ""
+            print(f"REGRESSION {stage}{where}: {old * 1000:.2f}ms -> {new * 1000:.2f}ms")
+        if regressions:
+            failed = True
+        else:
+            print(f"No stage slower than {args.threshold}x {args.compare}.")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
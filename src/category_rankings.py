@@ -3,103 +3,22 @@
 Usage:
     python -m src.category_rankings
     python -m src.category_rankings --week 1
+    python -m src.category_rankings --week 1 --replay recordings/week1
 """
-from yahoo_oauth import OAuth2
-import yahoo_fantasy_api as yfa
 import argparse
 
-
-def parse_team_stats(team_data):
-    """Extract stats from team data structure."""
-    stats = {}
-
-    if not isinstance(team_data, list) or len(team_data) < 2:
-        return stats
-
-    stats_container = team_data[1]
-
-    if not isinstance(stats_container, dict) or 'team_stats' not in stats_container:
-        return stats
-
-    team_stats = stats_container['team_stats']
-
-    if 'stats' not in team_stats:
-        return stats
-
-    stat_map = {
-        '9004003': 'fgm_fga',
-        '5': 'fg_pct',
-        '9007006': 'ftm_fta',
-        '8': 'ft_pct',
-        '10': '3ptm',
-        '12': 'pts',
-        '15': 'reb',
-        '16': 'ast',
-        '17': 'st',
-        '18': 'blk',
-        '19': 'to'
-    }
-
-    for stat_item in team_stats['stats']:
-        stat = stat_item['stat']
-        stat_id = stat['stat_id']
-        if stat_id in stat_map:
-            stats[stat_map[stat_id]] = stat['value']
-
-    return stats
-
-
-def get_team_name(team_data):
-    """Extract team name from team data."""
-    if not isinstance(team_data, list) or len(team_data) < 1:
-        return "Unknown Team"
-
-    metadata = team_data[0]
-    if not isinstance(metadata, list):
-        return "Unknown Team"
-
-    for item in metadata:
-        if isinstance(item, dict) and 'name' in item:
-            return item['name']
-
-    return "Unknown Team"
+from src.auth import LEAGUE_ID, add_league_arguments, league_from_args
+from src.profiling import timed
+from src.scoreboard import parse_matchups, parse_scoreboard, teams_by_name
+from src.season_store import open_store, has_week, load_teams_by_name
 
 
 def extract_all_teams(matchups_container):
     """Extract all 10 teams from the 5 matchups."""
-    teams = {}
-
-    matchup_count = int(matchups_container['count'])
-
-    for i in range(matchup_count):
-        matchup_data = matchups_container[str(i)]
-        matchup_teams = matchup_data['matchup']['0']['teams']
-
-        # Get both teams from this matchup
-        for team_idx in ['0', '1']:
-            team_data = matchup_teams[team_idx]['team']
-            team_name = get_team_name(team_data)
-            team_stats = parse_team_stats(team_data)
-
-            # Convert stats to floats
-            processed_stats = {}
-            for stat_key, stat_value in team_stats.items():
-                if stat_key in ['fg_pct', 'ft_pct', '3ptm', 'pts', 'reb', 'ast', 'st', 'blk', 'to']:
-                    # Skip empty values or convert to float
-                    if stat_value and stat_value.strip():
-                        try:
-                            processed_stats[stat_key] = float(stat_value)
-                        except ValueError:
-                            print(f"Warning: Could not convert '{stat_key}' value '{stat_value}' for team '{team_name}'")
-                            processed_stats[stat_key] = 0.0
-                    else:
-                        processed_stats[stat_key] = 0.0
-
-            teams[team_name] = processed_stats
-
-    return teams
+    return teams_by_name(parse_matchups(matchups_container))
 
 
+@timed('compute')
 def rank_teams_by_category(teams):
     """Rank all teams (1-10) for each stat category.
 
@@ -142,6 +61,7 @@ def calculate_average_rank(team_rankings):
     return avg_ranks
 
 
+@timed('render')
 def display_rankings_matrix(teams, rankings, week):
     """Display the 10x9 rankings matrix."""
     print(f"\n{'=' * 110}")
@@ -188,6 +108,7 @@ def display_rankings_matrix(teams, rankings, week):
     print("=" * 110)
 
 
+@timed('render')
 def display_detailed_rankings(teams, rankings, week):
     """Display rankings with actual stat values."""
     print(f"\n{'=' * 130}")
@@ -223,6 +144,7 @@ def display_detailed_rankings(teams, rankings, week):
             print(f"  {rank:2}. {team_display:<35} {stat_value:>8}")
 
 
+@timed('render')
 def analyze_category_strengths(rankings):
     """Identify each team's category strengths and weaknesses."""
     print(f"\n{'=' * 130}")
@@ -254,37 +176,41 @@ def analyze_category_strengths(rankings):
 def main():
     parser = argparse.ArgumentParser(description='Generate category rankings matrix for a given week')
     parser.add_argument('--week', type=int, default=None, help='Week number (default: current week)')
+    parser.add_argument('--db', type=str, default=None,
+                        help='Read from the local season store (see src.season_store) when the week is stored')
+    add_league_arguments(parser)
     args = parser.parse_args()
 
-    # Authenticate
-    sc = OAuth2(None, None, from_file='oauth2.json')
-    gm = yfa.Game(sc, 'nba')
-    league_id = '466.l.51741'
-    lg = gm.to_league(league_id)
+    conn = open_store(args.db) if args.db else None
+    stored = conn is not None and args.week is not None and has_week(conn, LEAGUE_ID, args.week)
+
+    lg = None
+    if not stored:
+        lg = league_from_args(args)
 
     # Get week to analyze
     if args.week is None:
         week = lg.current_week()
         print(f"No week specified, using current week: {week}")
+        stored = conn is not None and has_week(conn, LEAGUE_ID, week)
     else:
         week = args.week
         print(f"Fetching data for Week {week}...")
 
-    # Get matchups for specified week
-    try:
-        raw_matchups = lg.matchups(week=week)
-    except Exception as e:
-        print(f"Error fetching week {week} data: {e}")
-        print("Try a different week number.")
-        return
-
-    # Navigate to the actual matchups data
-    league_data = raw_matchups['fantasy_content']['league']
-    scoreboard = league_data[1]['scoreboard']
-    matchups_container = scoreboard['0']['matchups']
-
-    # Extract all 10 teams
-    teams = extract_all_teams(matchups_container)
+    if stored:
+        print(f"Loading Week {week} from {args.db}...")
+        teams = load_teams_by_name(conn, LEAGUE_ID, week)
+    else:
+        # Get matchups for specified week
+        try:
+            raw_matchups = lg.matchups(week=week)
+        except Exception as e:
+            print(f"Error fetching week {week} data: {e}")
+            print("Try a different week number.")
+            return
+
+        # Extract all 10 teams
+        teams = teams_by_name(parse_scoreboard(raw_matchups))
 
     if not teams or len(teams) == 0:
         print(f"No data found for Week {week}. The week may not have started yet.")
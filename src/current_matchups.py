@@ -2,88 +2,23 @@
 
 Usage:
     python -m src.current_matchups
-"""
-from yahoo_oauth import OAuth2
-import yahoo_fantasy_api as yfa
-
-
-def parse_team_stats(team_data):
-    """Extract stats from team data structure."""
-    stats = {}
-
-    # team_data is a list with two elements:
-    # [0] = list of dicts with metadata (team_key, name, etc.)
-    # [1] = dict with team_stats, team_points, etc.
-
-    if not isinstance(team_data, list) or len(team_data) < 2:
-        return stats
-
-    # Get the second element which contains team_stats
-    stats_container = team_data[1]
-
-    if not isinstance(stats_container, dict) or 'team_stats' not in stats_container:
-        return stats
-
-    team_stats = stats_container['team_stats']
-
-    if 'stats' not in team_stats:
-        return stats
-
-    # Parse each stat
-    stat_map = {
-        '9004003': 'fgm_fga',
-        '5': 'fg_pct',
-        '9007006': 'ftm_fta',
-        '8': 'ft_pct',
-        '10': '3ptm',
-        '12': 'pts',
-        '15': 'reb',
-        '16': 'ast',
-        '17': 'st',
-        '18': 'blk',
-        '19': 'to'
-    }
+    python -m src.current_matchups --watch 60
 
-    for stat_item in team_stats['stats']:
-        stat = stat_item['stat']
-        stat_id = stat['stat_id']
-        if stat_id in stat_map:
-            stats[stat_map[stat_id]] = stat['value']
-
-    return stats
-
-
-def get_team_name(team_data):
-    """Extract team name from team data."""
-    # team_data[0] is a list of dicts with metadata
-    if not isinstance(team_data, list) or len(team_data) < 1:
-        return "Unknown Team"
-
-    metadata = team_data[0]
-    if not isinstance(metadata, list):
-        return "Unknown Team"
-
-    for item in metadata:
-        if isinstance(item, dict) and 'name' in item:
-            return item['name']
-
-    return "Unknown Team"
-
-
-def get_team_key(team_data):
-    """Extract team key from team data."""
-    if not isinstance(team_data, list) or len(team_data) < 1:
-        return None
-
-    metadata = team_data[0]
-    if not isinstance(metadata, list):
-        return None
+With --watch the script keeps one league session and polls the current
+week's scoreboard every INTERVAL seconds. Each team's stat block is hashed;
+matchups whose teams did not change are skipped, and only categories whose
+leader flipped are printed. Once the week is final (postevent) the interval
+doubles up to an hour until the next week's scoreboard appears.
+"""
+import argparse
+import time
 
-    for item in metadata:
-        if isinstance(item, dict) and 'team_key' in item:
-            return item['team_key']
+from src.auth import add_league_arguments, league_from_args
+from src.profiling import timed
+from src.scoreboard import parse_scoreboard, row_stats
 
-    return None
+# Longest wait between polls once the week is final
+DEFAULT_MAX_INTERVAL = 3600
 
 
 def compare_stats(team1_stats, team2_stats):
@@ -136,30 +71,18 @@ def compare_stats(team1_stats, team2_stats):
     return team1_wins, team2_wins, results
 
 
-def display_matchup(matchup_num, matchup_data):
-    """Display a single matchup with scores."""
-    # Navigate the nested structure
-    if 'matchup' not in matchup_data:
-        return
-
-    matchup = matchup_data['matchup']
-
-    # Get teams from the nested structure
-    # matchup['0']['teams'] contains the two teams
-    if '0' not in matchup or 'teams' not in matchup['0']:
-        return
-
-    teams = matchup['0']['teams']
+@timed('render')
+def display_matchup(matchup_num, table, i):
+    """Display a single matchup with scores.
 
-    # Extract team data
-    team1_data = teams.get('0', {}).get('team', [])
-    team2_data = teams.get('1', {}).get('team', [])
+    table is a parsed scoreboard (see src.scoreboard); rows i and i + 1 are
+    the two teams in the matchup.
+    """
+    team1_name = table['names'][i]
+    team2_name = table['names'][i + 1]
 
-    team1_name = get_team_name(team1_data)
-    team2_name = get_team_name(team2_data)
-
-    team1_stats = parse_team_stats(team1_data)
-    team2_stats = parse_team_stats(team2_data)
+    team1_stats = row_stats(table, i)
+    team2_stats = row_stats(table, i + 1)
 
     # Compare stats
     team1_wins, team2_wins, results = compare_stats(team1_stats, team2_stats)
@@ -184,12 +107,113 @@ def display_matchup(matchup_num, matchup_data):
     print()
 
 
+def stat_hashes(table):
+    """One hash per team of its parsed stat block (categories and makes/attempts)."""
+    return [
+        hash(table['stats'][i].tobytes() + table['made_attempted'][i].tobytes())
+        for i in range(len(table['team_keys']))
+    ]
+
+
+def matchup_pairs(table):
+    """[(matchup_num, row)] for each matchup, row being the first team's index."""
+    return list(enumerate(range(0, len(table['team_keys']), 2), 1))
+
+
+@timed('render')
+def display_flips(matchup_num, table, i, results, previous):
+    """Print the matchup score and only the categories whose leader changed.
+
+    results and previous are compare_stats results now and at the last poll.
+    Returns True if anything was printed.
+    """
+    flipped = [
+        (display_name, val1, val2, winner, old[3])
+        for (display_name, val1, val2, winner), old in zip(results[2], previous[2])
+        if winner != old[3]
+    ]
+    if not flipped:
+        return False
+
+    team1_name = table['names'][i]
+    team2_name = table['names'][i + 1]
+    print(f"[{time.strftime('%H:%M:%S')}] MATCHUP {matchup_num}: "
+          f"{team1_name} {results[0]} - {results[1]} {team2_name} (was {previous[0]}-{previous[1]})")
+    for display_name, val1, val2, winner, old_winner in flipped:
+        print(f"  {display_name:<6} {val1!s:>10} vs {val2!s:<10} now {winner} (was {old_winner})")
+    return True
+
+
+def watch(lg, interval, max_interval=DEFAULT_MAX_INTERVAL, polls=None, sleep=time.sleep):
+    """Poll the current week's scoreboard, printing only what changed.
+
+    Runs until interrupted (or for polls iterations, for testing).
+    """
+    week = None
+    hashes = {}
+    results = {}
+    delay = interval
+
+    poll = 0
+    while polls is None or poll < polls:
+        poll += 1
+        try:
+            table = parse_scoreboard(lg.matchups())
+        except Exception as e:
+            print(f"Error fetching scoreboard: {e}")
+            table = None
+
+        if table is not None:
+            if table['week'] != week:
+                # First poll, or the league moved on to a new week: draw it all
+                week = table['week']
+                hashes.clear()
+                results.clear()
+                print(f"\n{'=' * 100}")
+                print(f"WATCHING Week {week} (every {interval}s)")
+                print(f"{'=' * 100}\n")
+
+            team_hashes = stat_hashes(table)
+            for matchup_num, i in matchup_pairs(table):
+                key = (table['team_keys'][i], table['team_keys'][i + 1])
+                block = (team_hashes[i], team_hashes[i + 1])
+                if hashes.get(key) == block:
+                    continue
+
+                current = compare_stats(row_stats(table, i), row_stats(table, i + 1))
+                if key in results:
+                    display_flips(matchup_num, table, i, current, results[key])
+                else:
+                    display_matchup(matchup_num, table, i)
+                hashes[key] = block
+                results[key] = current
+
+            if table['status'] == 'postevent':
+                delay = min(delay * 2, max_interval)
+                print(f"Week {week} is final; checking for the next week in {delay}s.")
+            else:
+                delay = interval
+
+        if polls is None or poll < polls:
+            sleep(delay)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Display current week's matchups with mid-week scores")
+    parser.add_argument('--watch', type=int, default=None, metavar='INTERVAL',
+                        help='Keep polling every INTERVAL seconds, printing only changes')
+    add_league_arguments(parser)
+    args = parser.parse_args()
+
     # Authenticate
-    sc = OAuth2(None, None, from_file='oauth2.json')
-    gm = yfa.Game(sc, 'nba')
-    league_id = '466.l.51741'
-    lg = gm.to_league(league_id)
+    lg = league_from_args(args)
+
+    if args.watch:
+        try:
+            watch(lg, args.watch)
+        except KeyboardInterrupt:
+            print()
+        return
 
     # Get current week
     current_week = lg.current_week()
@@ -198,13 +222,11 @@ def main():
     print(f"{'=' * 100}\n")
 
     # Get matchups for current week
-    matchups = lg.matchups(week=current_week)
+    table = parse_scoreboard(lg.matchups(week=current_week))
 
     # Display each matchup
-    matchup_num = 1
-    for matchup_key, matchup_data in matchups.items():
-        display_matchup(matchup_num, matchup_data)
-        matchup_num += 1
+    for matchup_num, i in enumerate(range(0, len(table['team_keys']), 2), 1):
+        display_matchup(matchup_num, table, i)
 
     print("=" * 100)
     print("Legend:")
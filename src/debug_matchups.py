@@ -3,17 +3,19 @@
 Usage:
     python -m src.debug_matchups
 """
-from yahoo_oauth import OAuth2
-import yahoo_fantasy_api as yfa
+import argparse
 import json
 
+from src.auth import add_league_arguments, league_from_args
+
 
 def main():
+    parser = argparse.ArgumentParser(description='Show the raw matchup data structure')
+    add_league_arguments(parser)
+    args = parser.parse_args()
+
     # Authenticate
-    sc = OAuth2(None, None, from_file='oauth2.json')
-    gm = yfa.Game(sc, 'nba')
-    league_id = '466.l.51741'
-    lg = gm.to_league(league_id)
+    lg = league_from_args(args)
 
     # Get current week
     current_week = lg.current_week()
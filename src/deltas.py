@@ -0,0 +1,141 @@
+"""Turn season-to-date (cumulative) snapshots into weekly stat lines.
+
+This is the "Last Week / Import / Calculation" step of the Excel workflow
+(see info.md): each week's line is this week's cumulative totals minus the
+previous snapshot's. Everything is one array operation over a
+weeks×teams×stats array, and FG%/FT% are rebuilt from integer makes and
+attempts instead of subtracting or averaging rounded percentages:
+
+    weekly_fg_pct = (fgm_now - fgm_before) / (fga_now - fga_before)
+
+Snapshot CSV format (one row per team per week, header required):
+
+    week,team,fgm,fga,ftm,fta,3ptm,pts,reb,ast,st,blk,to
+"""
+import csv
+
+import numpy as np
+
+from src.matrix_engine import CATEGORY_KEYS
+
+
+# Raw counting columns of a cumulative snapshot
+COUNT_KEYS = ['fgm', 'fga', 'ftm', 'fta', '3ptm', 'pts', 'reb', 'ast', 'st', 'blk', 'to']
+
+_FGM, _FGA, _FTM, _FTA = (COUNT_KEYS.index(key) for key in ['fgm', 'fga', 'ftm', 'fta'])
+_COUNTING_CATEGORIES = [
+    (CATEGORY_KEYS.index(key), COUNT_KEYS.index(key))
+    for key in CATEGORY_KEYS if key in COUNT_KEYS
+]
+
+
+def snapshot_array(records):
+    """Stack snapshot records into (weeks, team_names, W×N×K cumulative array).
+
+    records is an iterable of dicts with 'week', 'team' and every COUNT_KEYS
+    value. Weeks with no snapshot at all (e.g. the All-Star break) are simply
+    absent; a team missing from a week's snapshot gets NaN.
+    """
+    records = list(records)
+    weeks = sorted({int(record['week']) for record in records})
+
+    team_names = []
+    for record in records:
+        if record['team'] not in team_names:
+            team_names.append(record['team'])
+
+    week_index = {week: w for w, week in enumerate(weeks)}
+    team_index = {name: i for i, name in enumerate(team_names)}
+
+    cumulative = np.full((len(weeks), len(team_names), len(COUNT_KEYS)), np.nan)
+    for record in records:
+        cumulative[week_index[int(record['week'])], team_index[record['team']]] = [
+            float(record[key]) for key in COUNT_KEYS
+        ]
+
+    return weeks, team_names, cumulative
+
+
+def load_snapshots_csv(path):
+    """Read a snapshot CSV into (weeks, team_names, cumulative array)."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return snapshot_array(csv.DictReader(f))
+
+
+def weekly_deltas(cumulative):
+    """Subtract each snapshot from the one before it (the first from zero)."""
+    return np.diff(cumulative, axis=0, prepend=np.zeros_like(cumulative[:1]))
+
+
+def cumulative_from_weekly(weekly_counts):
+    """Inverse of weekly_deltas: running season-to-date totals."""
+    return np.cumsum(weekly_counts, axis=0)
+
+
+def category_lines(counts):
+    """Convert a (...×K) counts array into (...×C) category lines.
+
+    FG% and FT% are makes / attempts (0.0 with no attempts); counting
+    categories are copied through.
+    """
+    counts = np.asarray(counts, dtype=float)
+    lines = np.zeros(counts.shape[:-1] + (len(CATEGORY_KEYS),))
+
+    for made, attempted, stat_key in [(_FGM, _FGA, 'fg_pct'), (_FTM, _FTA, 'ft_pct')]:
+        attempts = counts[..., attempted]
+        lines[..., CATEGORY_KEYS.index(stat_key)] = np.divide(
+            counts[..., made], attempts,
+            out=np.where(np.isnan(attempts), np.nan, 0.0), where=attempts > 0
+        )
+
+    for category_column, count_column in _COUNTING_CATEGORIES:
+        lines[..., category_column] = counts[..., count_column]
+
+    return lines
+
+
+def weekly_lines(cumulative):
+    """Weekly W×N×C category lines for every team and week from cumulative snapshots."""
+    return category_lines(weekly_deltas(cumulative))
+
+
+def week_teams(weeks, team_names, lines, week):
+    """One week of category lines as {team_name: {stat_key: float}}."""
+    w = weeks.index(week)
+    return {
+        name: {
+            stat_key: float(lines[w, i, c])
+            for c, stat_key in enumerate(CATEGORY_KEYS) if not np.isnan(lines[w, i, c])
+        }
+        for i, name in enumerate(team_names)
+    }
+
+
+def apply_exact_percentages(table):
+    """Replace a parsed scoreboard's rounded FG%/FT% with makes / attempts.
+
+    table is a src.scoreboard table; rows without a makes/attempts split keep
+    Yahoo's rounded value. Returns the same table.
+    """
+    made_attempted = table['made_attempted']
+    for made, stat_key in [(0, 'fg_pct'), (2, 'ft_pct')]:
+        attempts = made_attempted[:, made + 1]
+        has_attempts = attempts > 0
+        table['stats'][has_attempts, CATEGORY_KEYS.index(stat_key)] = (
+            made_attempted[has_attempts, made] / attempts[has_attempts]
+        )
+    return table
+
+
+def apply_exact_row_percentages(rows):
+    """Replace team rows' rounded FG%/FT% with makes / attempts.
+
+    rows are src.scoreboard.team_rows dicts (or season store rows); rows
+    without attempts keep Yahoo's rounded value, as in apply_exact_percentages.
+    Returns the same rows.
+    """
+    for row in rows:
+        for made, attempted, stat_key in [('fgm', 'fga', 'fg_pct'), ('ftm', 'fta', 'ft_pct')]:
+            if row.get(attempted):
+                row[stat_key] = row[made] / row[attempted]
+    return rows
@@ -3,17 +3,15 @@
 Usage:
     python -m src.explore_api
 """
-from yahoo_oauth import OAuth2
-import yahoo_fantasy_api as yfa
+import argparse
 import json
 
+from src.auth import add_league_arguments, league_from_args
 
-def explore_league_data():
+
+def explore_league_data(args):
     """Explore what data is available from the league."""
-    sc = OAuth2(None, None, from_file='oauth2.json')
-    gm = yfa.Game(sc, 'nba')
-    league_id = '466.l.51741'
-    lg = gm.to_league(league_id)
+    lg = league_from_args(args)
 
     print("=" * 80)
     print("LEAGUE SETTINGS")
@@ -130,11 +128,15 @@ def explore_standings(lg):
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Explore Yahoo Fantasy API data structures')
+    add_league_arguments(parser)
+    args = parser.parse_args()
+
     print("\n" + "=" * 80)
     print("YAHOO FANTASY API EXPLORATION")
     print("=" * 80 + "\n")
 
-    lg = explore_league_data()
+    lg = explore_league_data(args)
     explore_standings(lg)
     explore_team_data(lg)
     explore_matchup_data(lg)
@@ -0,0 +1,119 @@
+"""Streaming ingestion of scoreboard payloads.
+
+Scoreboard responses carry far more than we use (managers, logos,
+stat_winners, remaining-games trees). Instead of loading a whole payload into
+nested dicts, these helpers run an incremental JSON parser over the raw bytes,
+keep only team keys, names, status and stat values, and yield one team-week row
+per team as soon as its matchup closes. Peak memory is one matchup, no matter
+how many weeks, leagues or seasons are ingested.
+
+Rows have the same fields as src.scoreboard.team_rows, plus 'week' and 'status'.
+
+Only recorded files are streamed (see --record and src.synthetic). Live
+responses are not: every Yahoo request goes through src.session's
+SessionHandler, which retries throttled and failed requests, caches and
+records whole payloads, and parses JSON once per response. A body consumed
+as it arrives could not be retried partway through, nor cached or recorded.
+Live backfills go through season_store sync instead, where one week's
+payload at a time is parsed and dropped. To stream a live backfill, record
+it first and ingest the files.
+
+Usage:
+    python -m src.season_store sync --record recordings/backfill
+    python -m src.season_store ingest recordings/backfill/league_*_scoreboard_week=*.json
+"""
+import ijson
+
+from src.matrix_engine import CATEGORY_KEYS
+from src.scoreboard import MADE_ATTEMPTED_KEYS, STAT_MAP, split_made_attempted, to_float
+
+
+def _empty_team():
+    return {'team_key': None, 'name': "Unknown Team", 'stat_id': None, 'stats': {}}
+
+
+def _team_row(team, opponent, matchup_index, week, status):
+    """Build a flat team-week row from the fields collected for one team."""
+    row = {
+        'team_key': team['team_key'],
+        'name': team['name'],
+        'opponent_key': opponent['team_key'],
+        'matchup_index': matchup_index,
+        'week': week,
+        'status': status,
+    }
+    for split_key in MADE_ATTEMPTED_KEYS:
+        row[split_key] = None
+    for stat_key in CATEGORY_KEYS:
+        row[stat_key] = 0.0
+
+    for stat_key, value in team['stats'].items():
+        if stat_key == 'fgm_fga':
+            row['fgm'], row['fga'] = split_made_attempted(value)
+        elif stat_key == 'ftm_fta':
+            row['ftm'], row['fta'] = split_made_attempted(value)
+        else:
+            row[stat_key] = to_float(value)
+
+    return row
+
+
+def iter_team_weeks(source):
+    """Yield team-week rows from a scoreboard payload read incrementally.
+
+    source is a binary file-like object (an open recording, an HTTP response
+    body, ...). Anything that is not a scoreboard yields nothing.
+    """
+    matchup_index = None
+    week = None
+    status = None
+    teams = {}
+
+    for prefix, event, value in ijson.parse(source):
+        if '.matchups.' not in prefix:
+            continue
+
+        path = prefix.split('.')
+        depth = path.index('matchups')
+        rest = path[depth + 1:]
+
+        # End of one matchup: both teams are complete
+        if len(rest) == 1 and event == 'end_map':
+            if len(teams) == 2:
+                first, second = teams['0'], teams['1']
+                yield _team_row(first, second, matchup_index, week, status)
+                yield _team_row(second, first, matchup_index, week, status)
+            teams = {}
+            continue
+
+        if len(rest) < 3 or rest[1] != 'matchup':
+            continue
+        matchup_index = int(rest[0])
+        inner = rest[2:]
+
+        if inner == ['status']:
+            status = value
+        elif inner == ['week']:
+            week = int(value)
+        elif len(inner) >= 5 and inner[:2] == ['0', 'teams'] and inner[3] == 'team':
+            team = teams.setdefault(inner[2], _empty_team())
+            tail = inner[4:]
+
+            if tail == ['item', 'item', 'team_key']:
+                team['team_key'] = value
+            elif tail == ['item', 'item', 'name']:
+                team['name'] = value
+            elif tail == ['item', 'team_stats', 'stats', 'item', 'stat', 'stat_id']:
+                team['stat_id'] = value
+            elif tail == ['item', 'team_stats', 'stats', 'item', 'stat', 'value']:
+                stat_key = STAT_MAP.get(team['stat_id'])
+                if stat_key:
+                    team['stats'][stat_key] = value
+
+
+def iter_recordings(paths):
+    """Yield team-week rows from recorded scoreboard files, one file at a time."""
+    for path in paths:
+        with open(path, 'rb') as f:
+            yield from iter_team_weeks(f)
+
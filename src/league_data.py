@@ -3,18 +3,18 @@
 Usage:
     python -m src.league_data
 """
-from yahoo_oauth import OAuth2
-import yahoo_fantasy_api as yfa
+import argparse
+
+from src.auth import add_league_arguments, league_from_args
 
 
 def main():
-    # Authenticate
-    sc = OAuth2(None, None, from_file='oauth2.json')
-    gm = yfa.Game(sc, 'nba')
+    parser = argparse.ArgumentParser(description='Fetch and display league data')
+    add_league_arguments(parser)
+    args = parser.parse_args()
 
-    # Your league ID
-    league_id = '466.l.51741'
-    lg = gm.to_league(league_id)
+    # Authenticate
+    lg = league_from_args(args)
 
     print("=" * 60)
     print("LEAGUE SETTINGS")
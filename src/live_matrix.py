@@ -0,0 +1,123 @@
+"""Stateful Possibility Matrix for mid-week polling.
+
+While a week is in progress (status "midevent") the scoreboard changes all
+the time, but usually only for a few teams between two polls. LiveMatrix
+keeps the matrix, each team's all-play category totals and each team's best
+and worst matchup between updates. Each new scoreboard is compared with the
+previous one, and only the rows and columns of teams whose stat line changed
+are recomputed, so an update costs O(changed·N·C) instead of O(N²·C).
+
+Usage:
+    live = LiveMatrix()
+    changed = live.update_scoreboard(lg.matchups(week=week))
+    analyze_matrix_insights(live.matrix, None)
+"""
+import numpy as np
+
+from src.deltas import apply_exact_percentages
+from src.matrix_engine import best_and_worst, possibility_matrices, update_rows
+from src.profiling import timed
+from src.scoreboard import parse_scoreboard
+
+
+class LiveMatrix:
+    """Possibility matrix, all-play totals and best/worst matchups kept up to date."""
+
+    def __init__(self):
+        self.values = None
+        self.matrix = None
+        self.status = None
+
+    def update_scoreboard(self, raw_matchups):
+        """Apply a raw scoreboard response; returns the names of teams that changed."""
+        table = apply_exact_percentages(parse_scoreboard(raw_matchups))
+        self.status = table['status']
+        return self.update(table['names'], table['stats'])
+
+    @timed('compute')
+    def update(self, team_names, values):
+        """Apply new N×C stat lines; returns the names of teams that changed.
+
+        A different set or order of teams rebuilds everything; otherwise only
+        changed rows are recomputed.
+        """
+        values = np.array(values, dtype=float)
+        if self.matrix is None or self.matrix['team_names'] != list(team_names):
+            self._rebuild(list(team_names), values)
+            return list(team_names)
+
+        same = (values == self.values) | (np.isnan(values) & np.isnan(self.values))
+        changed = np.flatnonzero(~same.all(axis=1))
+        if len(changed) == 0:
+            return []
+
+        matrix = self.matrix
+        old_wins = matrix['wins'][:, changed].astype(np.int64)
+        old_losses = matrix['losses'][:, changed].astype(np.int64)
+
+        self.values = values
+        update_rows(matrix, values, changed)
+
+        # Totals: swap the changed columns' contribution, then recount the changed rows
+        matrix['total_wins'] += matrix['wins'][:, changed].sum(axis=1) - old_wins.sum(axis=1)
+        matrix['total_losses'] += matrix['losses'][:, changed].sum(axis=1) - old_losses.sum(axis=1)
+        matrix['total_wins'][changed] = matrix['wins'][changed].sum(axis=1)
+        matrix['total_losses'][changed] = matrix['losses'][changed].sum(axis=1)
+
+        self._patch_best_and_worst(changed)
+        return [team_names[i] for i in changed]
+
+    def _rebuild(self, team_names, values):
+        self.values = values
+        wins, losses, ties = possibility_matrices(values)
+        best, worst = best_and_worst(wins, losses)
+        self.matrix = {
+            'team_names': team_names,
+            'wins': wins,
+            'losses': losses,
+            'ties': ties,
+            'total_wins': wins.sum(axis=1, dtype=np.int64),
+            'total_losses': losses.sum(axis=1, dtype=np.int64),
+            'best': best,
+            'worst': worst,
+        }
+
+    def _patch_best_and_worst(self, changed):
+        """Keep best/worst in step with best_and_worst's tie rules after changed rows moved.
+
+        Changed teams' rows are recomputed. Every other row only gained new
+        margins in the changed columns: those can take over best or worst,
+        and a row is rescanned only if its current best or worst column is
+        one of the changed ones.
+        """
+        matrix = self.matrix
+        wins, losses = matrix['wins'], matrix['losses']
+        best, worst = matrix['best'], matrix['worst']
+        n = len(best)
+        if n < 2:
+            return
+
+        changed_set = set(changed.tolist())
+        rescan = set(changed_set)
+        for i in range(n):
+            if i in rescan:
+                continue
+            if best[i] in changed_set or worst[i] in changed_set:
+                rescan.add(i)
+                continue
+
+            best_margin = int(wins[i, best[i]]) - int(losses[i, best[i]])
+            worst_margin = int(wins[i, worst[i]]) - int(losses[i, worst[i]])
+            for j in changed:
+                margin = int(wins[i, j]) - int(losses[i, j])
+                if margin > best_margin or (margin == best_margin and j < best[i]):
+                    best[i], best_margin = j, margin
+                if margin < worst_margin or (margin == worst_margin and j > worst[i]):
+                    worst[i], worst_margin = j, margin
+
+        rows = sorted(rescan)
+        if rows:
+            row_best, row_worst = best_and_worst(wins, losses, rows)
+            best[rows] = row_best
+            worst[rows] = row_worst
+
@@ -0,0 +1,272 @@
+"""Vectorized Possibility Matrix engine.
+
+Team stats are held in an N×C float array (one row per team, one column per
+category). Every category is oriented by a sign vector so that "bigger is
+better" everywhere (TO is negated), and all N×N head-to-head results are
+computed with NumPy broadcasting instead of a Python loop over pairs.
+
+Only the wins matrix is computed; losses are its transpose (if A beats B in a
+category, B loses it to A), so each unordered pair is effectively evaluated once.
+"""
+import numpy as np
+
+from src.profiling import timed
+
+
+CATEGORIES = [
+    ('fg_pct', 'higher'),
+    ('ft_pct', 'higher'),
+    ('3ptm', 'higher'),
+    ('pts', 'higher'),
+    ('reb', 'higher'),
+    ('ast', 'higher'),
+    ('st', 'higher'),
+    ('blk', 'higher'),
+    ('to', 'lower'),  # Lower is better for turnovers
+]
+
+CATEGORY_KEYS = [stat_key for stat_key, _ in CATEGORIES]
+
+# +1 where higher wins, -1 where lower wins
+CATEGORY_SIGNS = np.array([1.0 if direction == 'higher' else -1.0 for _, direction in CATEGORIES])
+
+# Rows compared per broadcast block; bounds peak memory at about
+# block × N × C booleans for very large (multi-league / season-wide) inputs
+DEFAULT_BLOCK_SIZE = 512
+
+
+def team_stats_array(teams, categories=CATEGORY_KEYS):
+    """Convert {team_name: {stat_key: value}} into (team_names, N×C array).
+
+    Missing categories become NaN, which never wins, loses or ties.
+    """
+    team_names = list(teams.keys())
+    values = np.array(
+        [[teams[name].get(stat_key, np.nan) for stat_key in categories] for name in team_names],
+        dtype=float
+    ).reshape(len(team_names), len(categories))
+    return team_names, values
+
+
+def possibility_matrices(values, signs=CATEGORY_SIGNS, block_size=DEFAULT_BLOCK_SIZE):
+    """Compute all-pairs category results for an N×C stats array.
+
+    Returns (wins, losses, ties) as N×N int8 arrays, where wins[i, j] is the
+    number of categories row team i wins against column team j. The diagonal
+    compares each team with itself and is left for callers to ignore.
+    """
+    oriented = np.asarray(values, dtype=float) * signs
+    n = oriented.shape[0]
+
+    wins = np.empty((n, n), dtype=np.int8)
+    ties = np.empty((n, n), dtype=np.int8)
+
+    for start in range(0, n, block_size):
+        block = oriented[start:start + block_size, None, :]
+        wins[start:start + block_size] = (block > oriented[None, :, :]).sum(axis=2)
+        ties[start:start + block_size] = (block == oriented[None, :, :]).sum(axis=2)
+
+    return wins, wins.T, ties
+
+
+def category_win_bits(values, signs=CATEGORY_SIGNS, block_size=DEFAULT_BLOCK_SIZE):
+    """Bit-pack which categories each row team wins against each column team.
+
+    Returns an N×N uint16 array where bit c of [i, j] is set if team i wins
+    category c (in CATEGORIES order) against team j.
+    """
+    oriented = np.asarray(values, dtype=float) * signs
+    n, c = oriented.shape
+    weights = (1 << np.arange(c)).astype(np.uint16)
+
+    bits = np.empty((n, n), dtype=np.uint16)
+    for start in range(0, n, block_size):
+        block = oriented[start:start + block_size, None, :]
+        won = block > oriented[None, :, :]
+        bits[start:start + block_size] = (won * weights).sum(axis=2, dtype=np.uint16)
+
+    return bits
+
+
+@timed('compute')
+def build_matrix(teams, with_category_bits=False):
+    """Build the compact possibility matrix for {team_name: {stat_key: value}}.
+
+    Returns a dict with 'team_names' and N×N int8 'wins', 'losses' and 'ties'
+    arrays (plus uint16 'category_bits' if requested). Results stay as
+    integers; "X-Y" strings are only produced when rendering.
+    """
+    team_names, values = team_stats_array(teams)
+    wins, losses, ties = possibility_matrices(values)
+
+    matrix = {
+        'team_names': team_names,
+        'wins': wins,
+        'losses': losses,
+        'ties': ties,
+    }
+    if with_category_bits:
+        matrix['category_bits'] = category_win_bits(values)
+
+    return matrix
+
+
+def format_result(matrix, i, j):
+    """Render one cell as "X-Y", or "-" for a team against itself."""
+    if i == j:
+        return "-"
+    return f"{matrix['wins'][i, j]}-{matrix['losses'][i, j]}"
+
+
+def sorted_reference(values, signs=CATEGORY_SIGNS):
+    """Sort each oriented category column of a reference N×C stats array.
+
+    Returns a list of C sorted 1-D arrays (NaNs dropped), reusable across many
+    all_play_totals queries against the same reference pool.
+    """
+    oriented = np.asarray(values, dtype=float) * signs
+    return [np.sort(column[~np.isnan(column)]) for column in oriented.T]
+
+
+def all_play_totals(values, reference=None, signs=CATEGORY_SIGNS):
+    """Total category wins and losses of each row against every reference row.
+
+    Summing a row of the pairwise wins matrix is the same as counting, per
+    category, how many teams the row strictly beats; that is a tie-aware rank,
+    found with a binary search into each sorted category column. This costs
+    O(C·N log N) instead of O(N²·C) and never builds the pairwise matrix.
+
+    values is a Q×C array of stat lines to score. reference is either an M×C
+    array, the output of sorted_reference, or None to score values against
+    itself (a row's own value ties with itself, so it never counts).
+
+    Returns (wins, losses) as length-Q integer arrays.
+    """
+    values = np.asarray(values, dtype=float)
+    if reference is None:
+        reference = values
+    if not isinstance(reference, list):
+        reference = sorted_reference(reference, signs)
+
+    oriented = values * signs
+    wins = np.zeros(len(values), dtype=np.int64)
+    losses = np.zeros(len(values), dtype=np.int64)
+
+    for c, column in enumerate(reference):
+        query = oriented[:, c]
+        valid = ~np.isnan(query)
+        below = np.searchsorted(column, query[valid], side='left')
+        above = len(column) - np.searchsorted(column, query[valid], side='right')
+        wins[valid] += below
+        losses[valid] += above
+
+    return wins, losses
+
+
+def compare_rows(values, rows, signs=CATEGORY_SIGNS):
+    """Category results of the teams in rows against every team.
+
+    Returns (wins, losses, ties) as len(rows)×N int8 arrays, the same numbers
+    possibility_matrices puts in those rows, in O(len(rows)·N·C).
+    """
+    oriented = np.asarray(values, dtype=float) * signs
+    block = oriented[rows, None, :]
+    return (
+        (block > oriented[None, :, :]).sum(axis=2).astype(np.int8),
+        (block < oriented[None, :, :]).sum(axis=2).astype(np.int8),
+        (block == oriented[None, :, :]).sum(axis=2).astype(np.int8),
+    )
+
+
+def update_rows(matrix, values, rows, signs=CATEGORY_SIGNS):
+    """Recompute the rows and columns of the teams in rows, in place.
+
+    values is the full N×C array with the changed teams' new lines; every
+    other cell of the matrix is left alone.
+    """
+    wins, losses, ties = compare_rows(values, rows, signs)
+    matrix['wins'][rows, :] = wins
+    matrix['wins'][:, rows] = losses.T
+    # losses is normally a view of wins.T; write it anyway in case it is a copy
+    matrix['losses'][rows, :] = losses
+    matrix['losses'][:, rows] = wins.T
+    matrix['ties'][rows, :] = ties
+    matrix['ties'][:, rows] = ties.T
+    return matrix
+
+
+def matchup_outcomes(matrix, rows=None):
+    """+1/0/-1 matchup result (more categories won, even, fewer) for each cell.
+
+    rows limits the result to those teams' rows; the diagonal comes out as 0.
+    """
+    wins = matrix['wins'] if rows is None else matrix['wins'][rows]
+    losses = matrix['losses'] if rows is None else matrix['losses'][rows]
+    return np.sign(wins.astype(np.int16) - losses).astype(np.int8)
+
+
+def all_play_records(outcomes):
+    """All-play W-L-T per team from an N×N matchup_outcomes array, as an N×3 array."""
+    return np.stack([
+        (outcomes > 0).sum(axis=1),
+        (outcomes < 0).sum(axis=1),
+        (outcomes == 0).sum(axis=1) - 1,  # a team's own diagonal cell is not a tie
+    ], axis=1)
+
+
+def replace_in_reference(reference, old_values, new_values, signs=CATEGORY_SIGNS):
+    """Swap some teams' lines in a sorted_reference without re-sorting.
+
+    old_values and new_values are k×C arrays for the same k teams. Each
+    category column has the old entries removed and the new ones inserted at
+    their sorted positions, O(N) per category instead of O(N log N). Returns
+    new arrays; the input reference is not modified.
+    """
+    old_oriented = np.asarray(old_values, dtype=float) * signs
+    new_oriented = np.asarray(new_values, dtype=float) * signs
+
+    updated = []
+    for c, column in enumerate(reference):
+        for value in old_oriented[:, c][~np.isnan(old_oriented[:, c])]:
+            column = np.delete(column, np.searchsorted(column, value, side='left'))
+        new = np.sort(new_oriented[:, c][~np.isnan(new_oriented[:, c])])
+        updated.append(np.insert(column, np.searchsorted(column, new, side='left'), new))
+
+    return updated
+
+
+def category_ranks(values, reference, signs=CATEGORY_SIGNS):
+    """Rank (1 = best) of each row of a Q×C array in every category of reference.
+
+    A team's rank is one more than the number of reference teams strictly
+    better, so tied teams share a rank. Missing values rank 0.
+    """
+    oriented = np.asarray(values, dtype=float) * signs
+    ranks = np.zeros(oriented.shape, dtype=np.int64)
+    for c, column in enumerate(reference):
+        valid = ~np.isnan(oriented[:, c])
+        ranks[valid, c] = len(column) - np.searchsorted(column, oriented[valid, c], side='right') + 1
+    return ranks
+
+
+def best_and_worst(wins, losses, rows=None):
+    """Each team's best and worst opponent by category margin (wins - losses).
+
+    Ties go to the lowest-indexed opponent for best and the highest-indexed
+    for worst. rows limits the work to those teams, O(len(rows)·N). Returns
+    two index arrays (-1 with no opponents).
+    """
+    n = wins.shape[0]
+    rows = np.arange(n) if rows is None else np.asarray(rows)
+    if n < 2:
+        return np.full(len(rows), -1), np.full(len(rows), -1)
+
+    margins = wins[rows].astype(np.int16) - losses[rows]
+    positions = np.arange(len(rows))
+
+    for_best = margins.copy()
+    for_best[positions, rows] = np.iinfo(np.int16).min
+    for_worst = margins[:, ::-1].copy()
+    for_worst[positions, n - 1 - rows] = np.iinfo(np.int16).max
+
+    return for_best.argmax(axis=1), n - 1 - for_worst.argmin(axis=1)
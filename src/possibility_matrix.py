@@ -6,99 +6,31 @@ for a given week, not just the scheduled matchups.
 Usage:
     python -m src.possibility_matrix
     python -m src.possibility_matrix --week 1
+    python -m src.possibility_matrix --week 1 --replay recordings/week1
+    python -m src.possibility_matrix --season
+    python -m src.possibility_matrix --week 3 --cumulative snapshots.csv
+    python -m src.possibility_matrix --week 7 --poll 60
 """
-from yahoo_oauth import OAuth2
-import yahoo_fantasy_api as yfa
 import argparse
-
-
-def parse_team_stats(team_data):
-    """Extract stats from team data structure."""
-    stats = {}
-
-    if not isinstance(team_data, list) or len(team_data) < 2:
-        return stats
-
-    stats_container = team_data[1]
-
-    if not isinstance(stats_container, dict) or 'team_stats' not in stats_container:
-        return stats
-
-    team_stats = stats_container['team_stats']
-
-    if 'stats' not in team_stats:
-        return stats
-
-    stat_map = {
-        '9004003': 'fgm_fga',
-        '5': 'fg_pct',
-        '9007006': 'ftm_fta',
-        '8': 'ft_pct',
-        '10': '3ptm',
-        '12': 'pts',
-        '15': 'reb',
-        '16': 'ast',
-        '17': 'st',
-        '18': 'blk',
-        '19': 'to'
-    }
-
-    for stat_item in team_stats['stats']:
-        stat = stat_item['stat']
-        stat_id = stat['stat_id']
-        if stat_id in stat_map:
-            stats[stat_map[stat_id]] = stat['value']
-
-    return stats
-
-
-def get_team_name(team_data):
-    """Extract team name from team data."""
-    if not isinstance(team_data, list) or len(team_data) < 1:
-        return "Unknown Team"
-
-    metadata = team_data[0]
-    if not isinstance(metadata, list):
-        return "Unknown Team"
-
-    for item in metadata:
-        if isinstance(item, dict) and 'name' in item:
-            return item['name']
-
-    return "Unknown Team"
+import time
+
+from src.auth import LEAGUE_ID, add_league_arguments, league_from_args
+from src.deltas import apply_exact_percentages, load_snapshots_csv, weekly_lines, week_teams
+from src.live_matrix import LiveMatrix
+from src.matrix_engine import build_matrix, format_result, team_stats_array, all_play_totals, best_and_worst
+from src.prefetch import DEFAULT_MAX_WORKERS
+from src.profiling import timed
+from src.season_matrix import (
+    completed_weeks_from_store, completed_weeks_from_league, build_season_tensor,
+    season_all_play_records, scheduled_records, standings_records, display_season_report,
+)
+from src.scoreboard import parse_matchups, parse_scoreboard, teams_by_name
+from src.season_store import open_store, has_week, load_teams_by_name
 
 
 def extract_all_teams(matchups_container):
     """Extract all 10 teams from the 5 matchups."""
-    teams = {}
-
-    matchup_count = int(matchups_container['count'])
-
-    for i in range(matchup_count):
-        matchup_data = matchups_container[str(i)]
-        matchup_teams = matchup_data['matchup']['0']['teams']
-
-        # Get both teams from this matchup
-        for team_idx in ['0', '1']:
-            team_data = matchup_teams[team_idx]['team']
-            team_name = get_team_name(team_data)
-            team_stats = parse_team_stats(team_data)
-
-            # Convert stats to floats
-            processed_stats = {}
-            for stat_key, stat_value in team_stats.items():
-                if stat_key in ['fg_pct', 'ft_pct', '3ptm', 'pts', 'reb', 'ast', 'st', 'blk', 'to']:
-                    if stat_value and stat_value.strip():
-                        try:
-                            processed_stats[stat_key] = float(stat_value)
-                        except ValueError:
-                            processed_stats[stat_key] = 0.0
-                    else:
-                        processed_stats[stat_key] = 0.0
-
-            teams[team_name] = processed_stats
-
-    return teams
+    return teams_by_name(parse_matchups(matchups_container))
 
 
 def compare_two_teams(team1_stats, team2_stats):
@@ -146,28 +78,22 @@ def compare_two_teams(team1_stats, team2_stats):
 def generate_possibility_matrix(teams):
     """Generate the full N×N possibility matrix.
 
-    Returns: dict of {team1_name: {team2_name: "X-Y"}}
-    """
-    matrix = {}
-    team_names = list(teams.keys())
+    All pairs are computed at once by the vectorized engine in
+    src.matrix_engine; compare_two_teams gives the same result for one pair.
 
-    for team1_name in team_names:
-        matrix[team1_name] = {}
-        for team2_name in team_names:
-            if team1_name == team2_name:
-                # Team vs itself
-                matrix[team1_name][team2_name] = "-"
-            else:
-                # Calculate matchup
-                team1_wins, team2_wins = compare_two_teams(teams[team1_name], teams[team2_name])
-                matrix[team1_name][team2_name] = f"{team1_wins}-{team2_wins}"
-
-    return matrix
+    Returns: dict with 'team_names' and N×N integer 'wins', 'losses' and
+    'ties' arrays (row team vs column team). Use format_result to render a
+    cell as "X-Y".
+    """
+    return build_matrix(teams)
 
 
+@timed('render')
 def display_possibility_matrix(matrix, week):
     """Display the possibility matrix in a formatted table with color coding."""
-    team_names = list(matrix.keys())
+    team_names = matrix['team_names']
+    wins_matrix = matrix['wins']
+    losses_matrix = matrix['losses']
 
     # ANSI color codes
     GREEN = '\033[92m'   # Win (> 4.5 categories)
@@ -228,15 +154,17 @@ def display_possibility_matrix(matrix, week):
         display_name = team_name[:col_width] if len(team_name) > col_width else team_name
         row = f"{display_name:<{col_width}} │"
 
-        for opponent_name in team_names:
-            result = matrix[team_name][opponent_name]
+        row_index = i - 1
+        for col_index in range(len(team_names)):
+            result = format_result(matrix, row_index, col_index)
 
-            if result == "-":
+            if row_index == col_index:
                 # Team vs itself
                 row += f" {result:^4}"
             else:
                 # Color code based on win/loss
-                wins, losses = map(int, result.split('-'))
+                wins = wins_matrix[row_index, col_index]
+                losses = losses_matrix[row_index, col_index]
                 if wins > losses:
                     # Win
                     row += f" {GREEN}{result:^4}{RESET}"
@@ -263,6 +191,7 @@ def display_possibility_matrix(matrix, week):
     print(f"{BOLD}{'═' * total_width}{RESET}")
 
 
+@timed('render')
 def analyze_matrix_insights(matrix, teams):
     """Analyze the possibility matrix for insights."""
     # ANSI color codes
@@ -275,29 +204,26 @@ def analyze_matrix_insights(matrix, teams):
     print(f"{BOLD}POSSIBILITY MATRIX INSIGHTS{RESET}")
     print(f"{BOLD}{'═' * 140}{RESET}\n")
 
-    team_names = list(matrix.keys())
-
-    # Calculate overall record if each team played everyone
-    overall_records = {}
-
-    for team_name in team_names:
-        total_wins = 0
-        total_losses = 0
+    team_names = matrix['team_names']
+    wins_matrix = matrix['wins'].astype(int)
+    losses_matrix = matrix['losses'].astype(int)
 
-        for opponent_name in team_names:
-            if opponent_name == team_name:
-                continue
-
-            result = matrix[team_name][opponent_name]
-            if result != "-":
-                wins, losses = map(int, result.split('-'))
-                total_wins += wins
-                total_losses += losses
+    # Calculate overall record if each team played everyone. A LiveMatrix
+    # keeps these up to date; otherwise they come straight from per-category
+    # ranks, without summing the pairwise matrix.
+    if 'total_wins' in matrix:
+        total_wins, total_losses = matrix['total_wins'], matrix['total_losses']
+    else:
+        _, values = team_stats_array(teams)
+        total_wins, total_losses = all_play_totals(values)
 
+    overall_records = {}
+    for i, team_name in enumerate(team_names):
+        decided = total_wins[i] + total_losses[i]
         overall_records[team_name] = {
-            'total_wins': total_wins,
-            'total_losses': total_losses,
-            'win_pct': total_wins / (total_wins + total_losses) if (total_wins + total_losses) > 0 else 0
+            'total_wins': int(total_wins[i]),
+            'total_losses': int(total_losses[i]),
+            'win_pct': total_wins[i] / decided if decided > 0 else 0
         }
 
     # Sort by win percentage
@@ -323,20 +249,22 @@ def analyze_matrix_insights(matrix, teams):
     print(f"{BOLD}BEST AND WORST MATCHUPS PER TEAM{RESET}")
     print(f"{BOLD}{'═' * 140}{RESET}\n")
 
-    for team_name in team_names:
-        matchups = []
-        for opponent_name in team_names:
-            if opponent_name == team_name:
-                continue
-            result = matrix[team_name][opponent_name]
-            wins, losses = map(int, result.split('-'))
-            matchups.append((opponent_name, wins, losses, wins - losses))
+    margins = wins_matrix - losses_matrix
+    if 'best' in matrix:
+        best_indexes, worst_indexes = matrix['best'], matrix['worst']
+    else:
+        best_indexes, worst_indexes = best_and_worst(matrix['wins'], matrix['losses'])
 
-        # Sort by margin
-        matchups.sort(key=lambda x: x[3], reverse=True)
+    for i, team_name in enumerate(team_names):
+        if len(team_names) < 2:
+            continue
 
-        best = matchups[0]
-        worst = matchups[-1]
+        best_index = best_indexes[i]
+        worst_index = worst_indexes[i]
+        best = (team_names[best_index], wins_matrix[i, best_index],
+                losses_matrix[i, best_index], margins[i, best_index])
+        worst = (team_names[worst_index], wins_matrix[i, worst_index],
+                 losses_matrix[i, worst_index], margins[i, worst_index])
 
         team_display = team_name[:40]
         best_opponent = best[0][:35]
@@ -348,34 +276,128 @@ def analyze_matrix_insights(matrix, teams):
         print()
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate Possibility Matrix for a given week')
-    parser.add_argument('--week', type=int, default=1, help='Week number (default: 1)')
-    args = parser.parse_args()
-
-    # Authenticate
-    sc = OAuth2(None, None, from_file='oauth2.json')
-    gm = yfa.Game(sc, 'nba')
-    league_id = '466.l.51741'
-    lg = gm.to_league(league_id)
+def fetch_week_teams(lg, week):
+    """Fetch a week's scoreboard from Yahoo and extract all teams.
 
-    print(f"Fetching data for Week {args.week}...")
+    Returns None if the week could not be fetched.
+    """
+    print(f"Fetching data for Week {week}...")
 
     # Get matchups for specified week
     try:
-        raw_matchups = lg.matchups(week=args.week)
+        raw_matchups = lg.matchups(week=week)
     except Exception as e:
-        print(f"Error fetching week {args.week} data: {e}")
+        print(f"Error fetching week {week} data: {e}")
         print("Try a different week number.")
+        return None
+
+    # Extract all 10 teams, with FG%/FT% from exact makes/attempts
+    return teams_by_name(apply_exact_percentages(parse_scoreboard(raw_matchups)))
+
+
+def run_poll(args):
+    """Re-fetch the week every args.poll seconds until it is final.
+
+    One LiveMatrix is kept across polls, so each refresh only recomputes the
+    teams whose stat lines changed, and nothing is redrawn if none did.
+    """
+    lg = league_from_args(args)
+    live = LiveMatrix()
+
+    while True:
+        try:
+            changed = live.update_scoreboard(lg.matchups(week=args.week))
+        except Exception as e:
+            print(f"Error fetching week {args.week} data: {e}")
+            changed = []
+
+        if changed:
+            print(f"\n[{time.strftime('%H:%M:%S')}] Updated: {', '.join(changed)}")
+            display_possibility_matrix(live.matrix, args.week)
+            analyze_matrix_insights(live.matrix, None)
+
+        if live.status == 'postevent':
+            print(f"Week {args.week} is final.")
+            return
+        time.sleep(args.poll)
+
+
+def run_season(args):
+    """Build the season tensor from every completed week and report luck."""
+    lg = None
+    if args.db:
+        conn = open_store(args.db)
+        print(f"Loading completed weeks from {args.db}...")
+        season_rows = completed_weeks_from_store(conn, LEAGUE_ID)
+    else:
+        lg = league_from_args(args)
+        print("Fetching every completed week...")
+        season_rows = completed_weeks_from_league(lg, args.workers, args.batched)
+
+    if not season_rows:
+        print("No completed weeks found.")
+        return
+
+    tensor = build_season_tensor(season_rows)
+    records = season_all_play_records(tensor)
+
+    if lg is not None:
+        scheduled = standings_records(lg)
+        source = "league standings"
+    else:
+        scheduled = scheduled_records(tensor)
+        source = f"stored schedule in {args.db}"
+
+    display_season_report(tensor, records, scheduled, source)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate Possibility Matrix for a given week')
+    parser.add_argument('--week', type=int, default=1, help='Week number (default: 1)')
+    parser.add_argument('--db', type=str, default=None,
+                        help='Read from the local season store (see src.season_store) when the week is stored')
+    parser.add_argument('--cumulative', type=str, default=None, metavar='CSV',
+                        help='Build the week from season-to-date snapshots in CSV (see src.deltas)')
+    parser.add_argument('--season', action='store_true',
+                        help='Aggregate every completed week into all-play vs scheduled records')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f'Weeks to fetch concurrently in --season mode (default: {DEFAULT_MAX_WORKERS})')
+    parser.add_argument('--batched', action='store_true',
+                        help='In --season mode, fetch many weeks per request (see src.batch_fetch)')
+    parser.add_argument('--poll', type=int, default=None, metavar='SECONDS',
+                        help='Keep refreshing the week every SECONDS seconds until it is final')
+    add_league_arguments(parser)
+    args = parser.parse_args()
+
+    if args.season:
+        run_season(args)
         return
 
-    # Navigate to the actual matchups data
-    league_data = raw_matchups['fantasy_content']['league']
-    scoreboard = league_data[1]['scoreboard']
-    matchups_container = scoreboard['0']['matchups']
+    if args.poll:
+        try:
+            run_poll(args)
+        except KeyboardInterrupt:
+            print()
+        return
 
-    # Extract all 10 teams
-    teams = extract_all_teams(matchups_container)
+    teams = None
+    if args.cumulative:
+        weeks, team_names, cumulative = load_snapshots_csv(args.cumulative)
+        if args.week not in weeks:
+            print(f"No Week {args.week} snapshot in {args.cumulative}.")
+            return
+        print(f"Computing Week {args.week} from cumulative snapshots in {args.cumulative}...")
+        teams = week_teams(weeks, team_names, weekly_lines(cumulative), args.week)
+    elif args.db:
+        conn = open_store(args.db)
+        if has_week(conn, LEAGUE_ID, args.week):
+            print(f"Loading Week {args.week} from {args.db}...")
+            teams = load_teams_by_name(conn, LEAGUE_ID, args.week, exact=True)
+
+    if teams is None:
+        teams = fetch_week_teams(league_from_args(args), args.week)
+        if teams is None:
+            return
 
     if not teams or len(teams) == 0:
         print(f"No data found for Week {args.week}. The week may not have started yet.")
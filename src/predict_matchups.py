@@ -4,186 +4,98 @@ Usage:
     python -m src.predict_matchups --method last --week 2
     python -m src.predict_matchups --method last3
     python -m src.predict_matchups --method total
+    python -m src.predict_matchups --method last --replay recordings/week5
+    python -m src.predict_matchups --window 5 --state rolling.json
 
 Methods:
     last  - Based on last week's performance
     last3 - Based on average of last 3 weeks
     total - Based on season total average
+
+--window K averages over the last K weeks instead. Averages come from
+running per-team totals (src.rolling), so FG%/FT% are total makes over total
+attempts; with --state the totals persist between runs and only new weeks,
+weeks that were still live, and weeks whose rows have changed are folded in.
 """
-from yahoo_oauth import OAuth2
-import yahoo_fantasy_api as yfa
 import argparse
+import logging
 
-
-def parse_team_stats(team_data):
-    """Extract stats from team data structure."""
-    stats = {}
-
-    if not isinstance(team_data, list) or len(team_data) < 2:
-        return stats
-
-    stats_container = team_data[1]
-
-    if not isinstance(stats_container, dict) or 'team_stats' not in stats_container:
-        return stats
-
-    team_stats = stats_container['team_stats']
-
-    if 'stats' not in team_stats:
-        return stats
-
-    stat_map = {
-        '5': 'fg_pct',
-        '8': 'ft_pct',
-        '10': '3ptm',
-        '12': 'pts',
-        '15': 'reb',
-        '16': 'ast',
-        '17': 'st',
-        '18': 'blk',
-        '19': 'to'
-    }
-
-    for stat_item in team_stats['stats']:
-        stat = stat_item['stat']
-        stat_id = stat['stat_id']
-        if stat_id in stat_map:
-            stats[stat_map[stat_id]] = stat['value']
-
-    return stats
-
-
-def get_team_name(team_data):
-    """Extract team name from team data."""
-    if not isinstance(team_data, list) or len(team_data) < 1:
-        return "Unknown Team"
-
-    metadata = team_data[0]
-    if not isinstance(metadata, list):
-        return "Unknown Team"
-
-    for item in metadata:
-        if isinstance(item, dict) and 'name' in item:
-            return item['name']
-
-    return "Unknown Team"
-
-
-def get_team_key(team_data):
-    """Extract team key from team data."""
-    if not isinstance(team_data, list) or len(team_data) < 1:
-        return None
-
-    metadata = team_data[0]
-    if not isinstance(metadata, list):
-        return None
-
-    for item in metadata:
-        if isinstance(item, dict) and 'team_key' in item:
-            return item['team_key']
-
-    return None
+from src.auth import LEAGUE_ID, add_league_arguments, league_from_args
+from src.prefetch import DEFAULT_MAX_WORKERS, map_weeks
+from src.profiling import span, timed
+from src.rolling import RollingAggregator
+from src.scoreboard import parse_matchups, parse_scoreboard, scheduled_matchups, team_rows, teams_by_key
+from src.season_store import open_store, week_statuses, load_week_rows, load_matchups
 
 
 def extract_matchups(matchups_container):
     """Extract scheduled matchups (team pairs) for the week."""
-    matchups = []
-    matchup_count = int(matchups_container['count'])
-
-    for i in range(matchup_count):
-        matchup_data = matchups_container[str(i)]
-        matchup_teams = matchup_data['matchup']['0']['teams']
-
-        team1_data = matchup_teams['0']['team']
-        team2_data = matchup_teams['1']['team']
-
-        team1_name = get_team_name(team1_data)
-        team2_name = get_team_name(team2_data)
-        team1_key = get_team_key(team1_data)
-        team2_key = get_team_key(team2_data)
-
-        matchups.append({
-            'team1_name': team1_name,
-            'team2_name': team2_name,
-            'team1_key': team1_key,
-            'team2_key': team2_key
-        })
-
-    return matchups
+    return scheduled_matchups(parse_matchups(matchups_container))
 
 
 def extract_all_teams_stats(matchups_container):
     """Extract all team stats from matchups."""
-    teams = {}
-    matchup_count = int(matchups_container['count'])
-
-    for i in range(matchup_count):
-        matchup_data = matchups_container[str(i)]
-        matchup_teams = matchup_data['matchup']['0']['teams']
-
-        for team_idx in ['0', '1']:
-            team_data = matchup_teams[team_idx]['team']
-            team_key = get_team_key(team_data)
-            team_stats = parse_team_stats(team_data)
-
-            # Convert stats to floats
-            processed_stats = {}
-            for stat_key, stat_value in team_stats.items():
-                if stat_value and stat_value.strip():
-                    try:
-                        processed_stats[stat_key] = float(stat_value)
-                    except ValueError:
-                        processed_stats[stat_key] = 0.0
-                else:
-                    processed_stats[stat_key] = 0.0
-
-            teams[team_key] = {
-                'stats': processed_stats
-            }
+    return teams_by_key(parse_matchups(matchups_container))
 
-    return teams
 
+def fetch_week_stats(lg, week, week_store):
+    """Fetch and parse a week's team rows, reusing week_store if already fetched.
 
-def get_historical_stats(lg, team_key, weeks):
-    """Get stats for a team over multiple weeks."""
-    weekly_stats = []
-
-    for week in weeks:
+    week_store is a plain dict of {week: rows} shared across one run, so each
+    week's scoreboard is requested at most once no matter how many matchups
+    need it. A week whose payload has no usable scoreboard is stored as None
+    so it is not requested again. Request errors are raised: throttling and
+    server errors have already been retried by the scheduler (see
+    src.scheduler), and hiding them would look like a week with no data.
+    """
+    if week not in week_store:
+        raw_matchups = lg.matchups(week=week)
         try:
-            raw_matchups = lg.matchups(week=week)
-            league_data = raw_matchups['fantasy_content']['league']
-            scoreboard = league_data[1]['scoreboard']
-            matchups_container = scoreboard['0']['matchups']
-
-            teams = extract_all_teams_stats(matchups_container)
-
-            if team_key in teams and teams[team_key]['stats']:
-                weekly_stats.append(teams[team_key]['stats'])
+            table = parse_scoreboard(raw_matchups)
+            week_store[week] = [dict(row, status=table['status']) for row in team_rows(table)]
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            logging.warning("Week %s scoreboard could not be parsed: %r", week, e)
+            week_store[week] = None
+
+    return week_store[week]
+
+
+def fold_weeks(aggregator, lg, weeks, week_store):
+    """Fold any of weeks the aggregator has not seen yet, fetching as needed.
+
+    A persisted aggregator that already covers weeks[0]..N-2 only folds in
+    week N-1. Folded weeks that were not yet final are fetched again, and the
+    aggregator is refolded from the first week whose rows differ from what it
+    folded (a status change or a stat correction). This checks every folded
+    week's rows, so call it once per run, not per matchup. Returns False if a
+    needed week could not be fetched.
+    """
+    start, end = weeks[0], weeks[-1]
+    if aggregator.first_week is None or start < aggregator.first_week:
+        aggregator.reset()
+    elif aggregator.last_week > end or aggregator.last_week < start - 1:
+        # Folded weeks must stay contiguous and end before the predicted week
+        aggregator.reset()
+
+    if aggregator.last_week is not None:
+        for week in range(start, aggregator.last_week + 1):
+            if aggregator.is_final(week):
+                rows = week_store.get(week)
             else:
-                return None
-
-        except Exception:
-            return None
-
-    return weekly_stats if weekly_stats else None
+                rows = fetch_week_stats(lg, week, week_store)
+            if rows is not None and aggregator.changed(week, rows):
+                aggregator.truncate(week)
+                break
 
+    next_week = start if aggregator.last_week is None else aggregator.last_week + 1
+    for week in range(next_week, end + 1):
+        rows = fetch_week_stats(lg, week, week_store)
+        if rows is None:
+            return False
+        with span('compute', function='fold_week', week=week):
+            aggregator.fold_week(week, rows)
 
-def average_stats(stats_list):
-    """Average multiple stat dictionaries."""
-    if not stats_list:
-        return {}
-
-    averaged = {}
-    stat_keys = ['fg_pct', 'ft_pct', '3ptm', 'pts', 'reb', 'ast', 'st', 'blk', 'to']
-
-    for stat_key in stat_keys:
-        values = [s.get(stat_key, 0.0) for s in stats_list if stat_key in s]
-        if values:
-            averaged[stat_key] = sum(values) / len(values)
-        else:
-            averaged[stat_key] = 0.0
-
-    return averaged
+    return True
 
 
 def compare_two_teams(team1_stats, team2_stats):
@@ -253,35 +165,71 @@ def compare_two_teams(team1_stats, team2_stats):
     return team1_wins, team2_wins, category_details
 
 
-def predict_matchup(lg, matchup, current_week, method):
-    """Predict a single matchup using specified method."""
+def prefetch_week_stats(lg, weeks, week_store, max_workers=DEFAULT_MAX_WORKERS):
+    """Fill week_store with every week not already in it, fetching concurrently."""
+    missing = [week for week in weeks if week not in week_store]
+    map_weeks(lambda week: fetch_week_stats(lg, week, week_store), missing, max_workers)
+    return week_store
+
+
+def prediction_weeks(current_week, method, window=None):
+    """Historical weeks a prediction method (or an explicit window of K weeks) averages over."""
+    if window is not None:
+        return [w for w in range(current_week - window, current_week) if w >= 1]
+    elif method == 'last':
+        return [current_week - 1] if current_week > 1 else []
+    elif method == 'last3':
+        return [w for w in range(current_week - 3, current_week) if w >= 1]
+    else:  # total
+        return list(range(1, current_week))
+
+
+def method_label(method, window=None):
+    """Human-readable description of a prediction method."""
+    if window is not None:
+        return f'Based on Last {window} Weeks Average'
+    return {
+        'last': 'Based on Last Week',
+        'last3': 'Based on Last 3 Weeks Average',
+        'total': 'Based on Season Average'
+    }[method]
+
+
+def predict_matchup(lg, matchup, current_week, method, week_store=None, aggregator=None, window=None):
+    """Predict a single matchup using specified method.
+
+    Pass the same week_store and aggregator to every call in a run so
+    historical weeks are fetched and folded once instead of once per matchup.
+    An aggregator that already covers the weeks (see fold_weeks) is only read.
+    """
     team1_key = matchup['team1_key']
     team2_key = matchup['team2_key']
 
     # Determine weeks based on method
-    if method == 'last':
-        weeks = [current_week - 1] if current_week > 1 else []
-    elif method == 'last3':
-        weeks = [w for w in range(current_week - 3, current_week) if w >= 1]
-    else:  # total
-        weeks = list(range(1, current_week))
+    weeks = prediction_weeks(current_week, method, window)
 
     if not weeks:
         return {'available': False}
 
-    # Get historical stats
-    team1_history = get_historical_stats(lg, team1_key, weeks)
-    team2_history = get_historical_stats(lg, team2_key, weeks)
+    if week_store is None:
+        week_store = {}
+    if aggregator is None:
+        aggregator = RollingAggregator()
 
-    if not team1_history or not team2_history:
+    if not aggregator.covers(weeks[0], weeks[-1]) and not fold_weeks(aggregator, lg, weeks, week_store):
         return {'available': False, 'weeks': weeks}
 
-    # Average the stats
-    team1_avg = average_stats(team1_history)
-    team2_avg = average_stats(team2_history)
+    # History is in place: time only the prediction itself as compute
+    with span('compute', function='predict_matchup'):
+        # Window averages straight from the running totals
+        team1_avg = aggregator.window_average(team1_key, weeks[-1], len(weeks))
+        team2_avg = aggregator.window_average(team2_key, weeks[-1], len(weeks))
+
+        if not team1_avg or not team2_avg:
+            return {'available': False, 'weeks': weeks}
 
-    # Compare teams
-    team1_wins, team2_wins, category_details = compare_two_teams(team1_avg, team2_avg)
+        # Compare teams
+        team1_wins, team2_wins, category_details = compare_two_teams(team1_avg, team2_avg)
 
     return {
         'available': True,
@@ -292,7 +240,8 @@ def predict_matchup(lg, matchup, current_week, method):
     }
 
 
-def display_predictions(matchups, predictions, week, method):
+@timed('render')
+def display_predictions(matchups, predictions, week, label):
     """Display predicted matchup results."""
     # ANSI color codes
     GREEN = '\033[92m'
@@ -301,14 +250,8 @@ def display_predictions(matchups, predictions, week, method):
     BOLD = '\033[1m'
     RESET = '\033[0m'
 
-    method_names = {
-        'last': 'Based on Last Week',
-        'last3': 'Based on Last 3 Weeks Average',
-        'total': 'Based on Season Average'
-    }
-
     print(f"\n{BOLD}{'═' * 100}{RESET}")
-    print(f"{BOLD}WEEK {week} MATCHUP PREDICTIONS - {method_names[method]}{RESET}")
+    print(f"{BOLD}WEEK {week} MATCHUP PREDICTIONS - {label}{RESET}")
     print(f"{BOLD}{'═' * 100}{RESET}\n")
 
     for i, (matchup, pred) in enumerate(zip(matchups, predictions), 1):
@@ -369,17 +312,33 @@ def display_predictions(matchups, predictions, week, method):
 
 def main():
     parser = argparse.ArgumentParser(description='Predict matchup results using historical data')
-    parser.add_argument('--method', type=str, required=True, choices=['last', 'last3', 'total'],
+    parser.add_argument('--method', type=str, default=None, choices=['last', 'last3', 'total'],
                        help='Prediction method: last=last week, last3=last 3 weeks avg, total=season avg')
+    parser.add_argument('--window', type=int, default=None, metavar='K',
+                       help='Average over the last K weeks instead of a fixed method')
+    parser.add_argument('--state', type=str, default=None,
+                       help='JSON file to keep running totals in between runs')
     parser.add_argument('--week', type=int, default=None,
                        help='Week to predict (default: current week)')
+    parser.add_argument('--db', type=str, default=None,
+                       help='Read weeks from the local season store (see src.season_store) when stored')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                       help=f'Weeks to fetch concurrently (default: {DEFAULT_MAX_WORKERS})')
+    add_league_arguments(parser)
     args = parser.parse_args()
 
-    # Authenticate
-    sc = OAuth2(None, None, from_file='oauth2.json')
-    gm = yfa.Game(sc, 'nba')
-    league_id = '466.l.51741'
-    lg = gm.to_league(league_id)
+    if args.method is None and args.window is None:
+        parser.error('one of --method or --window is required')
+    if args.window is not None and args.window < 1:
+        parser.error('--window must be at least 1')
+
+    conn = open_store(args.db) if args.db else None
+    stored_weeks = set(week_statuses(conn, LEAGUE_ID)) if conn is not None else set()
+
+    # Only authenticate if some week we need is not in the store
+    lg = None
+    if args.week is None or not set(range(1, args.week + 1)) <= stored_weeks:
+        lg = league_from_args(args)
 
     # Get week to predict
     if args.week is None:
@@ -387,22 +346,23 @@ def main():
         print(f"Predicting current week: {week}")
     else:
         week = args.week
-        print(f"Predicting Week {week} using method '{args.method}'...")
+        print(f"Predicting Week {week} ({method_label(args.method, args.window)})...")
 
-    # Get matchups for the week
-    try:
-        raw_matchups = lg.matchups(week=week)
-    except Exception as e:
-        print(f"Error fetching week {week} data: {e}")
-        return
+    # Seed the week store with every stored historical week
+    week_store = {w: load_week_rows(conn, LEAGUE_ID, w) for w in stored_weeks if w < week}
 
-    # Navigate to matchups data
-    league_data = raw_matchups['fantasy_content']['league']
-    scoreboard = league_data[1]['scoreboard']
-    matchups_container = scoreboard['0']['matchups']
+    if week in stored_weeks:
+        matchups = load_matchups(conn, LEAGUE_ID, week)
+    else:
+        # Get matchups for the week
+        try:
+            raw_matchups = lg.matchups(week=week)
+        except Exception as e:
+            print(f"Error fetching week {week} data: {e}")
+            return
 
-    # Extract scheduled matchups
-    matchups = extract_matchups(matchups_container)
+        # Extract scheduled matchups
+        matchups = scheduled_matchups(parse_scoreboard(raw_matchups))
 
     if not matchups:
         print(f"No matchups found for Week {week}.")
@@ -410,14 +370,36 @@ def main():
 
     print(f"Found {len(matchups)} matchups.\n")
 
-    # Predict each matchup
+    try:
+        aggregator = RollingAggregator.load(args.state, LEAGUE_ID) if args.state else RollingAggregator()
+    except ValueError as e:
+        print(f"Error loading running totals: {e}")
+        return
+
+    # Fetch every historical week the running totals are missing or folded
+    # before it was final, in parallel
+    weeks = prediction_weeks(week, args.method, args.window)
+    missing = [w for w in weeks if not aggregator.is_final(w)]
+    try:
+        prefetch_week_stats(lg, missing, week_store, args.workers)
+        # Refold stale or corrected weeks once, before any matchup reads the totals
+        if weeks:
+            fold_weeks(aggregator, lg, weeks, week_store)
+    except (RuntimeError, OSError) as e:
+        print(f"Error fetching historical weeks: {e}")
+        return
+
+    # Predict each matchup, sharing one week store and one set of running totals
     all_predictions = []
     for matchup in matchups:
-        pred = predict_matchup(lg, matchup, week, args.method)
+        pred = predict_matchup(lg, matchup, week, args.method, week_store, aggregator, args.window)
         all_predictions.append(pred)
 
+    if args.state:
+        aggregator.save(args.state)
+
     # Display predictions
-    display_predictions(matchups, all_predictions, week, args.method)
+    display_predictions(matchups, all_predictions, week, method_label(args.method, args.window))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,41 @@
+"""Fetch many weeks concurrently on a bounded thread pool.
+
+Scoreboard requests are I/O bound, so running a handful at once makes a
+full-season fetch cost roughly one round-trip of wall time instead of one per
+week. Keep max_workers small to stay under Yahoo's rate limits.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def map_weeks(fetch_week, weeks, max_workers=DEFAULT_MAX_WORKERS):
+    """Call fetch_week(week) for every week concurrently.
+
+    Returns {week: result} in ascending week order. An exception raised for
+    any week is re-raised here.
+    """
+    weeks = sorted(set(weeks))
+    if not weeks:
+        return {}
+
+    if max_workers <= 1 or len(weeks) == 1:
+        return {week: fetch_week(week) for week in weeks}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(weeks))) as executor:
+        results = executor.map(fetch_week, weeks)
+        return dict(zip(weeks, results))
+
+
+def prefetch_weeks(lg, weeks, parse=None, max_workers=DEFAULT_MAX_WORKERS):
+    """Fetch lg.matchups(week) for every week concurrently.
+
+    If parse is given it is applied to each raw payload inside the worker, so
+    the returned {week: table} dict holds parsed week tables in week order.
+    """
+    def fetch_week(week):
+        raw_matchups = lg.matchups(week=week)
+        return parse(raw_matchups) if parse else raw_matchups
+
+    return map_weeks(fetch_week, weeks, max_workers)
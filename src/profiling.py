@@ -0,0 +1,197 @@
+"""Per-stage timing spans for the league scripts.
+
+Pipeline stages are wrapped in spans:
+
+    import   loading the Yahoo client libraries
+    oauth    opening or refreshing the OAuth session
+    http     Yahoo requests (one span per request, with its uri)
+    cache    response cache lookups
+    json     decoding responses (or reading recorded ones)
+    parse    scoreboard payloads into team-week tables
+    compute  matrices, rankings, predictions, simulations
+    render   the display_* / analyze_* printers
+
+Spans cost a single check while profiling is off. Every league script takes
+--profile, which prints a per-stage breakdown when the script exits, and
+--profile-dump FILE, which also runs cProfile and saves its stats to FILE.
+Spans in worker threads are included, so a stage's total can exceed wall
+time. Compute spans open only once their data has been fetched and parsed,
+so no time is counted under two stages.
+
+Long-running jobs can take the spans as structured records instead:
+
+    from src import profiling
+    profiling.enable(sink=lambda record: log.info(json.dumps(record)))
+    ...
+    profiling.records()   # the most recent spans as dicts
+
+Usage:
+    python -m src.possibility_matrix --week 3 --profile
+    python -m src report --profile-dump report.prof
+"""
+import argparse
+import atexit
+import collections
+import contextlib
+import functools
+import threading
+import time
+
+# Spans kept for records(); per-stage totals cover every span regardless
+DEFAULT_MAX_RECORDS = 10_000
+
+_recorder = None
+_cprofile = None
+_disabled = contextlib.nullcontext()
+
+
+class Recorder:
+    """Collects span records and running per-stage totals."""
+
+    def __init__(self, sink=None, max_records=DEFAULT_MAX_RECORDS):
+        self.sink = sink
+        self.started = time.perf_counter()
+        self.records = collections.deque(maxlen=max_records)
+        self.totals = {}
+        self.lock = threading.Lock()
+
+    def add(self, stage, start, duration, fields):
+        record = {
+            'stage': stage,
+            'start': start - self.started,
+            'duration': duration,
+            'thread': threading.current_thread().name,
+            **fields,
+        }
+        with self.lock:
+            self.records.append(record)
+            count, total, longest = self.totals.get(stage, (0, 0.0, 0.0))
+            self.totals[stage] = (count + 1, total + duration, max(longest, duration))
+        if self.sink is not None:
+            self.sink(record)
+
+    def summary(self):
+        """[{stage, count, total, mean, max}] by total time, longest first."""
+        with self.lock:
+            totals = dict(self.totals)
+        rows = [
+            {'stage': stage, 'count': count, 'total': total, 'mean': total / count, 'max': longest}
+            for stage, (count, total, longest) in totals.items()
+        ]
+        return sorted(rows, key=lambda row: -row['total'])
+
+
+@contextlib.contextmanager
+def _span(recorder, stage, fields):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add(stage, start, time.perf_counter() - start, fields)
+
+
+def span(stage, **fields):
+    """Context manager timing one stage; fields are added to its record."""
+    if _recorder is None:
+        return _disabled
+    return _span(_recorder, stage, fields)
+
+
+def timed(stage):
+    """Decorator timing every call of a function as stage."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return fn(*args, **kwargs)
+            with _span(_recorder, stage, {'function': fn.__qualname__}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def enable(sink=None, max_records=DEFAULT_MAX_RECORDS):
+    """Start recording spans; sink, if given, is called with each record."""
+    global _recorder
+    _recorder = Recorder(sink, max_records)
+    return _recorder
+
+
+def disable():
+    """Stop recording; returns the recorder that was active, if any."""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder
+
+
+def records():
+    """The most recent span records (empty while profiling is off)."""
+    if _recorder is None:
+        return []
+    with _recorder.lock:
+        return list(_recorder.records)
+
+
+def display_profile(recorder):
+    """Print the per-stage breakdown and the request scheduler's counters."""
+    from src.scheduler import shared_scheduler
+
+    wall = time.perf_counter() - recorder.started
+    print(f"\n{'Stage':<10}{'Calls':>8}{'Total':>12}{'Mean':>12}{'Max':>12}{'% wall':>9}")
+    print("─" * 63)
+    for row in recorder.summary():
+        print(f"{row['stage']:<10}{row['count']:>8}{row['total'] * 1000:>10.1f}ms"
+              f"{row['mean'] * 1000:>10.2f}ms{row['max'] * 1000:>10.1f}ms{row['total'] / wall:>9.1%}")
+    print("─" * 63)
+    print(f"{'wall':<10}{'':>8}{wall * 1000:>10.1f}ms")
+
+    counters = shared_scheduler().stats()
+    print("Requests: " + ", ".join(f"{name} {value}" for name, value in counters.items()))
+
+
+def start_profile():
+    """Enable spans and print the breakdown when the process exits."""
+    recorder = enable()
+
+    def report():
+        disable()
+        if _cprofile is not None:
+            profiler, dump_path = _cprofile
+            profiler.disable()
+            profiler.dump_stats(dump_path)
+        display_profile(recorder)
+        if _cprofile is not None:
+            print(f"cProfile stats written to {dump_path} (view with: python -m pstats {dump_path})")
+
+    atexit.register(report)
+    return recorder
+
+
+def start_cprofile(dump_path):
+    """Run cProfile until exit and save its stats to dump_path."""
+    global _cprofile
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    _cprofile = (profiler, dump_path)
+
+
+class _ProfileAction(argparse.Action):
+    """Starts profiling as soon as the flag is parsed, before any work runs."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        dump_path = values or None
+        setattr(namespace, self.dest, dump_path or True)
+        if _recorder is None:
+            start_profile()
+        if dump_path and _cprofile is None:
+            start_cprofile(dump_path)
+
+
+def add_profile_arguments(parser):
+    """Add --profile and --profile-dump FILE to parser."""
+    parser.add_argument('--profile', action=_ProfileAction, nargs=0, default=False,
+                        help='Print a per-stage timing breakdown on exit')
+    parser.add_argument('--profile-dump', action=_ProfileAction, default=None, metavar='FILE',
+                        help='Also run cProfile and save its stats to FILE')
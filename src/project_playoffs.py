@@ -0,0 +1,256 @@
+"""Monte Carlo projection of final standings and the playoff bracket.
+
+Starting from the current lg.standings() category record, every remaining
+regular-season week on the schedule is simulated (each team's weekly line
+drawn from its fitted history, as in src.simulate_matchups), teams are seeded
+by category win percentage, and the playoff bracket is played out. This is
+repeated thousands of times to give each team's chance of every seed, of
+making the final and of winning the title.
+
+The remaining schedule is fetched once, up front. Simulations run in batches
+across a process pool, and each batch is reduced to counts as soon as it
+finishes, so memory stays flat however many simulations run.
+
+The current week is simulated in full; partial stats already on the
+scoreboard are not used, since standings only count finished weeks.
+
+Usage:
+    python -m src.project_playoffs
+    python -m src.project_playoffs --sims 50000 --seed 7
+    python -m src.project_playoffs --playoff-teams 6 --playoff-start 20
+"""
+import argparse
+import os
+
+import numpy as np
+
+from src.auth import LEAGUE_ID, add_league_arguments, league_from_args
+from src.matrix_engine import CATEGORY_KEYS, CATEGORY_SIGNS
+from src.predict_matchups import prediction_weeks
+from src.prefetch import DEFAULT_MAX_WORKERS, prefetch_weeks
+from src.profiling import timed
+from src.scoreboard import parse_scoreboard, scheduled_matchups
+from src.season_matrix import standings_records
+from src.season_store import open_store, week_statuses, load_week_rows
+from src.simulate_matchups import batch_sizes, fit_weeks, run_batches, sample_lines
+
+DEFAULT_SIMS = 10_000
+DEFAULT_BATCH_SIZE = 2_000
+
+
+def bracket_order(size):
+    """Seed order of a standard bracket of size slots, e.g. 8 -> [1, 8, 4, 5, 2, 7, 3, 6]."""
+    order = [1]
+    while len(order) < size:
+        total = 2 * len(order) + 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+
+def bracket_slots(playoff_teams):
+    """0-based seed index for each first-round slot, -1 for a bye."""
+    size = 1
+    while size < playoff_teams:
+        size *= 2
+    return np.array([seed - 1 if seed <= playoff_teams else -1 for seed in bracket_order(size)])
+
+
+def play_week(rng, fits, draws):
+    """draws×N×C simulated category lines for every team."""
+    return np.stack([sample_lines(rng, fit, draws) for fit in fits], axis=1)
+
+
+def category_score(lines, team1, team2):
+    """Per-simulation (won, lost) category counts for team1 against team2.
+
+    team1 and team2 are team indexes, either scalars or one per simulation.
+    """
+    rows = np.arange(lines.shape[0])
+    margin = (lines[rows, team1] - lines[rows, team2]) * CATEGORY_SIGNS
+    return (margin > 0).sum(axis=1), (margin < 0).sum(axis=1)
+
+
+def simulate_season_batch(task):
+    """Simulate one batch of seasons; returns count arrays for the reduction.
+
+    task is (fits, schedule, records, playoff_teams, sims, seed_sequence):
+    fits indexed by team, schedule a list of weeks of (i, j) pairs, records
+    an N×3 array of starting wins/losses/ties.
+    """
+    fits, schedule, records, playoff_teams, sims, seed = task
+    rng = np.random.default_rng(seed)
+    num_teams = len(fits)
+    num_categories = len(CATEGORY_KEYS)
+
+    totals = np.broadcast_to(records, (sims, num_teams, 3)).astype(np.int64)
+    for pairs in schedule:
+        lines = play_week(rng, fits, sims)
+        for i, j in pairs:
+            won, lost = category_score(lines, i, j)
+            totals[:, i] += np.stack([won, lost, num_categories - won - lost], axis=1)
+            totals[:, j] += np.stack([lost, won, num_categories - won - lost], axis=1)
+
+    # Seed by category win percentage, breaking ties at random
+    score = totals[..., 0] + 0.5 * totals[..., 2]
+    standings = np.lexsort((rng.random((sims, num_teams)), -score))
+
+    counts = {
+        'finish': np.zeros((num_teams, num_teams), dtype=np.int64),
+        'final': np.zeros(num_teams, dtype=np.int64),
+        'champion': np.zeros(num_teams, dtype=np.int64),
+        'record': totals.sum(axis=0),
+    }
+    for place in range(num_teams):
+        counts['finish'][:, place] += np.bincount(standings[:, place], minlength=num_teams)
+
+    if playoff_teams < 2:
+        return counts
+
+    # Play the bracket; slots hold seeds (0 = top seed), -1 for byes, and the
+    # higher seed advances on a tied matchup
+    slots = np.tile(bracket_slots(playoff_teams), (sims, 1))
+    rows = np.arange(sims)[:, None]
+    while slots.shape[1] > 1:
+        if slots.shape[1] == 2:
+            for seed_column in slots.T:
+                counts['final'] += np.bincount(standings[rows[:, 0], seed_column], minlength=num_teams)
+
+        lines = play_week(rng, fits, sims)
+        top, bottom = slots[:, 0::2], slots[:, 1::2]
+        winners = np.where(bottom < 0, top, bottom)
+        for game in range(top.shape[1]):
+            played = (top[:, game] >= 0) & (bottom[:, game] >= 0)
+            team1 = standings[rows[:, 0], np.maximum(top[:, game], 0)]
+            team2 = standings[rows[:, 0], np.maximum(bottom[:, game], 0)]
+            won, lost = category_score(lines, team1, team2)
+            higher_wins = np.where(top[:, game] < bottom[:, game], won >= lost, won > lost)
+            winners[:, game] = np.where(played & higher_wins, top[:, game], winners[:, game])
+        slots = winners
+
+    counts['champion'] += np.bincount(standings[rows[:, 0], slots[:, 0]], minlength=num_teams)
+    return counts
+
+
+@timed('compute')
+def project_season(fits, schedule, records, playoff_teams, sims=DEFAULT_SIMS, seed=None,
+                   max_workers=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Run sims seasons; returns probabilities and average final records per team.
+
+    fits, records and the (i, j) pairs in schedule all use the same team
+    indexes. Results depend only on seed, sims and batch_size, not on the
+    number of workers.
+    """
+    sizes = batch_sizes(sims, batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(fits, schedule, records, playoff_teams, size, batch_seed)
+             for size, batch_seed in zip(sizes, seeds)]
+    counts = run_batches(simulate_season_batch, tasks, max_workers)
+
+    return {
+        'finish': counts['finish'] / sims,
+        'playoffs': counts['finish'][:, :playoff_teams].sum(axis=1) / sims,
+        'final': counts['final'] / sims,
+        'champion': counts['champion'] / sims,
+        'record': counts['record'] / sims,
+    }
+
+
+def playoff_settings(settings, playoff_start=None, playoff_teams=None):
+    """(first playoff week, number of playoff teams) from league settings or overrides."""
+    if playoff_start is None:
+        playoff_start = int(settings.get('playoff_start_week') or int(settings.get('end_week', 0)) + 1)
+    if playoff_teams is None:
+        uses_playoff = str(settings.get('uses_playoff', '1')) != '0'
+        playoff_teams = int(settings.get('num_playoff_teams', 0)) if uses_playoff else 0
+    return playoff_start, playoff_teams
+
+
+def remaining_schedule(lg, current_week, playoff_start, index, max_workers=DEFAULT_MAX_WORKERS):
+    """Remaining regular-season weeks as lists of (i, j) team-index pairs, fetched once."""
+    tables = prefetch_weeks(lg, range(current_week, playoff_start), parse_scoreboard, max_workers)
+    return [
+        [(index[m['team1_key']], index[m['team2_key']]) for m in scheduled_matchups(tables[week])
+         if m['team1_key'] in index and m['team2_key'] in index]
+        for week in sorted(tables)
+    ]
+
+
+@timed('render')
+def display_projection(projection, team_keys, names, records, playoff_teams):
+    """Print projected records, seed odds and title odds, best title odds first."""
+    BOLD = '\033[1m'
+    RESET = '\033[0m'
+
+    seed_headers = "".join(f"{'#' + str(seed):>7}" for seed in range(1, playoff_teams + 1))
+    print(f"\n{BOLD}{'Team':<25}{'Now':>12}{'Projected':>15}{'Playoffs':>10}{seed_headers}"
+          f"{'Final':>8}{'Title':>8}{RESET}")
+    print("─" * (78 + 7 * playoff_teams))
+
+    for i in np.argsort(-projection['champion'], kind='stable'):
+        now = "-".join(str(records[team_keys[i]][key]) for key in ('wins', 'losses', 'ties'))
+        projected = "-".join(f"{value:.0f}" for value in projection['record'][i])
+        seeds = "".join(f"{p:>7.1%}" for p in projection['finish'][i, :playoff_teams])
+        print(f"{names[team_keys[i]][:24]:<25}{now:>12}{projected:>15}{projection['playoffs'][i]:>10.1%}"
+              f"{seeds}{projection['final'][i]:>8.1%}{projection['champion'][i]:>8.1%}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Project final standings and playoff odds')
+    parser.add_argument('--sims', type=int, default=DEFAULT_SIMS,
+                       help=f'Seasons to simulate (default: {DEFAULT_SIMS:,})')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Seed for reproducible results')
+    parser.add_argument('--window', type=int, default=None, metavar='K',
+                       help='Fit teams on the last K weeks (default: every finished week)')
+    parser.add_argument('--playoff-start', type=int, default=None,
+                       help='First playoff week (default: from league settings)')
+    parser.add_argument('--playoff-teams', type=int, default=None,
+                       help='Number of playoff teams (default: from league settings)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help='Worker processes, and weeks fetched concurrently (default: one per CPU)')
+    parser.add_argument('--db', type=str, default=None,
+                       help='Read history from the local season store (see src.season_store) when stored')
+    add_league_arguments(parser)
+    args = parser.parse_args()
+
+    if args.sims < 1:
+        parser.error('--sims must be at least 1')
+
+    lg = league_from_args(args)
+    current_week = lg.current_week()
+    playoff_start, playoff_teams = playoff_settings(lg.settings(), args.playoff_start, args.playoff_teams)
+
+    records = standings_records(lg)
+    team_keys = sorted(records)
+    index = {team_key: i for i, team_key in enumerate(team_keys)}
+
+    weeks = prediction_weeks(current_week, 'total', args.window)
+    if not weeks:
+        print(f"No finished weeks before Week {current_week} to fit teams on.")
+        return
+
+    conn = open_store(args.db) if args.db else None
+    stored_weeks = set(week_statuses(conn, LEAGUE_ID)) if conn is not None else set()
+    week_store = {w: load_week_rows(conn, LEAGUE_ID, w) for w in stored_weeks if w in weeks}
+    fits, names = fit_weeks(lg, weeks, week_store, args.workers)
+
+    missing = [team_key for team_key in team_keys if team_key not in fits]
+    if missing:
+        print(f"No history for {', '.join(missing)}; cannot project.")
+        return
+
+    schedule = remaining_schedule(lg, current_week, playoff_start, index, args.workers)
+    print(f"Simulating {len(schedule)} remaining week(s) and a {playoff_teams}-team bracket "
+          f"{args.sims:,} times...")
+
+    projection = project_season(
+        [fits[team_key] for team_key in team_keys], schedule,
+        np.array([[records[k]['wins'], records[k]['losses'], records[k]['ties']] for k in team_keys]),
+        playoff_teams, args.sims, args.seed, args.workers,
+    )
+    display_projection(projection, team_keys, names, records, playoff_teams)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,12 +5,12 @@ Usage:
 
 Fill `oauth2.json` in the project root before running.
 """
-from yahoo_oauth import OAuth2
 import yahoo_fantasy_api as yfa
-import logging
-import json
 import os
 
+from src.auth import get_oauth
+from src.session import SessionHandler
+
 
 def list_leagues_via_yfa(from_file: str = 'oauth2.json', year: int = 2025):
     if not os.path.exists(from_file):
@@ -21,12 +21,9 @@ def list_leagues_via_yfa(from_file: str = 'oauth2.json', year: int = 2025):
     if year < 2000 or year > current_year + 1:
         raise ValueError(f"Invalid year: {year}. Must be between 2000 and {current_year + 1}")
 
-    sc = OAuth2(None, None, from_file=from_file)
-    if not sc.token_is_valid():
-        logging.info('Token invalid; refreshing (this may open a browser for first-time auth).')
-        sc.refresh_access_token()
-
+    sc = get_oauth(from_file)
     gm = yfa.Game(sc, 'nba')
+    gm.inject_yhandler(SessionHandler(sc))
     leagues = gm.league_ids(year=year)
     return leagues
 
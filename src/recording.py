@@ -0,0 +1,62 @@
+"""Record and replay raw Yahoo API responses.
+
+RecordingHandler wraps the normal yahoo_fantasy_api transport and saves every
+JSON response it receives to a directory. ReplayHandler serves those files back
+without OAuth or a network connection, so any script can run offline against a
+recorded league (pass --record DIR once, then --replay DIR).
+
+Usage:
+    python -m src.possibility_matrix --week 1 --record recordings/week1
+    python -m src.possibility_matrix --week 1 --replay recordings/week1
+"""
+from yahoo_fantasy_api.yhandler import YHandler
+import json
+import os
+import re
+
+from src.profiling import span
+from src.session import SessionHandler
+
+
+def response_path(directory, uri):
+    """File path a response for uri is recorded to inside directory."""
+    filename = re.sub(r'[^A-Za-z0-9.=_-]+', '_', uri).strip('_')
+    return os.path.join(directory, f"{filename}.json")
+
+
+class RecordingHandler(SessionHandler):
+    """YHandler that saves each GET response to disk as it is fetched."""
+
+    def __init__(self, sc, directory, **options):
+        super().__init__(sc, **options)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, uri):
+        jresp = super().get(uri)
+        with open(response_path(self.directory, uri), 'w', encoding='utf-8') as f:
+            json.dump(jresp, f, ensure_ascii=False)
+        return jresp
+
+
+class ReplayHandler(YHandler):
+    """YHandler that serves previously recorded responses instead of calling Yahoo."""
+
+    def __init__(self, directory):
+        super().__init__(None)
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Replay directory not found: {directory}")
+        self.directory = directory
+
+    def get(self, uri):
+        path = response_path(self.directory, uri)
+        if not os.path.exists(path):
+            raise RuntimeError(f"No recorded response for '{uri}' in {self.directory}")
+        with span('json', uri=uri, source='replay'), open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def put(self, uri, data):
+        raise RuntimeError("Replay mode is read-only")
+
+    def post(self, uri, data):
+        raise RuntimeError("Replay mode is read-only")
@@ -0,0 +1,155 @@
+"""Weekly reports from one league handle and one scoreboard fetch.
+
+Running src.possibility_matrix, src.category_rankings and
+src.predict_matchups separately authenticates three times and downloads the
+same week three times. `python -m src report` builds the league handle once,
+fetches and parses the week once (one request even for the current week,
+since the scoreboard says which week it is), and feeds every requested
+report from that data.
+
+Usage:
+    python -m src report --week 5 --matrix --rankings --predict
+    python -m src report --matrix --rankings
+    python -m src report --week 5 --predict --window 4 --db season.db
+
+With no report flags every report is run. Predictions use --method
+(default: total) or --window K, as in src.predict_matchups.
+"""
+import argparse
+
+from src.auth import LEAGUE_ID, add_league_arguments, league_from_args
+from src.category_rankings import (
+    rank_teams_by_category, display_rankings_matrix, display_detailed_rankings,
+    analyze_category_strengths,
+)
+from src.deltas import apply_exact_percentages
+from src.possibility_matrix import (
+    generate_possibility_matrix, display_possibility_matrix, analyze_matrix_insights,
+)
+from src.predict_matchups import (
+    display_predictions, fold_weeks, method_label, predict_matchup, prediction_weeks, prefetch_week_stats,
+)
+from src.prefetch import DEFAULT_MAX_WORKERS
+from src.rolling import RollingAggregator
+from src.scoreboard import parse_scoreboard, scheduled_matchups, teams_by_name
+from src.season_store import open_store, week_statuses, load_week_rows, load_teams_by_name, load_matchups
+
+
+def window_size(value):
+    """argparse type for --window: a whole number of weeks, at least 1."""
+    size = int(value)
+    if size < 1:
+        raise argparse.ArgumentTypeError('must be at least 1')
+    return size
+
+
+def add_arguments(parser):
+    """Add the report command's options to parser."""
+    parser.add_argument('--week', type=int, default=None,
+                        help='Week to report on (default: current week)')
+    parser.add_argument('--matrix', action='store_true', help='Possibility matrix and insights')
+    parser.add_argument('--rankings', action='store_true', help='Category rankings')
+    parser.add_argument('--predict', action='store_true', help='Matchup predictions')
+    parser.add_argument('--method', type=str, default='total', choices=['last', 'last3', 'total'],
+                        help='Prediction method (default: total)')
+    parser.add_argument('--window', type=window_size, default=None, metavar='K',
+                        help='Predict from the last K weeks instead of --method')
+    parser.add_argument('--db', type=str, default=None,
+                        help='Read weeks from the local season store (see src.season_store) when stored')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f'History weeks to fetch concurrently (default: {DEFAULT_MAX_WORKERS})')
+    add_league_arguments(parser)
+    parser.set_defaults(run=run_report)
+
+
+def week_data_from_scoreboard(raw_matchups):
+    """Everything the reports need from one raw scoreboard, parsed once."""
+    table = parse_scoreboard(raw_matchups)
+    teams = teams_by_name(table)
+    matchups = scheduled_matchups(table)
+    return {
+        'week': table['week'],
+        'teams': teams,
+        # The matrix compares FG%/FT% from exact makes/attempts
+        'exact_teams': teams_by_name(apply_exact_percentages(table)),
+        'matchups': matchups,
+    }
+
+
+def week_data_from_store(conn, week):
+    """The same data for a week already in the season store."""
+    return {
+        'week': week,
+        'teams': load_teams_by_name(conn, LEAGUE_ID, week),
+        'exact_teams': load_teams_by_name(conn, LEAGUE_ID, week, exact=True),
+        'matchups': load_matchups(conn, LEAGUE_ID, week),
+    }
+
+
+def run_report(args):
+    """Fetch the week once and run each requested report on it."""
+    if not (args.matrix or args.rankings or args.predict):
+        args.matrix = args.rankings = args.predict = True
+
+    conn = open_store(args.db) if args.db else None
+    stored_weeks = set(week_statuses(conn, LEAGUE_ID)) if conn is not None else set()
+
+    # Authenticate only if the week or (for predictions) its history is missing
+    needed = set() if args.week is None else {args.week}
+    if args.predict and args.week is not None:
+        needed.update(prediction_weeks(args.week, args.method, args.window))
+    lg = None
+    if args.week is None or not needed <= stored_weeks:
+        lg = league_from_args(args)
+
+    if args.week is not None and args.week in stored_weeks:
+        print(f"Loading Week {args.week} from {args.db}...")
+        data = week_data_from_store(conn, args.week)
+    else:
+        try:
+            raw_matchups = lg.matchups() if args.week is None else lg.matchups(week=args.week)
+        except Exception as e:
+            print(f"Error fetching week {args.week or 'current'} data: {e}")
+            return
+        data = week_data_from_scoreboard(raw_matchups)
+
+    week = data['week'] if args.week is None else args.week
+    if not data['teams']:
+        print(f"No data found for Week {week}. The week may not have started yet.")
+        return
+    print(f"Week {week}: {len(data['teams'])} teams.\n")
+
+    if args.matrix:
+        matrix = generate_possibility_matrix(data['exact_teams'])
+        display_possibility_matrix(matrix, week)
+        analyze_matrix_insights(matrix, data['exact_teams'])
+
+    if args.rankings:
+        rankings = rank_teams_by_category(data['teams'])
+        display_rankings_matrix(data['teams'], rankings, week)
+        display_detailed_rankings(data['teams'], rankings, week)
+        analyze_category_strengths(rankings)
+
+    if args.predict:
+        run_predictions(args, lg, conn, stored_weeks, week, data['matchups'])
+
+
+def run_predictions(args, lg, conn, stored_weeks, week, matchups):
+    """Predict the week's matchups, fetching each missing history week once."""
+    weeks = prediction_weeks(week, args.method, args.window)
+    week_store = {w: load_week_rows(conn, LEAGUE_ID, w) for w in stored_weeks if w in weeks}
+    if lg is None and not set(weeks) <= set(week_store):
+        lg = league_from_args(args)
+    aggregator = RollingAggregator()
+    try:
+        prefetch_week_stats(lg, weeks, week_store, args.workers)
+        if weeks:
+            fold_weeks(aggregator, lg, weeks, week_store)
+    except (RuntimeError, OSError) as e:
+        print(f"Error fetching historical weeks: {e}")
+        return
+    predictions = [
+        predict_matchup(lg, matchup, week, args.method, week_store, aggregator, args.window)
+        for matchup in matchups
+    ]
+    display_predictions(matchups, predictions, week, method_label(args.method, args.window))
@@ -0,0 +1,117 @@
+"""On-disk cache of raw Yahoo responses that knows which ones can change.
+
+A finished week (every matchup in the payload "postevent", requested for an
+explicit week) does not change apart from rare stat corrections, and league
+metadata (settings, stat categories, teams) is fixed for a season; both are
+kept until the cache is cleared. Everything else (the current week, live
+weeks, standings, players) is reused for live_ttl seconds.
+
+Entries are keyed by the request URI, which carries the endpoint and all of
+its parameters, and pickled one file per URI. With a warm cache a historical
+report makes no network calls at all.
+
+Usage:
+    python -m src.predict_matchups --method total --week 10 --cache
+    python -m src.possibility_matrix --week 3 --cache .yahoo_cache --cache-ttl 30
+    python -m src.response_cache clear
+"""
+import argparse
+import hashlib
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import time
+
+from src.profiling import span
+
+DEFAULT_CACHE_DIR = '.yahoo_cache'
+DEFAULT_LIVE_TTL = 60
+
+METADATA_URI = re.compile(r'/(settings|stat_categories|teams)$')
+WEEK_URI = re.compile(r'[;?&]weeks?=')
+
+
+def matchup_statuses(payload):
+    """Yield the status of every matchup (a dict with 'week' and 'status') in payload."""
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if 'status' in node and 'week' in node:
+                yield node['status']
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def is_final(uri, payload):
+    """True if the response for uri can be kept indefinitely."""
+    if METADATA_URI.search(uri):
+        return True
+    if not WEEK_URI.search(uri):
+        return False
+    statuses = set(matchup_statuses(payload))
+    return statuses == {'postevent'}
+
+
+class ResponseCache:
+    """Pickled responses in directory; final ones forever, others for live_ttl seconds."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, live_ttl=DEFAULT_LIVE_TTL, clock=time.time):
+        self.directory = directory
+        self.live_ttl = live_ttl
+        self.clock = clock
+        self.counters = {'hits': 0, 'misses': 0}
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, uri):
+        return os.path.join(self.directory, hashlib.sha1(uri.encode('utf-8')).hexdigest() + '.pickle')
+
+    def get(self, uri):
+        """The cached response for uri, or None if missing or expired."""
+        with span('cache', uri=uri):
+            return self._get(uri)
+
+    def _get(self, uri):
+        try:
+            with open(self.path(uri), 'rb') as f:
+                stored_at, final, payload = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.counters['misses'] += 1
+            return None
+
+        if final or self.clock() - stored_at < self.live_ttl:
+            self.counters['hits'] += 1
+            return payload
+        self.counters['misses'] += 1
+        return None
+
+    def put(self, uri, payload):
+        """Store payload for uri, written atomically so readers never see half a file."""
+        entry = (self.clock(), is_final(uri, payload), payload)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path(uri))
+
+    def clear(self):
+        """Drop every entry (e.g. after Yahoo posts stat corrections)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the Yahoo response cache')
+    parser.add_argument('command', choices=['clear'])
+    parser.add_argument('--cache', type=str, default=DEFAULT_CACHE_DIR,
+                        help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+    args = parser.parse_args()
+
+    ResponseCache(args.cache).clear()
+    print(f"Cleared {args.cache}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""Incremental rolling-window aggregates for predictions.
+
+RollingAggregator keeps per-team running totals (prefix sums) of makes,
+attempts and counting stats, one entry per week folded in. Adding a week is
+O(1) per team, and the totals for any trailing window (last week, last 3,
+season, or any K) are the difference of two prefix entries, so nothing is
+rescanned. FG%/FT% averages are total makes / total attempts, which weights
+each week by its attempts instead of averaging percentages.
+
+State can be saved to and loaded from a JSON file, so a later run only folds
+in the weeks it has not seen yet. The file records the league key (which also
+fixes the season) and, for every folded week, its status and a digest of its
+rows: a week that was still live when folded, or whose rows have changed
+since (Yahoo stat corrections), is refolded instead of reused.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from src.deltas import COUNT_KEYS, category_lines
+from src.matrix_engine import CATEGORY_KEYS
+
+
+def row_counts(row):
+    """Counting vector (COUNT_KEYS order) from a team row; missing values count as 0."""
+    return np.array([row.get(key) or 0.0 for key in COUNT_KEYS], dtype=float)
+
+
+def week_signature(rows):
+    """[status, digest of every team's counts] identifying one week's rows."""
+    lines = sorted((row['team_key'], row_counts(row).tolist()) for row in rows)
+    digest = hashlib.sha1(json.dumps(lines).encode('utf-8')).hexdigest()
+    return [rows[0].get('status') if rows else None, digest]
+
+
+class RollingAggregator:
+    """Running per-team totals that answer any trailing window in O(1)."""
+
+    def __init__(self, league_key=None):
+        self.league_key = league_key
+        self.first_week = None
+        self.last_week = None
+        # team_key -> list of prefix totals; entry k covers the first k folded
+        # weeks, with a trailing "weeks played" count
+        self.prefix = {}
+        # week -> week_signature of the rows folded for it
+        self.signatures = {}
+
+    def reset(self):
+        """Forget everything folded so far."""
+        self.__init__(self.league_key)
+
+    def truncate(self, week):
+        """Forget week and every week folded after it."""
+        if self.first_week is None or week > self.last_week:
+            return
+        if week <= self.first_week:
+            self.reset()
+            return
+
+        keep = week - self.first_week + 1
+        self.prefix = {team_key: history[:keep] for team_key, history in self.prefix.items()}
+        self.signatures = {w: signature for w, signature in self.signatures.items() if w < week}
+        self.last_week = week - 1
+
+    def is_final(self, week):
+        """True if week was folded from rows of a finished (postevent) week."""
+        return self.signatures.get(week, [None])[0] == 'postevent'
+
+    def changed(self, week, rows):
+        """True if rows differ from what was folded for week."""
+        return self.signatures.get(week) != week_signature(rows)
+
+    def fold_week(self, week, rows):
+        """Add one week of team rows. Weeks must be folded in order without gaps."""
+        if self.last_week is not None and week != self.last_week + 1:
+            raise ValueError(f"Expected week {self.last_week + 1}, got week {week}")
+
+        if self.first_week is None:
+            self.first_week = week
+        folded = week - self.first_week
+        zero = np.zeros(len(COUNT_KEYS) + 1)
+
+        seen = set()
+        for row in rows:
+            team_key = row['team_key']
+            history = self.prefix.setdefault(team_key, [zero] * (folded + 1))
+            history.append(history[-1] + np.append(row_counts(row), 1.0))
+            seen.add(team_key)
+
+        # Teams without a line this week carry their totals forward
+        for team_key, history in self.prefix.items():
+            if team_key not in seen:
+                history.append(history[-1])
+
+        self.signatures[week] = week_signature(rows)
+        self.last_week = week
+
+    def covers(self, start_week, end_week):
+        """True if every week in start_week..end_week has been folded in."""
+        return (self.first_week is not None
+                and self.first_week <= start_week and end_week <= self.last_week)
+
+    def window_totals(self, team_key, end_week, size=None):
+        """Totals over the size weeks ending at end_week (all folded weeks if None).
+
+        Returns (counts vector in COUNT_KEYS order, weeks played), or None if
+        the team is unknown or the window is not covered.
+        """
+        start_week = self.first_week if size is None else end_week - size + 1
+        if team_key not in self.prefix or not self.covers(start_week, end_week):
+            return None
+
+        history = self.prefix[team_key]
+        totals = history[end_week - self.first_week + 1] - history[start_week - self.first_week]
+        return totals[:-1], int(totals[-1])
+
+    def window_average(self, team_key, end_week, size=None):
+        """Per-week average category line over a window, as {stat_key: float}.
+
+        Counting stats are averaged over weeks played; FG%/FT% are total makes
+        over total attempts. Returns {} if the team has no weeks in the window.
+        """
+        result = self.window_totals(team_key, end_week, size)
+        if result is None or result[1] == 0:
+            return {}
+
+        counts, played = result
+        line = category_lines(counts / played)
+        return {stat_key: float(line[c]) for c, stat_key in enumerate(CATEGORY_KEYS)}
+
+    def save(self, path):
+        """Write the aggregator state to a JSON file."""
+        state = {
+            'league_key': self.league_key,
+            'first_week': self.first_week,
+            'last_week': self.last_week,
+            'prefix': {team_key: [entry.tolist() for entry in history]
+                       for team_key, history in self.prefix.items()},
+            'signatures': self.signatures,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+    @classmethod
+    def load(cls, path, league_key=None):
+        """Read aggregator state from a JSON file (an empty aggregator if missing).
+
+        Raises ValueError if the file was saved for a different league_key.
+        """
+        aggregator = cls(league_key)
+        if not os.path.exists(path):
+            return aggregator
+
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('league_key') != league_key:
+            raise ValueError(f"{path} holds running totals for league {state.get('league_key')}, "
+                             f"not {league_key}; use another --state file or delete it")
+        aggregator.first_week = state['first_week']
+        aggregator.last_week = state['last_week']
+        aggregator.prefix = {team_key: [np.array(entry) for entry in history]
+                             for team_key, history in state['prefix'].items()}
+        aggregator.signatures = {int(week): signature for week, signature in state['signatures'].items()}
+        return aggregator
@@ -0,0 +1,184 @@
+"""Rate-limit-aware scheduler for Yahoo API requests.
+
+Every request made through src.session goes through one process-wide
+RequestScheduler:
+
+- A token bucket caps the request rate (rate per second, bursts up to burst).
+- An adaptive limit caps concurrent requests. A throttled response (HTTP 999
+  or 429) halves it; each run of `limit` successful requests raises it by
+  one, up to max_concurrency. Bulk fetches on a thread pool settle at the
+  highest rate Yahoo accepts instead of failing or crawling.
+- Throttled and transient failures (5xx, dropped connections) are retried
+  with jittered exponential backoff, honouring Retry-After when given.
+  Anything else is raised at once.
+
+Counters (requests, throttled, retried, failed) are kept for reporting.
+
+Usage:
+    from src.scheduler import shared_scheduler
+    jresp = shared_scheduler().call(fetch, uri)
+    print(shared_scheduler().stats())
+"""
+import logging
+import random
+import threading
+import time
+
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+
+
+class TransientError(RuntimeError):
+    """A request failure worth retrying (server error, dropped connection)."""
+
+
+class Throttled(TransientError):
+    """Yahoo refused the request for rate limiting (HTTP 999 or 429)."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Blocking token bucket: rate tokens per second, holding at most burst."""
+
+    def __init__(self, rate, burst, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+
+class RequestScheduler:
+    """Rate limit, adaptive concurrency and retries around request calls."""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 max_retries=DEFAULT_MAX_RETRIES, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY,
+                 clock=time.monotonic, sleep=time.sleep, jitter=random.random):
+        self.bucket = TokenBucket(rate, burst, clock, sleep)
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.jitter = jitter
+
+        self.active = 0
+        self.streak = 0
+        self.condition = threading.Condition()
+        self.counters = {'requests': 0, 'throttled': 0, 'retried': 0, 'failed': 0}
+
+    def call(self, fn, *args, retries=None):
+        """Return fn(*args), retrying throttled and transient failures.
+
+        retries overrides max_retries (0 for requests that must not repeat).
+        """
+        retries = self.max_retries if retries is None else retries
+        attempt = 0
+        while True:
+            self._enter()
+            try:
+                self.bucket.acquire()
+                self._count('requests')
+                result = fn(*args)
+            except (TransientError, OSError) as e:
+                error = e
+                if isinstance(e, Throttled):
+                    self._throttled()
+            else:
+                self._succeeded()
+                return result
+            finally:
+                self._leave()
+
+            if attempt >= retries:
+                self._count('failed')
+                raise error
+
+            delay = self.backoff(attempt, getattr(error, 'retry_after', None))
+            logging.warning("Yahoo request failed (%s); retry %d/%d in %.1fs.", error, attempt + 1, retries, delay)
+            self._count('retried')
+            self.sleep(delay)
+            attempt += 1
+
+    def backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential delay for attempt, at least retry_after."""
+        delay = self.jitter() * min(self.max_delay, self.base_delay * 2 ** attempt)
+        return max(delay, retry_after or 0.0)
+
+    def stats(self):
+        """Counters plus the current concurrency limit."""
+        with self.condition:
+            return dict(self.counters, concurrency=self.limit)
+
+    def _count(self, name):
+        with self.condition:
+            self.counters[name] += 1
+
+    def _enter(self):
+        with self.condition:
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.active += 1
+
+    def _leave(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    def _throttled(self):
+        with self.condition:
+            self.counters['throttled'] += 1
+            self.limit = max(1, self.limit // 2)
+            self.streak = 0
+
+    def _succeeded(self):
+        with self.condition:
+            self.streak += 1
+            if self.streak >= self.limit and self.limit < self.max_concurrency:
+                self.limit += 1
+                self.streak = 0
+                self.condition.notify_all()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def shared_scheduler():
+    """The process-wide scheduler, created with defaults on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler()
+        return _scheduler
+
+
+def configure_scheduler(**options):
+    """Replace the process-wide scheduler with one built from options."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = RequestScheduler(**options)
+        return _scheduler
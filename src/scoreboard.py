@@ -0,0 +1,243 @@
+"""Shared parser for Yahoo scoreboard (lg.matchups) payloads.
+
+One pass over a scoreboard produces a compact columnar team-week table:
+
+    {
+        'week': 1, 'status': 'postevent',
+        'team_keys': [...], 'names': [...],          # one entry per team row
+        'matchup_index': int array,                  # which matchup the row is in
+        'opponent': int array,                       # row index of the opponent
+        'stats': float array (N×C, CATEGORY_KEYS order, NaN if missing),
+        'made_attempted': int array (N×4: FGM, FGA, FTM, FTA, -1 if missing),
+    }
+
+Every report builds on this table instead of walking the nested team lists
+itself, so parsing is paid once per payload.
+"""
+import numpy as np
+
+from src.matrix_engine import CATEGORY_KEYS
+from src.profiling import timed
+
+
+# Yahoo stat_id -> our stat key
+STAT_MAP = {
+    '9004003': 'fgm_fga',
+    '5': 'fg_pct',
+    '9007006': 'ftm_fta',
+    '8': 'ft_pct',
+    '10': '3ptm',
+    '12': 'pts',
+    '15': 'reb',
+    '16': 'ast',
+    '17': 'st',
+    '18': 'blk',
+    '19': 'to'
+}
+
+MADE_ATTEMPTED_KEYS = ['fgm', 'fga', 'ftm', 'fta']
+
+# stat_id -> column in the stats array / first column in made_attempted
+_CATEGORY_COLUMNS = {
+    stat_id: CATEGORY_KEYS.index(stat_key)
+    for stat_id, stat_key in STAT_MAP.items() if stat_key in CATEGORY_KEYS
+}
+_SPLIT_COLUMNS = {'9004003': 0, '9007006': 2}
+
+
+def parse_team_stats(team_data):
+    """Extract raw stat strings ({stat_key: value}) from one team entry."""
+    stats = {}
+
+    if not isinstance(team_data, list) or len(team_data) < 2:
+        return stats
+
+    stats_container = team_data[1]
+
+    if not isinstance(stats_container, dict) or 'team_stats' not in stats_container:
+        return stats
+
+    for stat_item in stats_container['team_stats'].get('stats', []):
+        stat = stat_item['stat']
+        stat_key = STAT_MAP.get(stat['stat_id'])
+        if stat_key:
+            stats[stat_key] = stat['value']
+
+    return stats
+
+
+def get_team_metadata(team_data):
+    """Return (team_key, name) from one team entry in a single walk."""
+    team_key = None
+    name = None
+
+    if not isinstance(team_data, list) or len(team_data) < 1:
+        return team_key, "Unknown Team"
+
+    metadata = team_data[0]
+    if not isinstance(metadata, list):
+        return team_key, "Unknown Team"
+
+    for item in metadata:
+        if isinstance(item, dict):
+            if team_key is None and 'team_key' in item:
+                team_key = item['team_key']
+            if name is None and 'name' in item:
+                name = item['name']
+            if team_key is not None and name is not None:
+                break
+
+    return team_key, name if name is not None else "Unknown Team"
+
+
+def get_team_name(team_data):
+    """Extract team name from team data."""
+    return get_team_metadata(team_data)[1]
+
+
+def get_team_key(team_data):
+    """Extract team key from team data."""
+    return get_team_metadata(team_data)[0]
+
+
+def to_float(value):
+    """Convert a Yahoo stat string to float, treating blanks and junk as 0.0."""
+    if value and value.strip():
+        try:
+            return float(value)
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+def split_made_attempted(value):
+    """Split a "176/371" makes/attempts string into (176, 371)."""
+    try:
+        made, attempted = value.split('/')
+        return int(made), int(attempted)
+    except (AttributeError, ValueError):
+        return None, None
+
+
+def get_matchups_container(raw_matchups):
+    """Navigate a raw lg.matchups() payload down to its matchups container."""
+    league_data = raw_matchups['fantasy_content']['league']
+    scoreboard = league_data[1]['scoreboard']
+    return scoreboard['0']['matchups']
+
+
+def parse_scoreboard(raw_matchups):
+    """Parse a raw lg.matchups() payload into a team-week table."""
+    league_data = raw_matchups['fantasy_content']['league']
+    scoreboard = league_data[1]['scoreboard']
+    week = scoreboard.get('week')
+    return parse_matchups(scoreboard['0']['matchups'], int(week) if week else None)
+
+
+@timed('parse')
+def parse_matchups(matchups_container, week=None):
+    """Parse a scoreboard matchups container into a team-week table in one pass."""
+    matchup_count = int(matchups_container['count'])
+    n = matchup_count * 2
+
+    team_keys = []
+    names = []
+    matchup_index = np.repeat(np.arange(matchup_count), 2)
+    opponent = np.arange(n) ^ 1  # rows 2k and 2k+1 face each other
+    stats = np.full((n, len(CATEGORY_KEYS)), np.nan)
+    made_attempted = np.full((n, len(MADE_ATTEMPTED_KEYS)), -1, dtype=np.int64)
+    status = None
+
+    row = 0
+    for i in range(matchup_count):
+        matchup = matchups_container[str(i)]['matchup']
+        if status is None:
+            status = matchup.get('status')
+        if week is None and 'week' in matchup:
+            week = int(matchup['week'])
+
+        matchup_teams = matchup['0']['teams']
+        for team_idx in ('0', '1'):
+            team_data = matchup_teams[team_idx]['team']
+            team_key, name = get_team_metadata(team_data)
+            team_keys.append(team_key)
+            names.append(name)
+
+            stats_container = team_data[1] if len(team_data) > 1 else {}
+            team_stats = stats_container.get('team_stats', {}) if isinstance(stats_container, dict) else {}
+            for stat_item in team_stats.get('stats', []):
+                stat = stat_item['stat']
+                stat_id = stat['stat_id']
+                if stat_id in _CATEGORY_COLUMNS:
+                    stats[row, _CATEGORY_COLUMNS[stat_id]] = to_float(stat['value'])
+                elif stat_id in _SPLIT_COLUMNS:
+                    made, attempted = split_made_attempted(stat['value'])
+                    if made is not None:
+                        column = _SPLIT_COLUMNS[stat_id]
+                        made_attempted[row, column] = made
+                        made_attempted[row, column + 1] = attempted
+
+            row += 1
+
+    return {
+        'week': week,
+        'status': status,
+        'team_keys': team_keys,
+        'names': names,
+        'matchup_index': matchup_index,
+        'opponent': opponent,
+        'stats': stats,
+        'made_attempted': made_attempted,
+    }
+
+
+def row_stats(table, i):
+    """Stats for table row i as {stat_key: float}, skipping missing categories."""
+    values = table['stats'][i]
+    return {
+        stat_key: float(values[c])
+        for c, stat_key in enumerate(CATEGORY_KEYS) if not np.isnan(values[c])
+    }
+
+
+def teams_by_name(table):
+    """Table as {team_name: {stat_key: float}}."""
+    return {name: row_stats(table, i) for i, name in enumerate(table['names'])}
+
+
+def teams_by_key(table):
+    """Table as {team_key: {'stats': {stat_key: float}}}."""
+    return {team_key: {'stats': row_stats(table, i)} for i, team_key in enumerate(table['team_keys'])}
+
+
+def scheduled_matchups(table):
+    """Scheduled matchups as a list of team1/team2 name and key dicts."""
+    matchups = []
+    for i in range(0, len(table['team_keys']), 2):
+        matchups.append({
+            'team1_name': table['names'][i],
+            'team2_name': table['names'][i + 1],
+            'team1_key': table['team_keys'][i],
+            'team2_key': table['team_keys'][i + 1]
+        })
+    return matchups
+
+
+def team_rows(table):
+    """Table as one flat dict per team (stats plus makes/attempts, None if missing)."""
+    rows = []
+    for i, team_key in enumerate(table['team_keys']):
+        row = {
+            'team_key': team_key,
+            'name': table['names'][i],
+            'opponent_key': table['team_keys'][table['opponent'][i]],
+            'matchup_index': int(table['matchup_index'][i]),
+        }
+        for c, split_key in enumerate(MADE_ATTEMPTED_KEYS):
+            value = int(table['made_attempted'][i, c])
+            row[split_key] = value if value >= 0 else None
+        for c, stat_key in enumerate(CATEGORY_KEYS):
+            value = table['stats'][i, c]
+            row[stat_key] = 0.0 if np.isnan(value) else float(value)
+        rows.append(row)
+    return rows
@@ -0,0 +1,217 @@
+"""Season-wide Possibility Matrix: true (all-play) record vs scheduled record.
+
+Every completed week is loaded once and stacked into a weeks×teams×teams
+result tensor. Summing it gives each team's record as if it had played every
+other team every week, which is compared with the record the schedule actually
+produced to measure scheduling luck. FG%/FT% are compared from exact
+makes/attempts, as in the single-week matrix.
+
+Usage:
+    python -m src.possibility_matrix --season
+    python -m src.possibility_matrix --season --db season.db
+    python -m src.possibility_matrix --season --batched
+"""
+import numpy as np
+
+from src.matrix_engine import CATEGORY_KEYS, possibility_matrices
+from src.batch_fetch import fetch_league_weeks
+from src.deltas import apply_exact_row_percentages
+from src.prefetch import DEFAULT_MAX_WORKERS, prefetch_weeks
+from src.profiling import timed
+from src.scoreboard import parse_scoreboard, team_rows
+from src.season_store import week_statuses, load_week_rows
+
+
+def completed_weeks_from_store(conn, league_key):
+    """{week: rows} for every finished week of league_key in the season store."""
+    return {
+        week: apply_exact_row_percentages(load_week_rows(conn, league_key, week))
+        for week, status in sorted(week_statuses(conn, league_key).items())
+        if status == 'postevent'
+    }
+
+
+def completed_weeks_from_league(lg, max_workers=DEFAULT_MAX_WORKERS, batched=False):
+    """{week: rows} for every finished week, fetching each week once in parallel.
+
+    With batched, the weeks come from multi-week team requests (see
+    src.batch_fetch) rather than one scoreboard per week.
+    """
+    weeks = range(1, lg.current_week() + 1)
+    if batched:
+        tables = fetch_league_weeks(lg, weeks, max_workers=max_workers)
+    else:
+        tables = prefetch_weeks(lg, weeks, parse_scoreboard, max_workers)
+    return {
+        week: apply_exact_row_percentages(team_rows(table))
+        for week, table in tables.items() if table['status'] == 'postevent'
+    }
+
+
+@timed('compute')
+def build_season_tensor(season_rows):
+    """Stack per-week team rows into a season result tensor.
+
+    Returns a dict with 'weeks', 'team_keys', 'team_names', W×N×N int8
+    'wins'/'losses'/'ties' arrays and a W×N 'opponents' array holding each
+    team's scheduled opponent index (-1 if it had none that week).
+    """
+    weeks = sorted(season_rows)
+
+    team_keys = []
+    team_names = {}
+    for week in weeks:
+        for row in season_rows[week]:
+            if row['team_key'] not in team_names:
+                team_keys.append(row['team_key'])
+            team_names[row['team_key']] = row['name']
+    index = {team_key: i for i, team_key in enumerate(team_keys)}
+
+    n = len(team_keys)
+    values = np.full((len(weeks), n, len(CATEGORY_KEYS)), np.nan)
+    opponents = np.full((len(weeks), n), -1, dtype=np.int64)
+
+    for w, week in enumerate(weeks):
+        for row in season_rows[week]:
+            i = index[row['team_key']]
+            values[w, i] = [row[stat_key] for stat_key in CATEGORY_KEYS]
+            opponents[w, i] = index.get(row['opponent_key'], -1)
+
+    shape = (len(weeks), n, n)
+    wins = np.zeros(shape, dtype=np.int8)
+    ties = np.zeros(shape, dtype=np.int8)
+    for w in range(len(weeks)):
+        wins[w], _, ties[w] = possibility_matrices(values[w])
+
+    return {
+        'weeks': weeks,
+        'team_keys': team_keys,
+        'team_names': [team_names[team_key] for team_key in team_keys],
+        'wins': wins,
+        'losses': wins.transpose(0, 2, 1),
+        'ties': ties,
+        'opponents': opponents,
+    }
+
+
+def season_all_play_records(tensor):
+    """Aggregate the tensor into each team's all-play record.
+
+    Returns {team_key: record} with category totals ('cat_wins', 'cat_losses')
+    over every opponent and week, matchup totals ('wins', 'losses', 'ties')
+    counting each week-opponent pair as one matchup, and 'expected_wins':
+    the category wins an average opponent would have conceded each week.
+    """
+    wins = tensor['wins'].astype(np.int64)
+    losses = tensor['losses'].astype(np.int64)
+    n = len(tensor['team_keys'])
+
+    # Exclude each team vs itself, and pairs where either team did not play
+    active = tensor['opponents'] >= 0
+    played = active[:, :, None] & active[:, None, :] & ~np.eye(n, dtype=bool)[None, :, :]
+
+    cat_wins = np.where(played, wins, 0).sum(axis=(0, 2))
+    cat_losses = np.where(played, losses, 0).sum(axis=(0, 2))
+    matchup_wins = (played & (wins > losses)).sum(axis=(0, 2))
+    matchup_losses = (played & (wins < losses)).sum(axis=(0, 2))
+    matchup_ties = (played & (wins == losses)).sum(axis=(0, 2))
+
+    opponents_per_week = played.sum(axis=2)
+    weekly_mean = np.where(played, wins, 0).sum(axis=2) / np.maximum(opponents_per_week, 1)
+    expected_wins = weekly_mean.sum(axis=0)
+
+    return {
+        team_key: {
+            'cat_wins': int(cat_wins[i]),
+            'cat_losses': int(cat_losses[i]),
+            'wins': int(matchup_wins[i]),
+            'losses': int(matchup_losses[i]),
+            'ties': int(matchup_ties[i]),
+            'expected_wins': float(expected_wins[i]),
+        }
+        for i, team_key in enumerate(tensor['team_keys'])
+    }
+
+
+def scheduled_records(tensor):
+    """Category W-L-T each team earned against its actual scheduled opponents."""
+    records = {}
+    num_categories = len(CATEGORY_KEYS)
+
+    for i, team_key in enumerate(tensor['team_keys']):
+        wins = losses = ties = 0
+        for w in range(len(tensor['weeks'])):
+            j = tensor['opponents'][w, i]
+            if j < 0:
+                continue
+            week_wins = int(tensor['wins'][w, i, j])
+            week_losses = int(tensor['losses'][w, i, j])
+            wins += week_wins
+            losses += week_losses
+            ties += num_categories - week_wins - week_losses
+        records[team_key] = {'wins': wins, 'losses': losses, 'ties': ties}
+
+    return records
+
+
+def standings_records(lg):
+    """Official W-L-T from lg.standings(), keyed by team_key."""
+    records = {}
+    for team in lg.standings():
+        totals = team.get('outcome_totals', {})
+        records[team['team_key']] = {
+            'wins': int(totals.get('wins', 0)),
+            'losses': int(totals.get('losses', 0)),
+            'ties': int(totals.get('ties', 0)),
+        }
+    return records
+
+
+@timed('render')
+def display_season_report(tensor, records, scheduled, source):
+    """Display all-play vs scheduled records and the resulting luck."""
+    # ANSI color codes
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    BOLD = '\033[1m'
+    RESET = '\033[0m'
+
+    weeks = tensor['weeks']
+    print(f"\n{BOLD}{'═' * 120}{RESET}")
+    print(f"{BOLD}SEASON POSSIBILITY MATRIX - TRUE RECORD VS SCHEDULED RECORD{RESET}")
+    print(f"Completed weeks: {', '.join(str(week) for week in weeks)} ({len(weeks)} total)")
+    print(f"Scheduled records from {source}")
+    print(f"{BOLD}{'═' * 120}{RESET}\n")
+
+    print(f"{'Rank':<6} {'Team':<32} {'All-Play W-L-T':<16} {'Cats Won-Lost':<15} "
+          f"{'Scheduled W-L-T':<17} {'Expected W':<12} {'Luck':<8}")
+    print(f"{'─' * 120}")
+
+    ranked = sorted(
+        zip(tensor['team_keys'], tensor['team_names']),
+        key=lambda item: records[item[0]]['cat_wins'] - records[item[0]]['cat_losses'],
+        reverse=True
+    )
+
+    for rank, (team_key, team_name) in enumerate(ranked, 1):
+        record = records[team_key]
+        sched = scheduled.get(team_key, {'wins': 0, 'losses': 0, 'ties': 0})
+        luck = sched['wins'] - record['expected_wins']
+
+        all_play_str = f"{record['wins']}-{record['losses']}-{record['ties']}"
+        cats_str = f"{record['cat_wins']}-{record['cat_losses']}"
+        sched_str = f"{sched['wins']}-{sched['losses']}-{sched['ties']}"
+        luck_color = GREEN if luck > 0 else RED if luck < 0 else ''
+        luck_reset = RESET if luck_color else ''
+
+        print(f"{rank:<6} {team_name[:30]:<32} {all_play_str:<16} {cats_str:<15} "
+              f"{sched_str:<17} {record['expected_wins']:<12.1f} {luck_color}{luck:+.1f}{luck_reset}")
+
+    print(f"\n{BOLD}{'═' * 120}{RESET}")
+    print(f"{BOLD}LEGEND:{RESET}")
+    print("  All-Play W-L-T   = Matchups won/lost/tied if the team played every opponent every week")
+    print("  Cats Won-Lost    = Categories won/lost across all of those matchups")
+    print("  Scheduled W-L-T  = Category record against the actual schedule")
+    print("  Expected W       = Category wins against an average opponent, summed over weeks")
+    print(f"  Luck             = Scheduled wins - Expected wins ({GREEN}+{RESET} lucky, {RED}-{RESET} unlucky)")
+    print(f"{BOLD}{'═' * 120}{RESET}")
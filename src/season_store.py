@@ -0,0 +1,288 @@
+"""Local SQLite store of per-team, per-week stat lines.
+
+Weeks are fetched from Yahoo once and kept in a local database keyed by
+(team_key, week). Finished weeks (status "postevent") are never fetched again;
+weeks that are missing or still in progress are refreshed on each sync.
+
+One database can hold many leagues and seasons: week statuses are keyed by
+(league_key, week), and every read and replace is scoped to one league, whose
+team keys all start with its league key ('466.l.51741.t.3').
+
+Usage:
+    python -m src.season_store sync
+    python -m src.season_store sync --through 5 --db season.db
+    python -m src.season_store sync --batched
+    python -m src.season_store ingest recordings/*/league_*_scoreboard_week=*.json
+"""
+import argparse
+import sqlite3
+
+from src.auth import add_league_arguments, league_from_args
+from src.batch_fetch import fetch_league_weeks, league_key_of
+from src.deltas import apply_exact_row_percentages
+from src.ingest import iter_recordings
+from src.prefetch import DEFAULT_MAX_WORKERS, prefetch_weeks
+from src.scoreboard import MADE_ATTEMPTED_KEYS, parse_matchups, parse_scoreboard, team_rows
+from src.matrix_engine import CATEGORY_KEYS
+
+
+DEFAULT_DB_PATH = 'season.db'
+
+STAT_KEYS = CATEGORY_KEYS
+SPLIT_KEYS = MADE_ATTEMPTED_KEYS
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS weeks (
+    league_key TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    status TEXT,
+    PRIMARY KEY (league_key, week)
+);
+CREATE TABLE IF NOT EXISTS team_weeks (
+    team_key TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    name TEXT,
+    opponent_key TEXT,
+    matchup_index INTEGER,
+    {', '.join(f'"{key}" INTEGER' for key in SPLIT_KEYS)},
+    {', '.join(f'"{key}" REAL' for key in STAT_KEYS)},
+    PRIMARY KEY (team_key, week)
+);
+"""
+
+
+def open_store(path=DEFAULT_DB_PATH):
+    """Open (creating if needed) the season store at path."""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def team_pattern(league_key):
+    """GLOB pattern matching the team keys of league_key."""
+    return f'{league_key}.t.*'
+
+
+def extract_team_rows(matchups_container):
+    """Turn a scoreboard matchups container into one row dict per team."""
+    return team_rows(parse_matchups(matchups_container))
+
+
+def parse_week(raw_matchups):
+    """Parse a raw lg.matchups() payload into (status, team rows)."""
+    table = parse_scoreboard(raw_matchups)
+    return table['status'], team_rows(table)
+
+
+ROW_COLUMNS = ['team_key', 'week', 'name', 'opponent_key', 'matchup_index'] + SPLIT_KEYS + STAT_KEYS
+
+
+def insert_rows(conn, league_key, week, rows, replace_week=False):
+    """Write team rows for week of league_key (inside the caller's transaction)."""
+    placeholders = ', '.join('?' for _ in ROW_COLUMNS)
+    column_sql = ', '.join(f'"{column}"' for column in ROW_COLUMNS)
+
+    if replace_week:
+        conn.execute('DELETE FROM team_weeks WHERE week = ? AND team_key GLOB ?',
+                     (week, team_pattern(league_key)))
+    conn.executemany(
+        f'INSERT OR REPLACE INTO team_weeks ({column_sql}) VALUES ({placeholders})',
+        [[week if column == 'week' else row[column] for column in ROW_COLUMNS] for row in rows]
+    )
+
+
+def save_week(conn, league_key, week, raw_matchups):
+    """Replace league_key's stored stat lines for week with a raw lg.matchups() payload."""
+    return save_table(conn, league_key, week, parse_scoreboard(raw_matchups))
+
+
+def save_table(conn, league_key, week, table):
+    """Replace league_key's stored stat lines for week with a parsed team-week table."""
+    status, rows = table['status'], team_rows(table)
+
+    with conn:
+        insert_rows(conn, league_key, week, rows, replace_week=True)
+        set_status(conn, league_key, week, status)
+
+    return rows
+
+
+def set_status(conn, league_key, week, status):
+    """Record week's status for league_key (inside the caller's transaction)."""
+    conn.execute('INSERT OR REPLACE INTO weeks (league_key, week, status) VALUES (?, ?, ?)',
+                 (league_key, week, status))
+
+
+def ingest_rows(conn, rows):
+    """Write a stream of team-week rows (see src.ingest), one week at a time.
+
+    Rows are buffered only until the league or week changes, so memory stays
+    bounded by a single week however long the stream is. Each row's league
+    comes from its team key. Existing rows for the same (team_key, week) are
+    replaced. Returns the number of rows written.
+    """
+    pending = []
+    written = 0
+
+    def week_of(row):
+        return league_key_of(row['team_key']), row['week']
+
+    def flush():
+        league_key, week = week_of(pending[0])
+        with conn:
+            insert_rows(conn, league_key, week, pending)
+            set_status(conn, league_key, week, pending[-1]['status'])
+
+    for row in rows:
+        if pending and week_of(row) != week_of(pending[0]):
+            flush()
+            written += len(pending)
+            pending = []
+        pending.append(row)
+
+    if pending:
+        flush()
+        written += len(pending)
+
+    return written
+
+
+def week_statuses(conn, league_key):
+    """Return {week: status} for every stored week of league_key."""
+    cursor = conn.execute('SELECT week, status FROM weeks WHERE league_key = ?', (league_key,))
+    return {row['week']: row['status'] for row in cursor}
+
+
+def league_week_counts(conn):
+    """Return {league_key: number of stored weeks}."""
+    cursor = conn.execute('SELECT league_key, COUNT(*) AS weeks FROM weeks GROUP BY league_key ORDER BY league_key')
+    return {row['league_key']: row['weeks'] for row in cursor}
+
+
+def weeks_to_sync(conn, league_key, through_week):
+    """Weeks 1..through_week of league_key that are missing from the store or not yet final."""
+    statuses = week_statuses(conn, league_key)
+    return [week for week in range(1, through_week + 1) if statuses.get(week) != 'postevent']
+
+
+def sync(lg, conn, through_week=None, max_workers=DEFAULT_MAX_WORKERS, batched=False):
+    """Fetch only the missing or unfinished weeks up to through_week.
+
+    Weeks are fetched concurrently and written to the store in week order.
+    With batched, all of them come from a handful of multi-week team requests
+    (see src.batch_fetch) instead of one scoreboard request per week.
+    Returns the list of weeks that were fetched.
+    """
+    if through_week is None:
+        through_week = lg.current_week()
+
+    weeks = weeks_to_sync(conn, lg.league_id, through_week)
+    if batched:
+        tables = fetch_league_weeks(lg, weeks, max_workers=max_workers)
+    else:
+        tables = prefetch_weeks(lg, weeks, parse_scoreboard, max_workers)
+    for week, table in tables.items():
+        save_table(conn, lg.league_id, week, table)
+
+    return list(tables)
+
+
+def load_week_rows(conn, league_key, week):
+    """Return league_key's stored row dicts for week (with its status), in scoreboard order."""
+    cursor = conn.execute(
+        'SELECT t.*, w.status FROM team_weeks t '
+        'LEFT JOIN weeks w ON w.league_key = ? AND w.week = t.week '
+        'WHERE t.week = ? AND t.team_key GLOB ? ORDER BY t.matchup_index, t.rowid',
+        (league_key, week, team_pattern(league_key))
+    )
+    return [dict(row) for row in cursor]
+
+
+def has_week(conn, league_key, week):
+    """True if week of league_key has been synced into the store."""
+    return week in week_statuses(conn, league_key)
+
+
+def load_teams_by_name(conn, league_key, week, exact=False):
+    """Stored week as {team_name: {stat_key: float}}, like extract_all_teams.
+
+    With exact, FG%/FT% are rebuilt from the stored makes/attempts instead of
+    Yahoo's rounded values (see src.deltas).
+    """
+    rows = load_week_rows(conn, league_key, week)
+    if exact:
+        apply_exact_row_percentages(rows)
+    return {row['name']: {stat_key: row[stat_key] for stat_key in STAT_KEYS} for row in rows}
+
+
+def load_teams_by_key(conn, league_key, week):
+    """Stored week as {team_key: {'stats': {...}}}, like extract_all_teams_stats."""
+    return {
+        row['team_key']: {'stats': {stat_key: row[stat_key] for stat_key in STAT_KEYS}}
+        for row in load_week_rows(conn, league_key, week)
+    }
+
+
+def load_matchups(conn, league_key, week):
+    """Stored scheduled matchups for week, like predict_matchups.extract_matchups."""
+    rows = load_week_rows(conn, league_key, week)
+    names = {row['team_key']: row['name'] for row in rows}
+
+    matchups = []
+    seen = set()
+    for row in rows:
+        if row['team_key'] in seen:
+            continue
+        seen.update([row['team_key'], row['opponent_key']])
+        matchups.append({
+            'team1_name': row['name'],
+            'team2_name': names.get(row['opponent_key'], 'Unknown Team'),
+            'team1_key': row['team_key'],
+            'team2_key': row['opponent_key']
+        })
+
+    return matchups
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain the local SQLite season store')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    sync_parser = subparsers.add_parser('sync', help='Fetch missing or unfinished weeks')
+    sync_parser.add_argument('--through', type=int, default=None,
+                             help='Last week to sync (default: current week)')
+    sync_parser.add_argument('--db', type=str, default=DEFAULT_DB_PATH,
+                             help=f'SQLite database path (default: {DEFAULT_DB_PATH})')
+    sync_parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                             help=f'Weeks to fetch concurrently (default: {DEFAULT_MAX_WORKERS})')
+    sync_parser.add_argument('--batched', action='store_true',
+                             help='Fetch many weeks per request through team collections (see src.batch_fetch)')
+    add_league_arguments(sync_parser)
+
+    ingest_parser = subparsers.add_parser('ingest', help='Stream recorded scoreboard files into the store')
+    ingest_parser.add_argument('paths', nargs='+', help='Recorded scoreboard JSON files (see --record)')
+    ingest_parser.add_argument('--db', type=str, default=DEFAULT_DB_PATH,
+                               help=f'SQLite database path (default: {DEFAULT_DB_PATH})')
+    args = parser.parse_args()
+
+    conn = open_store(args.db)
+
+    if args.command == 'ingest':
+        written = ingest_rows(conn, iter_recordings(args.paths))
+        print(f"Ingested {written} team-week row(s) from {len(args.paths)} file(s).")
+    else:
+        lg = league_from_args(args)
+        fetched = sync(lg, conn, args.through, args.workers, args.batched)
+
+        if fetched:
+            print(f"Synced week(s): {', '.join(str(week) for week in fetched)}")
+        else:
+            print("Store is already up to date.")
+
+    for league_key, weeks in league_week_counts(conn).items():
+        print(f"{weeks} week(s) of {league_key} stored in {args.db}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""Shared, self-refreshing Yahoo OAuth session.
+
+Every entry point used to build its own OAuth2 object, paying token
+validation (and maybe a refresh) plus fresh TLS handshakes each time, and a
+token that expired mid-run was refreshed without the HTTP session picking up
+the new token. Here one OAuth2 object per credentials file is cached for the
+whole process:
+
+- The token lives in memory and in the credentials file, so the next process
+  starts with it and does not refresh.
+- One keep-alive connection pool (sized for the concurrent week fetches) is
+  shared by every request made through that session.
+- The token is refreshed REFRESH_MARGIN seconds before it expires. Only the
+  first request to notice does the refresh; concurrent requests carry on with
+  the still-valid old token instead of waiting for it.
+
+Requests made through SessionHandler are paced, limited and retried by the
+process-wide scheduler (see src.scheduler).
+
+yahoo_oauth and requests are imported when the first session is opened.
+"""
+import logging
+import os
+import threading
+import time
+
+from yahoo_fantasy_api.yhandler import YAHOO_ENDPOINT, YHandler
+
+from src.profiling import span
+from src.scheduler import Throttled, TransientError, shared_scheduler
+
+# Yahoo access tokens last an hour; yahoo_oauth treats them as expired a
+# minute early
+TOKEN_LIFETIME = 3600
+EXPIRY_MARGIN = 60
+REFRESH_MARGIN = 600
+
+# Keep-alive connections to Yahoo kept per session
+POOL_SIZE = 16
+
+# Yahoo answers rate-limited requests with 999 ("Request denied"), sometimes 429
+THROTTLE_STATUSES = (429, 999)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def shared_oauth(from_file='oauth2.json'):
+    """The process-wide OAuth2 session for from_file, created on first use."""
+    path = os.path.abspath(from_file)
+    with _sessions_lock:
+        if path not in _sessions:
+            _sessions[path] = open_oauth(from_file)
+        return _sessions[path]
+
+
+def open_oauth(from_file):
+    """Build an OAuth2 session with a pooled transport and a refresh lock.
+
+    OAuth2 itself refreshes (and saves) a stored token that has expired, and
+    only opens a browser when the file has no token at all.
+    """
+    from requests.adapters import HTTPAdapter
+    from yahoo_oauth import OAuth2
+
+    with span('oauth'):
+        sc = OAuth2(None, None, from_file=from_file)
+    sc.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE))
+    sc.refresh_lock = threading.Lock()
+    ensure_fresh(sc)
+    return sc
+
+
+def token_age(sc):
+    """Seconds since sc's access token was issued."""
+    return time.time() - float(sc.token_time)
+
+
+def refresh(sc):
+    """Refresh sc's token, point its live session at it and save it to disk."""
+    from yahoo_oauth.utils import get_data, write_data
+
+    logging.info("Refreshing Yahoo OAuth token.")
+    with span('oauth', refresh=True):
+        credentials = sc.refresh_access_token()
+    sc.session.access_token = sc.access_token
+
+    from_file = getattr(sc, 'from_file', None)
+    if from_file:
+        data = get_data(from_file)
+        data.update(credentials)
+        write_data(data, from_file)
+
+
+def ensure_fresh(sc, margin=REFRESH_MARGIN):
+    """Refresh sc's token if it is within margin seconds of expiring.
+
+    Cheap to call before every request. If another thread is already
+    refreshing, return at once while the old token is still valid; wait only
+    if it has actually expired.
+    """
+    if token_age(sc) < TOKEN_LIFETIME - margin:
+        return
+
+    expired = token_age(sc) >= TOKEN_LIFETIME - EXPIRY_MARGIN
+    if not sc.refresh_lock.acquire(blocking=expired):
+        return
+    try:
+        # Another thread may have refreshed while we waited for the lock
+        if token_age(sc) >= TOKEN_LIFETIME - margin:
+            refresh(sc)
+    finally:
+        sc.refresh_lock.release()
+
+
+def check_response(response):
+    """Raise for a non-200 Yahoo response: Throttled, TransientError (5xx) or RuntimeError."""
+    if response.status_code == 200:
+        return response
+    if response.status_code in THROTTLE_STATUSES:
+        retry_after = response.headers.get('Retry-After')
+        raise Throttled(f"Yahoo throttled the request (HTTP {response.status_code})",
+                        float(retry_after) if retry_after and retry_after.isdigit() else None)
+    if response.status_code >= 500:
+        raise TransientError(f"Yahoo server error (HTTP {response.status_code})")
+    raise RuntimeError(response.content)
+
+
+class SessionHandler(YHandler):
+    """YHandler that keeps the shared session's token fresh before each call.
+
+    GETs go through the scheduler, so throttling and server errors are
+    retried with backoff instead of surfacing as a bare RuntimeError. League
+    settings are memoized for the handler's lifetime: League() reads them
+    twice while it is constructed, and they do not change mid-run.
+
+    With a cache (see src.response_cache) GETs are served from disk when
+    possible. With connect instead of sc, the OAuth session is only opened
+    by the first request that actually goes to Yahoo.
+    """
+
+    def __init__(self, sc, scheduler=None, cache=None, connect=None):
+        super().__init__(sc)
+        self.scheduler = scheduler or shared_scheduler()
+        self.cache = cache
+        self.connect = connect
+        self.settings_cache = {}
+
+    def get(self, uri):
+        if uri.endswith('/settings'):
+            if uri not in self.settings_cache:
+                self.settings_cache[uri] = self._cached(uri)
+            return self.settings_cache[uri]
+        return self._cached(uri)
+
+    def _cached(self, uri):
+        if self.cache is None:
+            return self._fetch(uri)
+        jresp = self.cache.get(uri)
+        if jresp is None:
+            jresp = self._fetch(uri)
+            self.cache.put(uri, jresp)
+        return jresp
+
+    def _fetch(self, uri):
+        return self.scheduler.call(self._request, uri)
+
+    def oauth(self):
+        """The OAuth session, opened through connect on first use."""
+        if self.sc is None and self.connect is not None:
+            self.sc = self.connect()
+        return self.sc
+
+    def _request(self, uri):
+        ensure_fresh(self.oauth())
+        with span('http', uri=uri):
+            response = self.sc.session.get(f"{YAHOO_ENDPOINT}/{uri}", params={'format': 'json'})
+        check_response(response)
+        with span('json', uri=uri):
+            return response.json()
+
+    # Writes are paced like reads but never repeated
+
+    def put(self, uri, data):
+        return self.scheduler.call(self._write, super().put, uri, data, retries=0)
+
+    def post(self, uri, data):
+        return self.scheduler.call(self._write, super().post, uri, data, retries=0)
+
+    def _write(self, method, uri, data):
+        ensure_fresh(self.oauth())
+        return method(uri, data)
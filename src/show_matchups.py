@@ -3,70 +3,11 @@
 Usage:
     python -m src.show_matchups
 """
-from yahoo_oauth import OAuth2
-import yahoo_fantasy_api as yfa
+import argparse
 
-
-def parse_team_stats(team_data):
-    """Extract stats from team data structure."""
-    stats = {}
-
-    # team_data is a list with two elements:
-    # [0] = list of dicts with metadata (team_key, name, etc.)
-    # [1] = dict with team_stats, team_points, etc.
-
-    if not isinstance(team_data, list) or len(team_data) < 2:
-        return stats
-
-    # Get the second element which contains team_stats
-    stats_container = team_data[1]
-
-    if not isinstance(stats_container, dict) or 'team_stats' not in stats_container:
-        return stats
-
-    team_stats = stats_container['team_stats']
-
-    if 'stats' not in team_stats:
-        return stats
-
-    # Parse each stat
-    stat_map = {
-        '9004003': 'fgm_fga',
-        '5': 'fg_pct',
-        '9007006': 'ftm_fta',
-        '8': 'ft_pct',
-        '10': '3ptm',
-        '12': 'pts',
-        '15': 'reb',
-        '16': 'ast',
-        '17': 'st',
-        '18': 'blk',
-        '19': 'to'
-    }
-
-    for stat_item in team_stats['stats']:
-        stat = stat_item['stat']
-        stat_id = stat['stat_id']
-        if stat_id in stat_map:
-            stats[stat_map[stat_id]] = stat['value']
-
-    return stats
-
-
-def get_team_name(team_data):
-    """Extract team name from team data."""
-    if not isinstance(team_data, list) or len(team_data) < 1:
-        return "Unknown Team"
-
-    metadata = team_data[0]
-    if not isinstance(metadata, list):
-        return "Unknown Team"
-
-    for item in metadata:
-        if isinstance(item, dict) and 'name' in item:
-            return item['name']
-
-    return "Unknown Team"
+from src.auth import add_league_arguments, league_from_args
+from src.profiling import timed
+from src.scoreboard import parse_scoreboard, row_stats
 
 
 def compare_stats(team1_stats, team2_stats):
@@ -119,20 +60,18 @@ def compare_stats(team1_stats, team2_stats):
     return team1_wins, team2_wins, results
 
 
-def display_matchup(matchup_num, matchup_dict):
-    """Display a single matchup with scores."""
-    # Navigate to teams
-    teams = matchup_dict['matchup']['0']['teams']
-
-    # Extract team data
-    team1_data = teams['0']['team']
-    team2_data = teams['1']['team']
+@timed('render')
+def display_matchup(matchup_num, table, i):
+    """Display a single matchup with scores.
 
-    team1_name = get_team_name(team1_data)
-    team2_name = get_team_name(team2_data)
+    table is a parsed scoreboard (see src.scoreboard); rows i and i + 1 are
+    the two teams in the matchup.
+    """
+    team1_name = table['names'][i]
+    team2_name = table['names'][i + 1]
 
-    team1_stats = parse_team_stats(team1_data)
-    team2_stats = parse_team_stats(team2_data)
+    team1_stats = row_stats(table, i)
+    team2_stats = row_stats(table, i + 1)
 
     # Compare stats
     team1_wins, team2_wins, results = compare_stats(team1_stats, team2_stats)
@@ -160,32 +99,26 @@ def display_matchup(matchup_num, matchup_dict):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Display current week's matchups with mid-week scores")
+    add_league_arguments(parser)
+    args = parser.parse_args()
+
     # Authenticate
-    sc = OAuth2(None, None, from_file='oauth2.json')
-    gm = yfa.Game(sc, 'nba')
-    league_id = '466.l.51741'
-    lg = gm.to_league(league_id)
+    lg = league_from_args(args)
 
     # Get current week
     current_week = lg.current_week()
 
     # Get matchups for current week
-    raw_matchups = lg.matchups(week=current_week)
-
-    # Navigate to the actual matchups data
-    league_data = raw_matchups['fantasy_content']['league']
-    scoreboard = league_data[1]['scoreboard']
-    matchups_container = scoreboard['0']['matchups']
+    table = parse_scoreboard(lg.matchups(week=current_week))
 
     print(f"\n{'=' * 100}")
     print(f"WEEK {current_week} - MID-WEEK MATCHUP SCORES")
     print(f"{'=' * 100}\n")
 
-    # Display each matchup (0, 1, 2, 3, 4 for 5 matchups)
-    matchup_count = int(matchups_container['count'])
-    for i in range(matchup_count):
-        matchup_data = matchups_container[str(i)]
-        display_matchup(i + 1, matchup_data)
+    # Display each matchup (rows 0-1, 2-3, ... for 5 matchups)
+    for matchup_num, i in enumerate(range(0, len(table['team_keys']), 2), 1):
+        display_matchup(matchup_num, table, i)
 
     print("=" * 100)
     print("Legend:")
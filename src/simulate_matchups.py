@@ -0,0 +1,302 @@
+"""Monte Carlo matchup win probabilities.
+
+Each team's weekly line is modeled as a multivariate normal over makes,
+attempts and counting stats, fitted to its past weeks (mean and covariance),
+so correlated categories (e.g. points and 3PM) move together. Every matchup
+draws many simulated weeks for both teams in NumPy batches and counts how
+often each side wins each category and the matchup overall. FG%/FT% are
+recomputed from the simulated makes/attempts.
+
+Simulated weeks are split into batches that run across a process pool; each
+batch samples every team once and scores every pair from those draws. Each
+batch gets its own child of one np.random.SeedSequence, so a given --seed
+gives the same numbers no matter how many workers run.
+
+Usage:
+    python -m src.simulate_matchups --week 5
+    python -m src.simulate_matchups --week 5 --window 3 --draws 200000 --seed 42
+    python -m src.simulate_matchups --week 5 --grid
+    python -m src.simulate_matchups --week 5 --db season.db
+"""
+import argparse
+import os
+
+import numpy as np
+
+from src.auth import LEAGUE_ID, add_league_arguments, league_from_args
+from src.deltas import COUNT_KEYS, category_lines
+from src.matrix_engine import CATEGORY_KEYS, CATEGORY_SIGNS
+from src.prefetch import DEFAULT_MAX_WORKERS
+from src.predict_matchups import fetch_week_stats, prediction_weeks, prefetch_week_stats
+from src.profiling import timed
+from src.rolling import row_counts
+from src.scoreboard import parse_scoreboard, scheduled_matchups
+from src.season_store import open_store, week_statuses, load_week_rows, load_matchups
+
+DEFAULT_DRAWS = 100_000
+DEFAULT_BATCH_SIZE = 25_000
+
+_MADE_ATTEMPTED = [(COUNT_KEYS.index('fgm'), COUNT_KEYS.index('fga')),
+                   (COUNT_KEYS.index('ftm'), COUNT_KEYS.index('fta'))]
+
+
+def team_histories(week_rows):
+    """{team_key: weeks×K counts} and {team_key: name} from {week: rows}."""
+    histories = {}
+    names = {}
+    for week in sorted(week_rows):
+        for row in week_rows[week] or []:
+            histories.setdefault(row['team_key'], []).append(row_counts(row))
+            names[row['team_key']] = row['name']
+
+    return {team_key: np.array(lines) for team_key, lines in histories.items()}, names
+
+
+def fit_team(history):
+    """(mean, factor) of a team's weekly counts, with factor @ factor.T == covariance.
+
+    With a single week the covariance is zero and every draw equals that week.
+    """
+    mean = history.mean(axis=0)
+    if len(history) < 2:
+        return mean, np.zeros((len(mean), len(mean)))
+
+    # eigh instead of Cholesky: covariances fitted from a few weeks are
+    # usually singular
+    eigenvalues, eigenvectors = np.linalg.eigh(np.cov(history, rowvar=False))
+    return mean, eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+
+def fit_weeks(lg, weeks, week_store, max_workers=DEFAULT_MAX_WORKERS):
+    """Fit every team on weeks; returns ({team_key: fit}, {team_key: name}).
+
+    Weeks already in week_store (e.g. from the season store) are not fetched;
+    the rest are fetched once, in parallel.
+    """
+    prefetch_week_stats(lg, weeks, week_store, max_workers)
+    histories, names = team_histories({w: fetch_week_stats(lg, w, week_store) for w in weeks})
+    return {team_key: fit_team(history) for team_key, history in histories.items()}, names
+
+
+def sample_lines(rng, fit, draws):
+    """draws×C simulated category lines for one team."""
+    mean, factor = fit
+    counts = mean + rng.standard_normal((draws, len(mean))) @ factor.T
+    np.clip(counts, 0.0, None, out=counts)
+    for made, attempted in _MADE_ATTEMPTED:
+        np.minimum(counts[:, made], counts[:, attempted], out=counts[:, made])
+    return category_lines(counts)
+
+
+def simulate_batch(task):
+    """Simulate one batch of weeks for every pair; returns raw win/tie counts.
+
+    Each team is sampled once per batch and reused by every pair it is in.
+    task is (fits, pairs, draws, seed_sequence), with pairs as (i, j) indexes
+    into fits, so it can be shipped to a worker process.
+    """
+    fits, pairs, draws, seed = task
+    rng = np.random.default_rng(seed)
+    lines = {i: sample_lines(rng, fits[i], draws) for i in sorted({i for pair in pairs for i in pair})}
+
+    counts = {
+        'category_wins': np.zeros((len(pairs), len(CATEGORY_KEYS)), dtype=np.int64),
+        'category_losses': np.zeros((len(pairs), len(CATEGORY_KEYS)), dtype=np.int64),
+        'wins': np.zeros(len(pairs), dtype=np.int64),
+        'losses': np.zeros(len(pairs), dtype=np.int64),
+        'ties': np.zeros(len(pairs), dtype=np.int64),
+    }
+    for p, (i, j) in enumerate(pairs):
+        margin = (lines[i] - lines[j]) * CATEGORY_SIGNS
+        won = margin > 0
+        lost = margin < 0
+
+        counts['category_wins'][p] = won.sum(axis=0)
+        counts['category_losses'][p] = lost.sum(axis=0)
+
+        score = won.sum(axis=1) - lost.sum(axis=1)
+        counts['wins'][p] = (score > 0).sum()
+        counts['losses'][p] = (score < 0).sum()
+        counts['ties'][p] = (score == 0).sum()
+
+    return counts
+
+
+def batch_sizes(total, batch_size):
+    """Split total draws into batch_size chunks (the last may be smaller)."""
+    return [min(batch_size, total - start) for start in range(0, total, batch_size)]
+
+
+def run_batches(simulate, tasks, max_workers=None):
+    """Run simulate over tasks and add up the count dicts as each batch arrives.
+
+    max_workers=1 runs in this process; otherwise tasks go to a process pool.
+    Only the running totals are kept, so memory does not grow with the number
+    of batches.
+    """
+    if max_workers == 1 or len(tasks) <= 1:
+        return _sum_counts(map(simulate, tasks))
+
+    # multiprocessing is only worth importing when a pool is actually used
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return _sum_counts(executor.map(simulate, tasks))
+
+
+def _sum_counts(batches):
+    totals = None
+    for counts in batches:
+        totals = counts if totals is None else {key: totals[key] + counts[key] for key in totals}
+    return totals
+
+
+@timed('compute')
+def simulate_pairs(fits, pairs, draws=DEFAULT_DRAWS, seed=None, max_workers=None,
+                   batch_size=DEFAULT_BATCH_SIZE):
+    """Simulate every (team1_key, team2_key) pair; returns one probability dict per pair.
+
+    Draws are split into batches of batch_size, each with its own child seed,
+    so results depend only on seed, draws and batch_size. max_workers=1 runs
+    in this process; otherwise batches go to a process pool.
+    """
+    team_keys = sorted({team_key for pair in pairs for team_key in pair})
+    index = {team_key: i for i, team_key in enumerate(team_keys)}
+    team_fits = [fits[team_key] for team_key in team_keys]
+    index_pairs = [(index[team1_key], index[team2_key]) for team1_key, team2_key in pairs]
+
+    sizes = batch_sizes(draws, batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(team_fits, index_pairs, size, batch_seed) for size, batch_seed in zip(sizes, seeds)]
+    totals = run_batches(simulate_batch, tasks, max_workers)
+
+    return [
+        {
+            'team1_win': int(totals['wins'][p]) / draws,
+            'tie': int(totals['ties'][p]) / draws,
+            'team2_win': int(totals['losses'][p]) / draws,
+            'category_win': dict(zip(CATEGORY_KEYS, (totals['category_wins'][p] / draws).tolist())),
+            'category_loss': dict(zip(CATEGORY_KEYS, (totals['category_losses'][p] / draws).tolist())),
+        }
+        for p in range(len(pairs))
+    ]
+
+
+@timed('compute')
+def simulate_grid(fits, team_keys, draws=DEFAULT_DRAWS, seed=None, max_workers=None):
+    """N×N matrix of P(row team beats column team); ties split evenly."""
+    pairs = [(team_keys[i], team_keys[j])
+             for i in range(len(team_keys)) for j in range(i + 1, len(team_keys))]
+    results = simulate_pairs(fits, pairs, draws, seed, max_workers)
+
+    index = {team_key: i for i, team_key in enumerate(team_keys)}
+    grid = np.full((len(team_keys), len(team_keys)), np.nan)
+    for (team1_key, team2_key), result in zip(pairs, results):
+        i, j = index[team1_key], index[team2_key]
+        grid[i, j] = result['team1_win'] + result['tie'] / 2
+        grid[j, i] = result['team2_win'] + result['tie'] / 2
+
+    return grid
+
+
+@timed('render')
+def display_simulations(matchups, results, week, draws):
+    """Display win probabilities for each scheduled matchup."""
+    BOLD = '\033[1m'
+    RESET = '\033[0m'
+
+    print(f"\n{BOLD}{'═' * 100}{RESET}")
+    print(f"{BOLD}WEEK {week} WIN PROBABILITIES ({draws:,} simulated weeks per matchup){RESET}")
+    print(f"{BOLD}{'═' * 100}{RESET}\n")
+
+    for i, (matchup, result) in enumerate(zip(matchups, results), 1):
+        team1 = matchup['team1_name'][:35]
+        team2 = matchup['team2_name'][:35]
+
+        print(f"{BOLD}MATCHUP {i}: {team1} vs {team2}{RESET}")
+        print(f"{BOLD}{'─' * 100}{RESET}")
+
+        if result is None:
+            print("No history available for this matchup.\n")
+            continue
+
+        print(f"{team1}: {result['team1_win']:.1%}   Tie: {result['tie']:.1%}   "
+              f"{team2}: {result['team2_win']:.1%}\n")
+        print(f"  {'Cat':>6}  {team1[:20]:>20}  {team2[:20]:>20}")
+        for stat_key in CATEGORY_KEYS:
+            print(f"  {stat_key:>6}  {result['category_win'][stat_key]:>20.1%}  "
+                  f"{result['category_loss'][stat_key]:>20.1%}")
+        print()
+
+
+@timed('render')
+def display_grid(grid, names):
+    """Display the N×N P(row beats column) grid."""
+    short = [name[:10] for name in names]
+    print(f"\n{'P(row beats col)':<20}" + "".join(f"{name:>11}" for name in short))
+    for i, name in enumerate(names):
+        cells = "".join(f"{'-':>11}" if i == j else f"{grid[i, j]:>11.1%}" for j in range(len(names)))
+        print(f"{name[:20]:<20}{cells}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate matchup win probabilities from team history')
+    parser.add_argument('--week', type=int, default=None,
+                       help='Week to simulate (default: current week)')
+    parser.add_argument('--window', type=int, default=None, metavar='K',
+                       help='Fit on the last K weeks (default: every earlier week)')
+    parser.add_argument('--draws', type=int, default=DEFAULT_DRAWS,
+                       help=f'Simulated weeks per matchup (default: {DEFAULT_DRAWS:,})')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Seed for reproducible results')
+    parser.add_argument('--grid', action='store_true',
+                       help='Simulate every pair of teams, not just scheduled matchups')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help='Worker processes, and weeks fetched concurrently (default: one per CPU)')
+    parser.add_argument('--db', type=str, default=None,
+                       help='Read weeks from the local season store (see src.season_store) when stored')
+    add_league_arguments(parser)
+    args = parser.parse_args()
+
+    if args.draws < 1:
+        parser.error('--draws must be at least 1')
+
+    conn = open_store(args.db) if args.db else None
+    stored_weeks = set(week_statuses(conn, LEAGUE_ID)) if conn is not None else set()
+
+    lg = None
+    if args.week is None or not set(range(1, args.week + 1)) <= stored_weeks:
+        lg = league_from_args(args)
+    week = lg.current_week() if args.week is None else args.week
+
+    # Fit on history, fetching any week not in the store once, in parallel
+    weeks = prediction_weeks(week, 'total', args.window)
+    if not weeks:
+        print(f"No history before Week {week} to simulate from.")
+        return
+
+    week_store = {w: load_week_rows(conn, LEAGUE_ID, w) for w in stored_weeks if w in weeks}
+    fits, names = fit_weeks(lg, weeks, week_store, args.workers)
+
+    if args.grid:
+        team_keys = sorted(fits)
+        grid = simulate_grid(fits, team_keys, args.draws, args.seed, args.workers)
+        print(f"\nWeek {week}: all-pairs win probabilities from Weeks {weeks[0]}-{weeks[-1]}")
+        display_grid(grid, [names[team_key] for team_key in team_keys])
+        return
+
+    if week in stored_weeks:
+        matchups = load_matchups(conn, LEAGUE_ID, week)
+    else:
+        matchups = scheduled_matchups(parse_scoreboard(lg.matchups(week=week)))
+
+    simulated = [m for m in matchups if m['team1_key'] in fits and m['team2_key'] in fits]
+    results = iter(simulate_pairs(fits, [(m['team1_key'], m['team2_key']) for m in simulated],
+                                  args.draws, args.seed, args.workers))
+    display_simulations(matchups, [next(results) if m in simulated else None for m in matchups],
+                        week, args.draws)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""Seeded synthetic leagues in Yahoo's scoreboard shape.
+
+Each team gets a fixed strength and a tilt per category, and every week's
+line is drawn around them: attempts from normal distributions, makes as
+binomials on the team's shooting percentages, counting stats from normal or
+Poisson draws, and points built from the makes so the line is consistent.
+Teams are paired by a round-robin schedule. Every week is emitted as a raw
+lg.matchups() payload, so anything that parses real scoreboards can run on
+any number of teams.
+
+Usage:
+    from src.synthetic import generate_league
+    scoreboards = generate_league(num_teams=1000, num_weeks=20, seed=7)  # {week: payload}
+
+    python -m src.synthetic --teams 12 --weeks 20 --seed 7 --out recordings/synthetic
+    python -m src.season_store ingest recordings/synthetic/*.json --db synthetic.db
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+LEAGUE_KEY = '466.l.0'
+
+# Yahoo stat_id for each stat key (see src.scoreboard.STAT_MAP)
+STAT_IDS = {
+    'fgm_fga': '9004003', 'fg_pct': '5', 'ftm_fta': '9007006', 'ft_pct': '8', '3ptm': '10',
+    'pts': '12', 'reb': '15', 'ast': '16', 'st': '17', 'blk': '18', 'to': '19',
+}
+
+# Typical 9-cat weekly team line: (mean, spread) for normal draws, the mean
+# for Poisson ones
+WEEKLY_MEANS = {
+    'fga': (370, 35), 'fg_pct': (0.472, 0.02), 'fta': (105, 18), 'ft_pct': (0.775, 0.04),
+    '3ptm': 55, 'reb': (220, 25), 'ast': (120, 16), 'st': 38, 'blk': 22, 'to': 65,
+}
+
+
+def round_robin(num_teams, week):
+    """[(i, j)] pairings for week from the circle method."""
+    others = list(range(1, num_teams))
+    shift = (week - 1) % (num_teams - 1)
+    rotated = [0] + others[shift:] + others[:shift]
+    return [(rotated[k], rotated[num_teams - 1 - k]) for k in range(num_teams // 2)]
+
+
+def team_profiles(rng, num_teams):
+    """Per-team volume multiplier and shooting offsets."""
+    return {
+        'volume': rng.normal(1.0, 0.07, num_teams),
+        'fg_pct': rng.normal(0.0, 0.015, num_teams),
+        'ft_pct': rng.normal(0.0, 0.03, num_teams),
+        'tilt': rng.normal(1.0, 0.1, (num_teams, 6)),
+    }
+
+
+def week_lines(rng, profiles):
+    """{stat: array} of one week's lines for every team."""
+    volume = profiles['volume']
+    tilt = profiles['tilt']
+    n = len(volume)
+
+    def normal(stat, scale):
+        mean, spread = WEEKLY_MEANS[stat]
+        return np.maximum(rng.normal(mean * scale, spread), 0).round().astype(int)
+
+    def shooting(stat, low, high):
+        mean, spread = WEEKLY_MEANS[stat]
+        return np.clip(mean + profiles[stat] + rng.normal(0, spread, n), low, high)
+
+    fga = normal('fga', volume)
+    fta = normal('fta', volume)
+    fg_pct = shooting('fg_pct', 0.3, 0.65)
+    ft_pct = shooting('ft_pct', 0.5, 0.95)
+    fgm = rng.binomial(fga, fg_pct)
+    ftm = rng.binomial(fta, ft_pct)
+    threes = np.minimum(rng.poisson(WEEKLY_MEANS['3ptm'] * volume * tilt[:, 0]), fgm)
+
+    return {
+        'fgm': fgm, 'fga': fga, 'ftm': ftm, 'fta': fta, '3ptm': threes,
+        'pts': 2 * fgm + threes + ftm,
+        'reb': normal('reb', volume * tilt[:, 1]),
+        'ast': normal('ast', volume * tilt[:, 2]),
+        'st': rng.poisson(WEEKLY_MEANS['st'] * volume * tilt[:, 3]),
+        'blk': rng.poisson(WEEKLY_MEANS['blk'] * volume * tilt[:, 4]),
+        'to': rng.poisson(WEEKLY_MEANS['to'] * volume * tilt[:, 5]),
+    }
+
+
+def format_pct(made, attempted):
+    """Yahoo's three-decimal percentage string, e.g. '.474' ('-' with no attempts)."""
+    if not attempted:
+        return '-'
+    return f"{made / attempted:.3f}".lstrip('0')
+
+
+def team_entry(i, lines, week, league_key=LEAGUE_KEY):
+    """One scoreboard team entry for team index i."""
+    values = {
+        'fgm_fga': f"{lines['fgm'][i]}/{lines['fga'][i]}",
+        'fg_pct': format_pct(lines['fgm'][i], lines['fga'][i]),
+        'ftm_fta': f"{lines['ftm'][i]}/{lines['fta'][i]}",
+        'ft_pct': format_pct(lines['ftm'][i], lines['fta'][i]),
+    }
+    for stat_key in ('3ptm', 'pts', 'reb', 'ast', 'st', 'blk', 'to'):
+        values[stat_key] = str(lines[stat_key][i])
+
+    metadata = [
+        {'team_key': f'{league_key}.t.{i + 1}'},
+        {'team_id': str(i + 1)},
+        {'name': f'Team {i + 1}'},
+    ]
+    stats = [{'stat': {'stat_id': STAT_IDS[stat_key], 'value': value}} for stat_key, value in values.items()]
+    return {'team': [metadata, {'team_stats': {'coverage_type': 'week', 'week': str(week), 'stats': stats}}]}
+
+
+def scoreboard_payload(week, pairs, lines, status='postevent', league_key=LEAGUE_KEY):
+    """Raw lg.matchups() payload for one week."""
+    matchups = {'count': len(pairs)}
+    for k, (i, j) in enumerate(pairs):
+        matchups[str(k)] = {
+            'matchup': {
+                'week': str(week),
+                'status': status,
+                '0': {'teams': {'0': team_entry(i, lines, week, league_key),
+                                '1': team_entry(j, lines, week, league_key),
+                                'count': 2}},
+            }
+        }
+
+    return {
+        'fantasy_content': {
+            'league': [
+                {'league_key': league_key, 'current_week': week},
+                {'scoreboard': {'week': str(week), '0': {'matchups': matchups}}},
+            ]
+        }
+    }
+
+
+def generate_league(num_teams=10, num_weeks=20, seed=None, live_week=None, league_key=LEAGUE_KEY):
+    """{week: raw scoreboard payload} for a seeded synthetic league.
+
+    num_teams must be even. Every week is final (postevent) unless live_week
+    is given; then the league stops at live_week, which is midevent.
+    """
+    if num_teams < 2 or num_teams % 2:
+        raise ValueError(f"num_teams must be a positive even number, got {num_teams}")
+
+    rng = np.random.default_rng(seed)
+    profiles = team_profiles(rng, num_teams)
+
+    scoreboards = {}
+    for week in range(1, (live_week or num_weeks) + 1):
+        status = 'midevent' if week == live_week else 'postevent'
+        pairs = round_robin(num_teams, week)
+        scoreboards[week] = scoreboard_payload(week, pairs, week_lines(rng, profiles), status, league_key)
+    return scoreboards
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic league as recorded scoreboard files')
+    parser.add_argument('--teams', type=int, default=10, help='Number of teams (even, default: 10)')
+    parser.add_argument('--weeks', type=int, default=20, help='Number of weeks (default: 20)')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for reproducible leagues')
+    parser.add_argument('--out', type=str, required=True, help='Directory to write scoreboards to')
+    args = parser.parse_args()
+
+    # Named like --record output, so season_store ingest picks them up
+    from src.recording import response_path
+
+    os.makedirs(args.out, exist_ok=True)
+    for week, payload in generate_league(args.teams, args.weeks, args.seed).items():
+        uri = f"league/{LEAGUE_KEY}/scoreboard;week={week}"
+        with open(response_path(args.out, uri), 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+    print(f"Wrote {args.weeks} week(s) of a {args.teams}-team league to {args.out}.")
+
+
+if __name__ == '__main__':
+    main()
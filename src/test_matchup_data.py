@@ -3,16 +3,19 @@
 Usage:
     python -m src.test_matchup_data
 """
-from yahoo_oauth import OAuth2
-import yahoo_fantasy_api as yfa
+import argparse
 import json
 
+from src.auth import add_league_arguments, league_from_args
+
 
 def main():
-    sc = OAuth2(None, None, from_file='oauth2.json')
-    gm = yfa.Game(sc, 'nba')
-    league_id = '466.l.51741'
-    lg = gm.to_league(league_id)
+    parser = argparse.ArgumentParser(description='Show what data structure matchups() returns')
+    add_league_arguments(parser)
+    args = parser.parse_args()
+
+    # Authenticate
+    lg = league_from_args(args)
 
     print("=" * 80)
     print("TESTING MATCHUP DATA STRUCTURE")
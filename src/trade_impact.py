@@ -0,0 +1,277 @@
+"""Trade impact simulator.
+
+Each team's line is its average week so far (makes, attempts and counting
+stats from src.rolling); each player's contribution is their season totals
+spread over the same number of weeks. A proposed trade moves players'
+contributions between two teams, rebuilds FG%/FT% from the new makes and
+attempts, and reports how the two teams' category lines, category ranks and
+all-play records change.
+
+Only what the trade touches is recomputed: the two teams' rows and columns of
+the possibility matrix, their entries in each sorted category column, and
+the all-play records of other teams are patched by their results against
+those two teams. Evaluating a candidate costs O(N·C), so hundreds can be
+scored from one baseline (--trades FILE).
+
+Usage:
+    python -m src.trade_impact --trade 466.l.51741.t.1 6583,5007 466.l.51741.t.4 5352
+    python -m src.trade_impact --trades candidates.csv --db season.db
+
+A trades file has one trade per line: team1_key,players1,team2_key,players2,
+with player IDs separated by spaces; players1 go from team1 to team2.
+"""
+import argparse
+import csv
+
+import numpy as np
+
+from src.auth import LEAGUE_ID, add_league_arguments, league_from_args
+from src.deltas import COUNT_KEYS, category_lines
+from src.matrix_engine import (
+    CATEGORY_KEYS, all_play_records, category_ranks, compare_rows, matchup_outcomes,
+    possibility_matrices, replace_in_reference, sorted_reference,
+)
+from src.predict_matchups import fold_weeks, prediction_weeks, prefetch_week_stats
+from src.profiling import timed
+from src.rolling import RollingAggregator
+from src.scoreboard import split_made_attempted, to_float
+from src.season_store import open_store, week_statuses, load_week_rows
+
+# Yahoo display names for the player stats behind COUNT_KEYS
+PLAYER_STAT_NAMES = {
+    '3ptm': '3PTM', 'pts': 'PTS', 'reb': 'REB', 'ast': 'AST', 'st': 'ST', 'blk': 'BLK', 'to': 'TO',
+}
+
+
+def player_counts(stats):
+    """Counting vector (COUNT_KEYS order) from one lg.player_stats entry."""
+    counts = dict.fromkeys(COUNT_KEYS, 0.0)
+    for made, attempted, combined in [('fgm', 'fga', 'FGM/A'), ('ftm', 'fta', 'FTM/A')]:
+        made_count, attempted_count = split_made_attempted(stats.get(combined))
+        if made_count is not None:
+            counts[made], counts[attempted] = made_count, attempted_count
+    for count_key, stat_name in PLAYER_STAT_NAMES.items():
+        # player_stats already converts numeric values; '-' and the like stay strings
+        value = stats.get(stat_name)
+        counts[count_key] = float(value) if isinstance(value, (int, float)) else to_float(value)
+    return np.array([counts[count_key] for count_key in COUNT_KEYS], dtype=float)
+
+
+def fetch_player_counts(lg, player_ids):
+    """{player_id: season counts} for player_ids, fetched in one batched call."""
+    return {int(stats['player_id']): player_counts(stats)
+            for stats in lg.player_stats(sorted(set(player_ids)), 'season')}
+
+
+@timed('compute')
+def trade_baseline(team_keys, counts):
+    """Everything a trade is scored against, computed once for all candidates.
+
+    counts is the N×K per-week counts array in team_keys order.
+    """
+    values = category_lines(counts)
+    wins, losses, ties = possibility_matrices(values)
+    matrix = {'wins': wins, 'losses': losses, 'ties': ties}
+    outcomes = matchup_outcomes(matrix)
+    reference = sorted_reference(values)
+
+    return {
+        'team_keys': list(team_keys),
+        'index': {team_key: i for i, team_key in enumerate(team_keys)},
+        'counts': counts,
+        'values': values,
+        'matrix': matrix,
+        'outcomes': outcomes,
+        'records': all_play_records(outcomes),
+        'reference': reference,
+        'ranks': category_ranks(values, reference),
+    }
+
+
+@timed('compute')
+def evaluate_trade(base, team1_key, players1, team2_key, players2, per_week):
+    """Score one trade against base without modifying it.
+
+    players1 go from team1 to team2 and players2 the other way; per_week maps
+    player_id to per-week counts. Returns the two teams' new lines, ranks and
+    matrix rows, plus every team's all-play record after the trade.
+    """
+    rows = [base['index'][team1_key], base['index'][team2_key]]
+    sent1 = sum((per_week[p] for p in players1), np.zeros(len(COUNT_KEYS)))
+    sent2 = sum((per_week[p] for p in players2), np.zeros(len(COUNT_KEYS)))
+
+    new_counts = base['counts'][rows] + np.stack([sent2 - sent1, sent1 - sent2])
+    new_lines = category_lines(np.clip(new_counts, 0.0, None))
+
+    values = base['values'].copy()
+    values[rows] = new_lines
+    wins, losses, ties = compare_rows(values, rows)
+    new_outcomes = np.sign(wins.astype(np.int16) - losses).astype(np.int8)
+
+    # Other teams: patch records by their changed results against the two teams
+    old_columns = -base['outcomes'][rows]
+    new_columns = -new_outcomes
+    records = base['records'].copy()
+    records[:, 0] += ((new_columns > 0).sum(axis=0) - (old_columns > 0).sum(axis=0))
+    records[:, 1] += ((new_columns < 0).sum(axis=0) - (old_columns < 0).sum(axis=0))
+    records[:, 2] += ((new_columns == 0).sum(axis=0) - (old_columns == 0).sum(axis=0))
+
+    # The two teams themselves: straight from their new rows
+    records[rows, 0] = (new_outcomes > 0).sum(axis=1)
+    records[rows, 1] = (new_outcomes < 0).sum(axis=1)
+    records[rows, 2] = (new_outcomes == 0).sum(axis=1) - 1
+
+    reference = replace_in_reference(base['reference'], base['values'][rows], new_lines)
+
+    return {
+        'rows': rows,
+        'lines': new_lines,
+        'ranks': category_ranks(new_lines, reference),
+        'wins': wins,
+        'losses': losses,
+        'records': records,
+    }
+
+
+def team_week_counts(aggregator, team_keys, end_week):
+    """N×K average weekly counts over every folded week."""
+    averages = []
+    for team_key in team_keys:
+        totals, played = aggregator.window_totals(team_key, end_week)
+        averages.append(totals / max(played, 1))
+    return np.array(averages)
+
+
+def read_trades(path):
+    """[(team1_key, players1, team2_key, players2)] from a trades CSV file."""
+    trades = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith('#'):
+                continue
+            team1_key, players1, team2_key, players2 = [cell.strip() for cell in row]
+            trades.append((team1_key, parse_player_ids(players1), team2_key, parse_player_ids(players2)))
+    return trades
+
+
+def parse_player_ids(text):
+    """'6583,5007' or '6583 5007' -> [6583, 5007]."""
+    return [int(player_id) for player_id in text.replace(',', ' ').split()]
+
+
+@timed('render')
+def display_trade(base, names, trade, result):
+    """Before/after lines, ranks and records for the two teams in one trade."""
+    BOLD = '\033[1m'
+    RESET = '\033[0m'
+
+    team1_key, players1, team2_key, players2 = trade
+    print(f"\n{BOLD}{names[team1_key]} sends {players1} / {names[team2_key]} sends {players2}{RESET}")
+    print("─" * 100)
+
+    for k, team_key in enumerate([team1_key, team2_key]):
+        i = result['rows'][k]
+        before = base['records'][i]
+        after = result['records'][i]
+        print(f"{BOLD}{names[team_key]}{RESET}  all-play {before[0]}-{before[1]}-{before[2]}"
+              f" -> {after[0]}-{after[1]}-{after[2]}")
+        for c, stat_key in enumerate(CATEGORY_KEYS):
+            old, new = base['values'][i, c], result['lines'][k, c]
+            fmt = '.3f' if stat_key in ('fg_pct', 'ft_pct') else '.1f'
+            print(f"  {stat_key:>6}: {old:>8{fmt}} -> {new:<8{fmt}}"
+                  f" rank {base['ranks'][i, c]:>2} -> {result['ranks'][k, c]:<2}")
+
+    moved = [j for j in range(len(base['team_keys']))
+             if j not in result['rows'] and not np.array_equal(base['records'][j], result['records'][j])]
+    if moved:
+        print("\nOther teams' all-play records:")
+        for j in moved:
+            before, after = base['records'][j], result['records'][j]
+            print(f"  {names[base['team_keys'][j]][:30]:<30} {before[0]}-{before[1]}-{before[2]}"
+                  f" -> {after[0]}-{after[1]}-{after[2]}")
+    print()
+
+
+@timed('render')
+def display_trade_summary(base, names, trades, results):
+    """One line per candidate trade, best for team1 first."""
+    deltas = [
+        (result['records'][result['rows'][0], 0] - base['records'][result['rows'][0], 0],
+         result['records'][result['rows'][1], 0] - base['records'][result['rows'][1], 0])
+        for result in results
+    ]
+    order = sorted(range(len(trades)), key=lambda t: (-deltas[t][0], -deltas[t][1]))
+
+    print(f"\n{'Team 1':<25}{'Sends':<20}{'Team 2':<25}{'Sends':<20}{'ΔW1':>6}{'ΔW2':>6}")
+    print("─" * 102)
+    for t in order:
+        team1_key, players1, team2_key, players2 = trades[t]
+        print(f"{names[team1_key][:24]:<25}{','.join(map(str, players1))[:19]:<20}"
+              f"{names[team2_key][:24]:<25}{','.join(map(str, players2))[:19]:<20}"
+              f"{deltas[t][0]:>+6}{deltas[t][1]:>+6}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate the impact of proposed trades')
+    parser.add_argument('--trade', nargs=4, action='append', default=[],
+                       metavar=('TEAM1', 'PLAYERS1', 'TEAM2', 'PLAYERS2'),
+                       help='Team keys and comma-separated player IDs each side sends')
+    parser.add_argument('--trades', type=str, default=None,
+                       help='CSV file of candidate trades (team1,players1,team2,players2)')
+    parser.add_argument('--week', type=int, default=None,
+                       help='Use weeks before this one (default: current week)')
+    parser.add_argument('--db', type=str, default=None,
+                       help='Read weeks from the local season store (see src.season_store) when stored')
+    add_league_arguments(parser)
+    args = parser.parse_args()
+
+    trades = [(t1, parse_player_ids(p1), t2, parse_player_ids(p2)) for t1, p1, t2, p2 in args.trade]
+    if args.trades:
+        trades += read_trades(args.trades)
+    if not trades:
+        parser.error('give at least one --trade or a --trades file')
+
+    lg = league_from_args(args)
+    week = lg.current_week() if args.week is None else args.week
+    weeks = prediction_weeks(week, 'total')
+    if not weeks:
+        print(f"No finished weeks before Week {week} to build team lines from.")
+        return
+
+    conn = open_store(args.db) if args.db else None
+    stored_weeks = set(week_statuses(conn, LEAGUE_ID)) if conn is not None else set()
+    week_store = {w: load_week_rows(conn, LEAGUE_ID, w) for w in stored_weeks if w in weeks}
+    prefetch_week_stats(lg, weeks, week_store)
+
+    aggregator = RollingAggregator()
+    fold_weeks(aggregator, lg, weeks, week_store)
+    team_keys = sorted(aggregator.prefix)
+    names = {row['team_key']: row['name'] for w in weeks for row in week_store[w] or []}
+
+    unknown = {key for t1, _, t2, _ in trades for key in (t1, t2)} - set(team_keys)
+    if unknown:
+        print(f"Unknown team key(s): {', '.join(sorted(unknown))}")
+        return
+
+    base = trade_baseline(team_keys, team_week_counts(aggregator, team_keys, weeks[-1]))
+
+    # Every player in every candidate, in one batched request
+    season = fetch_player_counts(lg, [p for _, p1, _, p2 in trades for p in p1 + p2])
+    per_week = {player_id: counts / len(weeks) for player_id, counts in season.items()}
+
+    missing = {p for _, p1, _, p2 in trades for p in p1 + p2} - set(per_week)
+    if missing:
+        print(f"No stats for player ID(s): {', '.join(map(str, sorted(missing)))}")
+        return
+
+    results = [evaluate_trade(base, *trade, per_week) for trade in trades]
+
+    if len(trades) == 1:
+        display_trade(base, names, trades[0], results[0])
+    else:
+        display_trade_summary(base, names, trades, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Helpers for building Yahoo scoreboard payloads in tests."""
+
+STAT_IDS = {
+    'fgm_fga': '9004003',
+    'fg_pct': '5',
+    'ftm_fta': '9007006',
+    'ft_pct': '8',
+    '3ptm': '10',
+    'pts': '12',
+    'reb': '15',
+    'ast': '16',
+    'st': '17',
+    'blk': '18',
+    'to': '19',
+}
+
+
+def make_team(team_id, name, stats, league_key='466.l.1'):
+    """Build a scoreboard team entry from a {stat_key: value-string} dict."""
+    metadata = [
+        {'team_key': f'{league_key}.t.{team_id}'},
+        {'team_id': str(team_id)},
+        {'name': name},
+    ]
+    stat_list = [
+        {'stat': {'stat_id': STAT_IDS[key], 'value': value}}
+        for key, value in stats.items()
+    ]
+    return {'team': [metadata, {'team_stats': {'coverage_type': 'week', 'stats': stat_list}}]}
+
+
+def make_scoreboard(week, teams, status='postevent', league_key='466.l.1'):
+    """Build a raw lg.matchups() payload pairing teams in order.
+
+    teams is a list of (team_id, name, stats) tuples with an even length.
+    """
+    matchups = {'count': len(teams) // 2}
+    for i in range(0, len(teams), 2):
+        pair = teams[i:i + 2]
+        matchups[str(i // 2)] = {
+            'matchup': {
+                'week': str(week),
+                'status': status,
+                '0': {
+                    'teams': {
+                        str(j): make_team(*team, league_key=league_key)
+                        for j, team in enumerate(pair)
+                    }
+                },
+            }
+        }
+
+    return {
+        'fantasy_content': {
+            'league': [
+                {'league_key': league_key, 'current_week': week},
+                {'scoreboard': {'week': str(week), '0': {'matchups': matchups}}},
+            ]
+        }
+    }
+
+
+def make_settings(league_key='466.l.1', **extra):
+    """Build a raw league settings payload as returned by get_settings_raw."""
+    league = {'league_key': league_key, 'game_code': 'nba', 'season': '2025'}
+    league.update(extra)
+    return {
+        'fantasy_content': {
+            'league': [league, {'settings': [{'stat_categories': {'stats': []}}]}]
+        }
+    }
+
+
+def make_team_matchups(scoreboards, team_keys=None, league_key=None):
+    """Build a teams/matchups collection payload from make_scoreboard payloads.
+
+    Each team gets its own copy of every matchup it played, as Yahoo returns
+    them. team_keys limits the teams listed; with league_key the collection
+    is wrapped in a league (league/{key}/teams/matchups), otherwise it is the
+    top-level teams;team_keys=... shape.
+    """
+    teams = {}
+    for scoreboard in scoreboards:
+        matchups = scoreboard['fantasy_content']['league'][1]['scoreboard']['0']['matchups']
+        for i in range(matchups['count']):
+            matchup = matchups[str(i)]['matchup']
+            for side in ('0', '1'):
+                metadata = matchup['0']['teams'][side]['team'][0]
+                team_key = metadata[0]['team_key']
+                if team_keys is None or team_key in team_keys:
+                    teams.setdefault(team_key, (metadata, []))[1].append(matchup)
+
+    collection = {'count': len(teams)}
+    for i, (metadata, team_matchups) in enumerate(teams.values()):
+        container = {str(j): {'matchup': m} for j, m in enumerate(team_matchups)}
+        container['count'] = len(team_matchups)
+        collection[str(i)] = {'team': [metadata, {'matchups': container}]}
+
+    if league_key is None:
+        return {'fantasy_content': {'teams': collection}}
+    return {'fantasy_content': {'league': [{'league_key': league_key}, {'teams': collection}]}}
@@ -0,0 +1,64 @@
+import re
+
+from payloads import make_scoreboard, make_team_matchups
+from src.batch_fetch import chunked, fetch_league_weeks, fetch_team_weeks
+from src.scoreboard import parse_scoreboard, team_rows
+from test_season_store import stats
+
+
+def scoreboard(week, league_key='466.l.1'):
+    teams = [(t, f'Team {t}', stats(400 + 10 * t + week)) for t in range(1, 5)]
+    return make_scoreboard(week, teams, league_key=league_key)
+
+
+class FakeHandler:
+    """Serves teams/matchups collections for two leagues of four teams."""
+
+    def __init__(self):
+        self.uris = []
+
+    def get(self, uri):
+        self.uris.append(uri)
+        weeks = [int(w) for w in re.search(r'weeks=([\d,]+)', uri).group(1).split(',')]
+        league = re.match(r'league/([^/]+)/teams/matchups', uri)
+        if league:
+            return make_team_matchups([scoreboard(w, league.group(1)) for w in weeks],
+                                      league_key=league.group(1))
+        team_keys = re.search(r'team_keys=([^/]+)', uri).group(1).split(',')
+        leagues = sorted({key.rsplit('.t.', 1)[0] for key in team_keys})
+        return make_team_matchups([scoreboard(w, lk) for lk in leagues for w in weeks], team_keys)
+
+
+class FakeLeague:
+    league_id = '466.l.1'
+
+    def __init__(self):
+        self.yhandler = FakeHandler()
+
+
+def test_chunked():
+    assert chunked(range(5), 2) == [[0, 1], [2, 3], [4]]
+
+
+def test_league_weeks_match_scoreboards_in_few_requests():
+    lg = FakeLeague()
+    tables = fetch_league_weeks(lg, range(1, 6), week_chunk=2)
+
+    assert len(lg.yhandler.uris) == 3
+    assert sorted(tables) == [1, 2, 3, 4, 5]
+    for week, table in tables.items():
+        assert table['week'] == week and table['status'] == 'postevent'
+        by_key = {row['team_key']: row for row in team_rows(table)}
+        expected = {row['team_key']: row for row in team_rows(parse_scoreboard(scoreboard(week)))}
+        assert by_key == expected
+
+
+def test_team_weeks_span_leagues_and_chunk_keys():
+    handler = FakeHandler()
+    keys = [f'466.l.{lg}.t.{t}' for lg in (1, 2) for t in (1, 3)]
+    corpus = fetch_team_weeks(handler, keys, [1, 2], team_chunk=3)
+
+    assert len(handler.uris) == 2
+    assert sorted(corpus) == ['466.l.1', '466.l.2']
+    # Teams 1 and 3 play different opponents, so both matchups are kept once
+    assert sorted(corpus['466.l.2'][1]['team_keys']) == [f'466.l.2.t.{t}' for t in range(1, 5)]
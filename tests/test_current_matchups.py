@@ -0,0 +1,44 @@
+from payloads import make_scoreboard
+from src.current_matchups import watch
+
+
+def stats(pts, reb):
+    return {'fg_pct': '.450', 'ft_pct': '.800', '3ptm': '10', 'pts': str(pts), 'reb': str(reb),
+            'ast': '20', 'st': '5', 'blk': '5', 'to': '10'}
+
+
+class ScriptedLeague:
+    """Serves one scoreboard per poll; only the no-week (current) form is allowed."""
+
+    def __init__(self, payloads):
+        self.payloads = list(payloads)
+
+    def matchups(self, week=None):
+        assert week is None
+        return self.payloads.pop(0)
+
+
+def scoreboard(pts_a, reb_c, status='midevent', week=3):
+    return make_scoreboard(week, [
+        (1, 'A', stats(pts_a, 50)), (2, 'B', stats(100, 50)),
+        (3, 'C', stats(100, reb_c)), (4, 'D', stats(100, 50)),
+    ], status=status)
+
+
+def test_watch_prints_only_flips_and_backs_off(capsys):
+    lg = ScriptedLeague([
+        scoreboard(90, 40),
+        scoreboard(95, 40),                       # A still trails in PTS: nothing printed
+        scoreboard(120, 40),                      # A takes PTS
+        scoreboard(120, 40, status='postevent'),
+        scoreboard(120, 40, status='postevent'),
+    ])
+    delays = []
+    watch(lg, 60, max_interval=200, polls=5, sleep=delays.append)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert sum('MATCHUP 1' in line for line in lines) == 2
+    flips = [line for line in lines if line.strip().startswith('PTS') and 'was' in line]
+    assert len(flips) == 1 and 'now ←' in flips[0]
+    assert not any('MATCHUP 2:' in line for line in lines[lines.index(flips[0]) - 1:])
+    assert delays == [60, 60, 60, 120]
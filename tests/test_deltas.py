@@ -0,0 +1,71 @@
+import numpy as np
+
+from payloads import make_scoreboard
+from src.deltas import (
+    COUNT_KEYS, apply_exact_percentages, cumulative_from_weekly, snapshot_array, weekly_deltas,
+    weekly_lines,
+)
+from src.matrix_engine import CATEGORY_KEYS
+from src.scoreboard import parse_scoreboard, teams_by_name
+from src.season_store import load_teams_by_name, open_store, save_week
+
+
+def test_weekly_lines_rebuild_percentages_from_makes():
+    rng = np.random.default_rng(0)
+    weekly = rng.integers(1, 200, size=(4, 3, len(COUNT_KEYS))).astype(float)
+    weekly[..., COUNT_KEYS.index('fga')] += 200
+    weekly[..., COUNT_KEYS.index('fta')] += 200
+
+    lines = weekly_lines(cumulative_from_weekly(weekly))
+
+    assert np.allclose(weekly_deltas(cumulative_from_weekly(weekly)), weekly)
+    fg = CATEGORY_KEYS.index('fg_pct')
+    assert np.allclose(lines[..., fg], weekly[..., 0] / weekly[..., 1])
+    pts = CATEGORY_KEYS.index('pts')
+    assert np.allclose(lines[..., pts], weekly[..., COUNT_KEYS.index('pts')])
+
+
+def test_skipped_week_subtracts_previous_snapshot():
+    def snapshot(week, team, scale):
+        record = {key: 10 * scale for key in COUNT_KEYS}
+        record.update(week=week, team=team, fgm=45 * scale, fga=100 * scale, ftm=0, fta=0)
+        return record
+
+    weeks, teams, cumulative = snapshot_array([
+        snapshot(12, 'A', 1), snapshot(14, 'A', 3),
+    ])
+    lines = weekly_lines(cumulative)
+
+    assert weeks == [12, 14]
+    assert lines[1, 0, CATEGORY_KEYS.index('pts')] == 20
+    assert lines[1, 0, CATEGORY_KEYS.index('fg_pct')] == 0.45
+    assert lines[1, 0, CATEGORY_KEYS.index('ft_pct')] == 0.0
+
+
+def test_exact_percentages_replace_rounded_values():
+    raw = make_scoreboard(1, [
+        (1, 'A', {'fgm_fga': '176/371', 'fg_pct': '.474', 'ft_pct': '.745'}),
+        (2, 'B', {'fgm_fga': '0/0', 'fg_pct': '', 'ft_pct': '.800'}),
+    ])
+    table = apply_exact_percentages(parse_scoreboard(raw))
+
+    fg = CATEGORY_KEYS.index('fg_pct')
+    ft = CATEGORY_KEYS.index('ft_pct')
+    assert table['stats'][0, fg] == 176 / 371
+    assert table['stats'][0, ft] == 0.745
+    assert table['stats'][1, fg] == 0.0
+
+
+def test_stored_week_gets_the_same_exact_percentages():
+    raw = make_scoreboard(1, [
+        (1, 'A', {'fgm_fga': '176/371', 'fg_pct': '.474', 'ftm_fta': '79/106', 'ft_pct': '.745', 'pts': '480'}),
+        (2, 'B', {'fgm_fga': '0/0', 'fg_pct': '', 'ft_pct': '.800', 'pts': '0'}),
+    ])
+    conn = open_store(':memory:')
+    save_week(conn, '466.l.1', 1, raw)
+
+    stored = load_teams_by_name(conn, '466.l.1', 1, exact=True)
+    fetched = teams_by_name(apply_exact_percentages(parse_scoreboard(raw)))
+    for name, stats in fetched.items():
+        assert {key: stored[name][key] for key in stats} == stats
+    assert load_teams_by_name(conn, '466.l.1', 1)['A']['fg_pct'] == 0.474
@@ -0,0 +1,44 @@
+import io
+import json
+
+from payloads import make_scoreboard
+from src.ingest import iter_team_weeks
+from src.scoreboard import parse_scoreboard, team_rows
+from src.season_store import ingest_rows, load_week_rows, open_store, week_statuses
+
+
+def payload(week, status='postevent'):
+    raw = make_scoreboard(week, [
+        (1, 'A', {'fgm_fga': '176/371', 'fg_pct': '.474', 'pts': str(400 + week), 'to': '60'}),
+        (2, 'B', {'fgm_fga': '150/360', 'fg_pct': '.417', 'pts': '450', 'to': '', 'ast': '90'}),
+        (3, 'C', {'pts': '300'}),
+        (4, 'D', {'pts': '310'}),
+    ], status=status)
+    # Extra blocks the stream parser should skip over
+    raw['fantasy_content']['league'][1]['scoreboard']['0']['matchups']['0']['matchup']['stat_winners'] = [
+        {'stat_winner': {'stat_id': '5', 'winner_team_key': '466.l.1.t.1'}}
+    ]
+    return raw
+
+
+def test_stream_rows_match_full_parse():
+    raw = payload(3, status='midevent')
+    streamed = list(iter_team_weeks(io.BytesIO(json.dumps(raw).encode())))
+
+    expected = team_rows(parse_scoreboard(raw))
+    for row in expected:
+        row.update(week=3, status='midevent')
+    assert streamed == expected
+
+
+def test_ingest_rows_writes_week_by_week():
+    conn = open_store(':memory:')
+
+    def rows():
+        for week in (1, 2, 3):
+            status = 'midevent' if week == 3 else 'postevent'
+            yield from iter_team_weeks(io.BytesIO(json.dumps(payload(week, status)).encode()))
+
+    assert ingest_rows(conn, rows()) == 12
+    assert week_statuses(conn, '466.l.1') == {1: 'postevent', 2: 'postevent', 3: 'midevent'}
+    assert load_week_rows(conn, '466.l.1', 2)[0]['pts'] == 402.0
@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.live_matrix import LiveMatrix
+from src.matrix_engine import best_and_worst, possibility_matrices
+
+
+def test_updates_match_full_rebuild():
+    rng = np.random.default_rng(11)
+    names = [f'Team {i}' for i in range(12)]
+    values = rng.integers(0, 6, size=(12, 9)).astype(float)  # small range: plenty of ties
+
+    live = LiveMatrix()
+    assert live.update(names, values) == names
+
+    for _ in range(50):
+        changed_rows = rng.choice(12, size=rng.integers(1, 4), replace=False)
+        values = values.copy()
+        values[changed_rows] = rng.integers(0, 6, size=(len(changed_rows), 9))
+        live.update(names, values)
+
+        wins, losses, ties = possibility_matrices(values)
+        best, worst = best_and_worst(wins, losses)
+        assert np.array_equal(live.matrix['wins'], wins)
+        assert np.array_equal(live.matrix['ties'], ties)
+        assert np.array_equal(live.matrix['total_wins'], wins.sum(axis=1))
+        assert np.array_equal(live.matrix['total_losses'], losses.sum(axis=1))
+        assert np.array_equal(live.matrix['best'], best)
+        assert np.array_equal(live.matrix['worst'], worst)
+
+
+def test_unchanged_poll_reports_nothing():
+    live = LiveMatrix()
+    values = np.ones((2, 9))
+    values[0, 0] = np.nan
+    live.update(['A', 'B'], values)
+    assert live.update(['A', 'B'], values.copy()) == []
+
+    values[1, 3] = 4.0
+    assert live.update(['A', 'B'], values) == ['B']
+    assert live.matrix['total_wins'].tolist() == [0, 1]
@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+
+from src.matrix_engine import (
+    CATEGORY_KEYS, all_play_totals, category_win_bits, format_result, possibility_matrices,
+    sorted_reference, team_stats_array,
+)
+from src.possibility_matrix import compare_two_teams, generate_possibility_matrix
+
+
+def random_teams(n, seed=0):
+    rng = random.Random(seed)
+    return {
+        f"Team {i}": {key: float(rng.randint(0, 6)) for key in CATEGORY_KEYS}
+        for i in range(n)
+    }
+
+
+def test_engine_matches_pairwise_comparison():
+    teams = random_teams(12)
+    names, values = team_stats_array(teams)
+    wins, losses, ties = possibility_matrices(values, block_size=5)
+
+    for i, a in enumerate(names):
+        for j, b in enumerate(names):
+            if i != j:
+                assert (wins[i, j], losses[i, j]) == compare_two_teams(teams[a], teams[b])
+
+    assert np.array_equal(wins + losses + ties, np.full((12, 12), len(CATEGORY_KEYS)))
+    assert np.all(np.diag(ties) == len(CATEGORY_KEYS))
+
+
+def test_missing_category_is_skipped():
+    teams = {'A': {'pts': 10.0, 'to': 5.0}, 'B': {'pts': 8.0, 'to': 4.0, 'reb': 3.0}}
+    matrix = generate_possibility_matrix(teams)
+    assert matrix['team_names'] == ['A', 'B']
+    assert format_result(matrix, 0, 1) == '1-1'
+    assert format_result(matrix, 1, 0) == '1-1'
+    assert format_result(matrix, 0, 0) == '-'
+
+
+def test_category_bits_match_win_counts():
+    teams = random_teams(8, seed=3)
+    _, values = team_stats_array(teams)
+    wins, _, _ = possibility_matrices(values)
+    bits = category_win_bits(values)
+
+    popcount = np.array([[bin(int(b)).count('1') for b in row] for row in bits])
+    assert np.array_equal(popcount, wins)
+
+
+def test_all_play_totals_match_pairwise_sums():
+    teams = random_teams(15, seed=7)
+    teams['Team 3']['reb'] = np.nan
+    _, values = team_stats_array(teams)
+    wins, losses, _ = possibility_matrices(values)
+
+    total_wins, total_losses = all_play_totals(values)
+    assert np.array_equal(total_wins, wins.sum(axis=1))
+    assert np.array_equal(total_losses, losses.sum(axis=1))
+
+
+def test_all_play_totals_against_reference_pool():
+    _, history = team_stats_array(random_teams(40, seed=1))
+    _, current = team_stats_array(random_teams(3, seed=2))
+
+    reference = sorted_reference(history)
+    total_wins, total_losses = all_play_totals(current, reference)
+
+    combined = np.vstack([current, history])
+    wins, losses, _ = possibility_matrices(combined)
+    assert np.array_equal(total_wins, wins[:3, 3:].sum(axis=1))
+    assert np.array_equal(total_losses, losses[:3, 3:].sum(axis=1))
@@ -0,0 +1,36 @@
+from payloads import make_scoreboard
+from src.predict_matchups import predict_matchup
+
+
+def week_stats(base):
+    return {
+        'fg_pct': '.450', 'ft_pct': '.800', '3ptm': str(base), 'pts': str(base * 10),
+        'reb': str(base * 4), 'ast': str(base * 2), 'st': '10', 'blk': '5', 'to': '20',
+    }
+
+
+class CountingLeague:
+    def __init__(self):
+        self.calls = []
+
+    def matchups(self, week=None):
+        self.calls.append(week)
+        return make_scoreboard(week, [
+            (1, 'A', week_stats(50)), (2, 'B', week_stats(40)),
+            (3, 'C', week_stats(30)), (4, 'D', week_stats(20)),
+        ])
+
+
+def test_week_store_fetches_each_week_once():
+    lg = CountingLeague()
+    matchups = [
+        {'team1_key': '466.l.1.t.1', 'team2_key': '466.l.1.t.2'},
+        {'team1_key': '466.l.1.t.3', 'team2_key': '466.l.1.t.4'},
+    ]
+
+    week_store = {}
+    preds = [predict_matchup(lg, m, 5, 'total', week_store) for m in matchups]
+
+    assert sorted(lg.calls) == [1, 2, 3, 4]
+    assert all(p['available'] for p in preds)
+    assert preds[0]['team1_wins'] == 4
@@ -0,0 +1,24 @@
+import threading
+import time
+
+from src.prefetch import map_weeks
+
+
+def test_map_weeks_returns_week_order_with_bounded_concurrency():
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def fetch_week(week):
+        with lock:
+            active.append(week)
+            peak.append(len(active))
+        time.sleep(0.01 * (10 - week))
+        with lock:
+            active.remove(week)
+        return week * 10
+
+    results = map_weeks(fetch_week, [5, 3, 1, 2, 4, 3], max_workers=2)
+
+    assert list(results.items()) == [(1, 10), (2, 20), (3, 30), (4, 40), (5, 50)]
+    assert max(peak) == 2
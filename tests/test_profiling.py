@@ -0,0 +1,65 @@
+import pytest
+
+from src import profiling
+
+
+@pytest.fixture
+def recorder():
+    sink = []
+    yield profiling.enable(sink=sink.append), sink
+    profiling.disable()
+
+
+def test_spans_are_free_when_disabled():
+    with profiling.span('http', uri='x'):
+        pass
+    assert profiling.records() == []
+
+
+def test_spans_and_timed_functions_are_recorded(recorder):
+    recorder, sink = recorder
+
+    @profiling.timed('compute')
+    def square(x):
+        return x * x
+
+    with profiling.span('http', uri='league/1/scoreboard'):
+        assert square(3) == 9
+    square(4)
+
+    records = profiling.records()
+    assert [r['stage'] for r in records] == ['compute', 'http', 'compute']
+    assert records[1]['uri'] == 'league/1/scoreboard'
+    assert records[0]['function'].endswith('square')
+    assert sink == records
+
+    summary = {row['stage']: row for row in recorder.summary()}
+    assert summary['compute']['count'] == 2
+    assert summary['http']['total'] >= summary['compute']['max']
+
+
+def test_records_are_bounded_but_totals_are_not():
+    recorder = profiling.enable(max_records=3)
+    try:
+        for _ in range(5):
+            with profiling.span('parse'):
+                pass
+        assert len(profiling.records()) == 3
+        assert recorder.summary()[0]['count'] == 5
+    finally:
+        profiling.disable()
+
+
+def test_prediction_compute_excludes_fetching(recorder):
+    from src.predict_matchups import predict_matchup
+    from test_predict_matchups import CountingLeague
+
+    predict_matchup(CountingLeague(), {'team1_key': '466.l.1.t.1', 'team2_key': '466.l.1.t.2'}, 4, 'total')
+
+    records = profiling.records()
+    compute = [r for r in records if r['stage'] == 'compute']
+    parse = [r for r in records if r['stage'] == 'parse']
+    assert len(parse) == 3 and compute
+    for c in compute:
+        for p in parse:
+            assert p['start'] + p['duration'] <= c['start'] or c['start'] + c['duration'] <= p['start']
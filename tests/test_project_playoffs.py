@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from payloads import make_scoreboard
+import src.project_playoffs as project_playoffs
+from src.project_playoffs import bracket_order, bracket_slots, project_season, remaining_schedule
+from src.simulate_matchups import fit_team
+
+
+def fixed_fit(strength):
+    """A team that puts up the same line every week; higher strength wins every category."""
+    line = [strength, 100, strength, 100, strength, strength, strength, strength, strength, strength, 50 - strength]
+    return fit_team(np.array([line], dtype=float))
+
+
+def test_bracket_seeding():
+    assert bracket_order(8) == [1, 8, 4, 5, 2, 7, 3, 6]
+    assert bracket_slots(6).tolist() == [0, -1, 3, 4, 1, -1, 2, 5]
+
+
+def test_strongest_team_wins_everything():
+    fits = [fixed_fit(s) for s in (40, 30, 20, 10)]
+    records = np.zeros((4, 3), dtype=int)
+    schedule = [[(0, 1), (2, 3)], [(0, 2), (1, 3)], [(0, 3), (1, 2)]]
+
+    projection = project_season(fits, schedule, records, playoff_teams=4, sims=500, seed=3, max_workers=1)
+
+    assert projection['champion'].tolist() == [1.0, 0.0, 0.0, 0.0]
+    assert projection['final'].tolist() == [1.0, 1.0, 0.0, 0.0]
+    assert projection['record'][0].tolist() == [27.0, 0.0, 0.0]
+    assert np.diag(projection['finish']).tolist() == [1.0, 1.0, 1.0, 1.0]
+
+
+def test_results_do_not_depend_on_workers():
+    rng = np.random.default_rng(0)
+    fits = [fit_team(rng.gamma(5, 10, size=(4, 11))) for _ in range(6)]
+    records = np.array([[30, 20, 4]] * 6)
+    schedule = [[(0, 1), (2, 3), (4, 5)], [(0, 2), (1, 4), (3, 5)]]
+
+    serial = project_season(fits, schedule, records, 6, sims=3000, seed=9, max_workers=1, batch_size=1000)
+    pooled = project_season(fits, schedule, records, 6, sims=3000, seed=9, max_workers=2, batch_size=1000)
+
+    assert np.array_equal(serial['finish'], pooled['finish'])
+    assert np.array_equal(serial['champion'], pooled['champion'])
+    assert serial['champion'].sum() == pytest.approx(1.0)
+    assert serial['playoffs'].sum() == pytest.approx(6.0)
+
+
+def test_remaining_schedule_fetches_with_requested_workers(monkeypatch):
+    used = []
+    real_prefetch = project_playoffs.prefetch_weeks
+
+    def prefetch_weeks(lg, weeks, parse, max_workers):
+        used.append(max_workers)
+        return real_prefetch(lg, weeks, parse, max_workers)
+
+    class League:
+        def matchups(self, week=None):
+            return make_scoreboard(week, [(1, 'A', {}), (2, 'B', {})])
+
+    monkeypatch.setattr(project_playoffs, 'prefetch_weeks', prefetch_weeks)
+    index = {'466.l.1.t.1': 0, '466.l.1.t.2': 1}
+    assert remaining_schedule(League(), 5, 8, index, max_workers=2) == [[(0, 1)]] * 3
+    assert used == [2]
@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from payloads import make_scoreboard, make_settings
+from src.auth import get_league
+from src.matrix_engine import format_result
+from src.possibility_matrix import extract_all_teams, generate_possibility_matrix
+from src.recording import response_path
+
+
+def record(directory, uri, payload):
+    with open(response_path(str(directory), uri), 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+
+
+def test_replay_serves_recorded_responses_without_oauth(tmp_path):
+    record(tmp_path, 'league/466.l.1/settings', make_settings())
+    record(tmp_path, 'league/466.l.1/scoreboard;week=1', make_scoreboard(1, [
+        (1, 'A', {'pts': '500', 'to': '60'}),
+        (2, 'B', {'pts': '450', 'to': '50'}),
+    ]))
+
+    lg = get_league('466.l.1', replay_dir=str(tmp_path))
+    raw = lg.matchups(week=1)
+    container = raw['fantasy_content']['league'][1]['scoreboard']['0']['matchups']
+
+    matrix = generate_possibility_matrix(extract_all_teams(container))
+    assert format_result(matrix, 0, 1) == '1-1'
+
+    with pytest.raises(RuntimeError):
+        lg.matchups(week=2)
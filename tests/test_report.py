@@ -0,0 +1,70 @@
+import argparse
+
+import pytest
+
+from payloads import make_scoreboard
+import src.report as report
+from src.season_store import open_store, save_week
+from test_predict_matchups import week_stats
+
+
+class CountingLeague:
+    def __init__(self):
+        self.calls = []
+
+    def matchups(self, week=None):
+        self.calls.append(week)
+        return make_scoreboard(week or 4, [
+            (1, 'A', week_stats(50)), (2, 'B', week_stats(40)),
+            (3, 'C', week_stats(30)), (4, 'D', week_stats(20)),
+        ], status='midevent' if week is None else 'postevent')
+
+
+def parse(argv):
+    parser = argparse.ArgumentParser()
+    report.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def test_all_reports_share_one_fetch_per_week(monkeypatch, capsys):
+    lg = CountingLeague()
+    monkeypatch.setattr(report, 'league_from_args', lambda args: lg)
+
+    args = parse([])
+    args.run(args)
+
+    # Current week in one request, then each history week once
+    assert lg.calls[0] is None
+    assert sorted(lg.calls[1:]) == [1, 2, 3]
+    out = capsys.readouterr().out
+    assert 'POSSIBILITY MATRIX INSIGHTS' in out
+    assert 'CATEGORY RANKINGS MATRIX' in out
+    assert 'WEEK 4 MATCHUP PREDICTIONS' in out
+
+
+def test_stored_week_matches_fetched_week():
+    def line(base, fgm, fga):
+        return dict(week_stats(base), fgm_fga=f'{fgm}/{fga}', ftm_fta='79/106', ft_pct='.745')
+
+    # .4499 and .4501 both round to .450: only the exact values tell A and B apart
+    raw = make_scoreboard(4, [(1, 'A', line(50, 4499, 10000)), (2, 'B', line(40, 4501, 10000))],
+                          league_key=report.LEAGUE_ID)
+    conn = open_store(':memory:')
+    save_week(conn, report.LEAGUE_ID, 4, raw)
+
+    fetched = report.week_data_from_scoreboard(raw)
+    stored = report.week_data_from_store(conn, 4)
+
+    assert stored['matchups'] == fetched['matchups']
+    for key in ('teams', 'exact_teams'):
+        for name, stats in fetched[key].items():
+            assert {stat_key: stored[key][name][stat_key] for stat_key in stats} == stats
+    assert fetched['exact_teams'] != fetched['teams']
+
+
+def test_window_must_be_at_least_one(capsys):
+    assert parse(['--window', '2']).window == 2
+    for value in ('0', '-1'):
+        with pytest.raises(SystemExit):
+            parse(['--window', value])
+    assert 'must be at least 1' in capsys.readouterr().err
@@ -0,0 +1,54 @@
+from payloads import make_scoreboard, make_settings
+from src.response_cache import ResponseCache, is_final
+from src.session import SessionHandler
+from src.scheduler import RequestScheduler
+from test_season_store import stats
+
+TEAMS = [(1, 'A', stats(484)), (2, 'B', stats(450))]
+
+
+def test_only_finished_weeks_and_metadata_are_final():
+    final_week = make_scoreboard(2, TEAMS)
+    live_week = make_scoreboard(3, TEAMS, status='midevent')
+
+    assert is_final('league/466.l.1/scoreboard;week=2', final_week)
+    assert not is_final('league/466.l.1/scoreboard;week=3', live_week)
+    # The current-week scoreboard moves on to the next week when this one ends
+    assert not is_final('league/466.l.1/scoreboard', final_week)
+    assert is_final('league/466.l.1/settings', make_settings())
+
+
+def test_live_entries_expire_after_ttl(tmp_path):
+    now = [1000.0]
+    cache = ResponseCache(str(tmp_path), live_ttl=60, clock=lambda: now[0])
+    cache.put('league/466.l.1/scoreboard', {'live': True})
+    cache.put('league/466.l.1/scoreboard;week=2', make_scoreboard(2, TEAMS))
+
+    now[0] += 59
+    assert cache.get('league/466.l.1/scoreboard') == {'live': True}
+    now[0] += 2
+    assert cache.get('league/466.l.1/scoreboard') is None
+    assert cache.get('league/466.l.1/scoreboard;week=2') is not None
+    assert cache.counters == {'hits': 2, 'misses': 1}
+
+
+def test_warm_cache_needs_no_oauth_or_network(tmp_path, monkeypatch):
+    responses = {
+        'league/466.l.1/settings': make_settings(),
+        'league/466.l.1/scoreboard;week=2': make_scoreboard(2, TEAMS),
+    }
+    fetched = []
+    monkeypatch.setattr(SessionHandler, '_request', lambda self, uri: fetched.append(uri) or responses[uri])
+    scheduler = RequestScheduler(rate=1000)
+
+    cold = SessionHandler(None, scheduler, ResponseCache(str(tmp_path)), connect=lambda: 'sc')
+    for uri in responses:
+        cold.get(uri)
+    assert fetched == list(responses)
+
+    def no_oauth():
+        raise AssertionError('opened an OAuth session')
+
+    warm = SessionHandler(None, scheduler, ResponseCache(str(tmp_path)), connect=no_oauth)
+    assert [warm.get(uri) for uri in responses] == list(responses.values())
+    assert fetched == list(responses)
@@ -0,0 +1,104 @@
+import pytest
+
+from src.deltas import COUNT_KEYS
+from src.predict_matchups import fetch_week_stats, fold_weeks, predict_matchup
+from src.rolling import RollingAggregator
+from payloads import make_scoreboard
+from test_predict_matchups import CountingLeague, week_stats
+
+
+def row(team_key, fgm, fga, pts):
+    return {'team_key': team_key, 'fgm': fgm, 'fga': fga, 'ftm': 0, 'fta': 0, 'pts': pts}
+
+
+def test_percentages_weight_by_attempts():
+    agg = RollingAggregator()
+    agg.fold_week(1, [row('a', 1, 2, 10)])     # .500 on 2 attempts
+    agg.fold_week(2, [row('a', 90, 100, 30)])  # .900 on 100 attempts
+
+    avg = agg.window_average('a', 2)
+    assert avg['fg_pct'] == pytest.approx(91 / 102)
+    assert avg['pts'] == 20.0
+    assert agg.window_average('a', 2, 1)['pts'] == 30.0
+
+
+def test_windows_skip_missing_weeks_and_reject_uncovered():
+    agg = RollingAggregator()
+    agg.fold_week(3, [row('a', 5, 10, 10), row('b', 5, 10, 40)])
+    agg.fold_week(4, [row('a', 5, 10, 20)])
+
+    assert agg.window_totals('b', 4, 2)[1] == 1
+    assert agg.window_average('b', 4, 1) == {}
+    assert agg.window_totals('a', 4, 3) is None
+    with pytest.raises(ValueError):
+        agg.fold_week(6, [])
+
+
+def test_saved_state_only_folds_new_weeks(tmp_path):
+    path = tmp_path / 'rolling.json'
+    matchup = {'team1_key': '466.l.1.t.1', 'team2_key': '466.l.1.t.2'}
+
+    lg = CountingLeague()
+    agg = RollingAggregator()
+    predict_matchup(lg, matchup, 4, 'total', {}, agg)
+    agg.save(path)
+    assert sorted(lg.calls) == [1, 2, 3]
+
+    lg = CountingLeague()
+    pred = predict_matchup(lg, matchup, 5, 'total', {}, RollingAggregator.load(path))
+    assert lg.calls == [4]
+    assert pred['available'] and pred['weeks_used'] == 4
+
+
+def test_saved_state_is_tied_to_its_league(tmp_path):
+    path = tmp_path / 'rolling.json'
+    agg = RollingAggregator('466.l.1')
+    agg.fold_week(1, [row('a', 5, 10, 10)])
+    agg.save(path)
+
+    assert RollingAggregator.load(path, '466.l.1').window_totals('a', 1) is not None
+    with pytest.raises(ValueError):
+        RollingAggregator.load(path, '428.l.9')
+
+
+class CorrectedLeague(CountingLeague):
+    """Week 2 is live until `final`, and `corrected` bumps team A's points."""
+
+    def __init__(self, final=True, corrected=False):
+        super().__init__()
+        self.final = final
+        self.corrected = corrected
+
+    def matchups(self, week=None):
+        self.calls.append(week)
+        base = 60 if week == 1 and self.corrected else 50
+        status = 'midevent' if week == 2 and not self.final else 'postevent'
+        return make_scoreboard(week, [(1, 'A', week_stats(base)), (2, 'B', week_stats(40))], status=status)
+
+
+def test_live_and_corrected_weeks_are_refolded(tmp_path):
+    path = tmp_path / 'rolling.json'
+    matchup = {'team1_key': '466.l.1.t.1', 'team2_key': '466.l.1.t.2'}
+
+    agg = RollingAggregator()
+    predict_matchup(CorrectedLeague(final=False), matchup, 3, 'total', {}, agg)
+    agg.save(path)
+
+    # Week 2 was folded while live, so the run's fold fetches and refolds it
+    lg = CorrectedLeague()
+    agg = RollingAggregator.load(path)
+    assert fold_weeks(agg, lg, [1, 2, 3], {})
+    assert sorted(lg.calls) == [2, 3]
+    assert agg.is_final(2)
+
+    # A stat correction to week 1 in this run's rows refolds from week 1
+    lg = CorrectedLeague(corrected=True)
+    week_store = {}
+    fetch_week_stats(lg, 1, week_store)
+    assert fold_weeks(agg, lg, [1, 2, 3], week_store)
+    assert agg.window_totals('466.l.1.t.1', 3)[0][COUNT_KEYS.index('pts')] == 600 + 500 + 500
+
+    # Matchups only read the refolded totals
+    lg = CorrectedLeague()
+    assert predict_matchup(lg, matchup, 4, 'total', week_store, agg)['available']
+    assert lg.calls == []
@@ -0,0 +1,63 @@
+import pytest
+
+from src.scheduler import RequestScheduler, Throttled, TokenBucket, TransientError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_paces_after_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=clock.sleep)
+
+    for _ in range(5):
+        bucket.acquire()
+
+    # Three from the burst, then one every half second
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_throttling_halves_concurrency_and_success_ramps_it_back():
+    scheduler = RequestScheduler(rate=1000, max_concurrency=8, sleep=lambda s: None, jitter=lambda: 0.0)
+    outcomes = iter([Throttled('999'), Throttled('999'), 'ok'])
+
+    def request():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert scheduler.call(request) == 'ok'
+    assert scheduler.stats() == {'requests': 3, 'throttled': 2, 'retried': 2, 'failed': 0, 'concurrency': 2}
+
+    for _ in range(2):
+        scheduler.call(lambda: 'ok')
+    assert scheduler.stats()['concurrency'] == 3
+
+
+def test_gives_up_after_max_retries_and_skips_other_errors():
+    delays = []
+    scheduler = RequestScheduler(rate=1000, max_retries=2, base_delay=1.0, sleep=delays.append, jitter=lambda: 1.0)
+
+    def failing():
+        raise TransientError('HTTP 503')
+
+    with pytest.raises(TransientError):
+        scheduler.call(failing)
+    assert delays == [1.0, 2.0]
+
+    def broken():
+        raise KeyError('fantasy_content')
+
+    with pytest.raises(KeyError):
+        scheduler.call(broken)
+    assert scheduler.stats()['failed'] == 1
+    assert scheduler.stats()['requests'] == 4
@@ -0,0 +1,36 @@
+import numpy as np
+
+from payloads import make_scoreboard
+from src.scoreboard import parse_scoreboard, scheduled_matchups, team_rows, teams_by_name
+
+
+def test_parse_scoreboard_builds_columnar_table():
+    raw = make_scoreboard(4, [
+        (1, 'A', {'fgm_fga': '176/371', 'fg_pct': '.474', 'ftm_fta': '79/106', 'pts': '484', 'to': '68'}),
+        (2, 'B', {'fgm_fga': '', 'fg_pct': '', 'pts': '450', 'to': '70'}),
+        (3, 'C', {'pts': '400'}),
+        (4, 'D', {'pts': '500'}),
+    ], status='midevent')
+
+    table = parse_scoreboard(raw)
+
+    assert table['week'] == 4
+    assert table['status'] == 'midevent'
+    assert table['names'] == ['A', 'B', 'C', 'D']
+    assert list(table['opponent']) == [1, 0, 3, 2]
+    assert list(table['made_attempted'][0]) == [176, 371, 79, 106]
+    assert list(table['made_attempted'][1]) == [-1, -1, -1, -1]
+
+    teams = teams_by_name(table)
+    assert teams['A'] == {'fg_pct': 0.474, 'pts': 484.0, 'to': 68.0}
+    assert teams['B']['fg_pct'] == 0.0
+    assert np.isnan(table['stats'][2, 0])
+
+    rows = team_rows(table)
+    assert rows[0]['fgm'] == 176 and rows[1]['fgm'] is None
+    assert rows[3]['opponent_key'] == '466.l.1.t.3'
+
+    assert scheduled_matchups(table)[1] == {
+        'team1_name': 'C', 'team2_name': 'D',
+        'team1_key': '466.l.1.t.3', 'team2_key': '466.l.1.t.4',
+    }
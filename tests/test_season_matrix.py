@@ -0,0 +1,61 @@
+from payloads import make_scoreboard
+from src.season_matrix import (
+    build_season_tensor, completed_weeks_from_league, completed_weeks_from_store, scheduled_records,
+    season_all_play_records,
+)
+from src.season_store import open_store, save_week
+
+
+def line(level):
+    return {key: str(level) for key in ['fg_pct', 'ft_pct', '3ptm', 'pts', 'reb', 'ast', 'st', 'blk']} | {'to': '5'}
+
+
+def test_all_play_and_scheduled_records():
+    conn = open_store(':memory:')
+    # Week 1: A(3) v B(2), C(1) v D(4). Week 2: A v C, B v D. Week 3 still live.
+    save_week(conn, '466.l.1', 1, make_scoreboard(1, [(1, 'A', line(3)), (2, 'B', line(2)),
+                                           (3, 'C', line(1)), (4, 'D', line(4))]))
+    save_week(conn, '466.l.1', 2, make_scoreboard(2, [(1, 'A', line(1)), (3, 'C', line(2)),
+                                           (2, 'B', line(3)), (4, 'D', line(4))]))
+    save_week(conn, '466.l.1', 3, make_scoreboard(3, [(1, 'A', line(9)), (2, 'B', line(1)),
+                                           (3, 'C', line(1)), (4, 'D', line(1))], status='midevent'))
+
+    tensor = build_season_tensor(completed_weeks_from_store(conn, '466.l.1'))
+    assert tensor['weeks'] == [1, 2]
+    assert tensor['team_names'] == ['A', 'B', 'C', 'D']
+
+    records = season_all_play_records(tensor)
+    # D is best both weeks: beats all 3 opponents in 8 categories, ties TO
+    assert records['466.l.1.t.4']['wins'] == 6
+    assert records['466.l.1.t.4']['cat_wins'] == 48
+    assert records['466.l.1.t.4']['expected_wins'] == 16.0
+    # A: 2nd in week 1 (2-1), last in week 2 (0-3)
+    assert (records['466.l.1.t.1']['wins'], records['466.l.1.t.1']['losses']) == (2, 4)
+
+    scheduled = scheduled_records(tensor)
+    assert scheduled['466.l.1.t.1'] == {'wins': 8, 'losses': 8, 'ties': 2}
+    assert scheduled['466.l.1.t.3'] == {'wins': 8, 'losses': 8, 'ties': 2}
+
+
+class League:
+    def __init__(self, scoreboards):
+        self.scoreboards = scoreboards
+
+    def current_week(self):
+        return len(self.scoreboards)
+
+    def matchups(self, week=None):
+        return self.scoreboards[week - 1]
+
+
+def test_fg_pct_is_compared_from_makes_and_attempts():
+    # Both round to .450, but A's 4501/10000 beats B's 4499/10000: A wins FG% only
+    a = line(2) | {'fgm_fga': '4501/10000', 'fg_pct': '.450'}
+    b = line(2) | {'fgm_fga': '4499/10000', 'fg_pct': '.450'}
+    raw = make_scoreboard(1, [(1, 'A', a), (2, 'B', b)])
+
+    conn = open_store(':memory:')
+    save_week(conn, '466.l.1', 1, raw)
+    for season_rows in (completed_weeks_from_store(conn, '466.l.1'), completed_weeks_from_league(League([raw]))):
+        tensor = build_season_tensor(season_rows)
+        assert tensor['wins'][0, 0, 1] == 1 and tensor['losses'][0, 1, 0] == 1
@@ -0,0 +1,88 @@
+import io
+import json
+
+from payloads import make_scoreboard
+from src.ingest import iter_team_weeks
+from src.season_store import (
+    open_store, sync, weeks_to_sync, load_teams_by_name, load_matchups, load_week_rows, week_statuses,
+    ingest_rows,
+)
+
+
+def stats(pts):
+    return {
+        'fgm_fga': '176/371', 'fg_pct': '.474', 'ftm_fta': '79/106', 'ft_pct': '.745',
+        '3ptm': '53', 'pts': str(pts), 'reb': '171', 'ast': '103', 'st': '38', 'blk': '19', 'to': '68',
+    }
+
+
+class FakeLeague:
+    def __init__(self, current_week, statuses, league_id='466.l.1', pts=484):
+        self.current = current_week
+        self.statuses = statuses
+        self.league_id = league_id
+        self.pts = pts
+        self.calls = []
+
+    def current_week(self):
+        return self.current
+
+    def matchups(self, week=None):
+        self.calls.append(week)
+        return make_scoreboard(week, [(1, 'A', stats(self.pts)), (2, 'B', stats(450))],
+                               status=self.statuses.get(week, 'postevent'), league_key=self.league_id)
+
+
+def test_sync_only_fetches_missing_or_live_weeks():
+    conn = open_store(':memory:')
+    lg = FakeLeague(3, {3: 'midevent'})
+
+    assert sync(lg, conn) == [1, 2, 3]
+    assert weeks_to_sync(conn, '466.l.1', 3) == [3]
+
+    lg.current = 4
+    assert sync(lg, conn) == [3, 4]
+    assert sorted(lg.calls) == [1, 2, 3, 3, 4]
+
+
+def test_stored_week_round_trips():
+    conn = open_store(':memory:')
+    sync(FakeLeague(1, {}), conn)
+
+    teams = load_teams_by_name(conn, '466.l.1', 1)
+    assert teams['A']['pts'] == 484.0
+    assert teams['B']['fg_pct'] == 0.474
+
+    row = load_week_rows(conn, '466.l.1', 1)[0]
+    assert (row['fgm'], row['fga'], row['ftm'], row['fta']) == (176, 371, 79, 106)
+
+    assert load_matchups(conn, '466.l.1', 1) == [{
+        'team1_name': 'A', 'team2_name': 'B',
+        'team1_key': '466.l.1.t.1', 'team2_key': '466.l.1.t.2',
+    }]
+
+
+def test_leagues_with_overlapping_weeks_stay_apart():
+    conn = open_store(':memory:')
+    first = FakeLeague(3, {3: 'midevent'}, league_id='466.l.1', pts=484)
+    second = FakeLeague(3, {}, league_id='428.l.9', pts=300)
+
+    sync(first, conn)
+    sync(second, conn)
+
+    assert week_statuses(conn, '466.l.1') == {1: 'postevent', 2: 'postevent', 3: 'midevent'}
+    assert week_statuses(conn, '428.l.9') == {1: 'postevent', 2: 'postevent', 3: 'postevent'}
+    assert weeks_to_sync(conn, '466.l.1', 3) == [3]
+    assert weeks_to_sync(conn, '428.l.9', 3) == []
+
+    assert load_teams_by_name(conn, '466.l.1', 3)['A']['pts'] == 484.0
+    assert load_teams_by_name(conn, '428.l.9', 3)['A']['pts'] == 300.0
+    assert [row['team_key'] for row in load_week_rows(conn, '466.l.1', 3)] == ['466.l.1.t.1', '466.l.1.t.2']
+    assert load_matchups(conn, '428.l.9', 2)[0]['team1_key'] == '428.l.9.t.1'
+
+    # Streamed rows are scoped by their team keys too
+    raw = make_scoreboard(2, [(1, 'A', stats(999)), (2, 'B', stats(1))], league_key='428.l.9')
+    assert ingest_rows(conn, iter_team_weeks(io.BytesIO(json.dumps(raw).encode()))) == 2
+    assert load_teams_by_name(conn, '428.l.9', 2)['A']['pts'] == 999.0
+    assert load_teams_by_name(conn, '466.l.1', 2)['A']['pts'] == 484.0
+
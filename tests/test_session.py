@@ -0,0 +1,112 @@
+import json
+import threading
+import time
+
+import pytest
+
+import src.session as session
+from src.scheduler import RequestScheduler
+
+
+class FakeOAuth:
+    """Stands in for yahoo_oauth.OAuth2: a token, a session and a refresh call."""
+
+    def __init__(self, from_file, age):
+        self.from_file = from_file
+        self.token_time = time.time() - age
+        self.access_token = 'old'
+        self.session = type('Session', (), {'access_token': 'old'})()
+        self.refresh_lock = threading.Lock()
+        self.refreshes = 0
+
+    def refresh_access_token(self):
+        self.refreshes += 1
+        self.token_time = time.time()
+        self.access_token = f'new{self.refreshes}'
+        return {'access_token': self.access_token, 'token_time': self.token_time}
+
+
+@pytest.fixture
+def creds(tmp_path):
+    path = tmp_path / 'oauth2.json'
+    path.write_text(json.dumps({'consumer_key': 'k', 'access_token': 'old'}))
+    return str(path)
+
+
+def test_fresh_token_is_left_alone(creds):
+    sc = FakeOAuth(creds, age=60)
+    session.ensure_fresh(sc)
+    assert sc.refreshes == 0
+
+
+def test_refreshes_early_and_updates_session_and_file(creds):
+    sc = FakeOAuth(creds, age=session.TOKEN_LIFETIME - session.REFRESH_MARGIN + 5)
+    session.ensure_fresh(sc)
+
+    assert sc.refreshes == 1
+    assert sc.session.access_token == 'new1'
+    saved = json.load(open(creds))
+    assert saved['access_token'] == 'new1' and saved['consumer_key'] == 'k'
+
+
+def test_requests_do_not_wait_on_an_early_refresh(creds):
+    sc = FakeOAuth(creds, age=session.TOKEN_LIFETIME - session.REFRESH_MARGIN + 5)
+    sc.refresh_lock.acquire()  # another thread is mid-refresh
+    session.ensure_fresh(sc)   # returns at once: the old token is still good
+    assert sc.refreshes == 0
+
+
+def test_one_session_per_credentials_file(creds, monkeypatch):
+    opened = []
+    monkeypatch.setattr(session, '_sessions', {})
+    monkeypatch.setattr(session, 'open_oauth', lambda from_file: opened.append(from_file) or object())
+
+    assert session.shared_oauth(creds) is session.shared_oauth(creds)
+    assert len(opened) == 1
+
+
+def test_handler_fetches_settings_once(monkeypatch):
+    fetched = []
+    monkeypatch.setattr(session.SessionHandler, '_request', lambda self, uri: fetched.append(uri) or {'uri': uri})
+    sc = FakeOAuth(None, age=60)
+    handler = session.SessionHandler(sc)
+
+    for _ in range(2):
+        handler.get('league/1/settings')
+        handler.get('league/1/scoreboard')
+
+    assert fetched == ['league/1/settings', 'league/1/scoreboard', 'league/1/scoreboard']
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b'error'
+
+    def json(self):
+        return {'ok': True}
+
+
+def test_handler_retries_throttled_requests():
+    sc = FakeOAuth(None, age=60)
+    responses = [FakeResponse(999), FakeResponse(429, {'Retry-After': '2'}), FakeResponse(200)]
+    sc.session.get = lambda url, params: responses.pop(0)
+    delays = []
+    scheduler = RequestScheduler(rate=1000, sleep=delays.append, jitter=lambda: 0.5)
+    handler = session.SessionHandler(sc, scheduler)
+
+    assert handler.get('league/1/scoreboard') == {'ok': True}
+    assert delays == [0.5, 2.0]
+    assert scheduler.stats()['throttled'] == 2
+    assert scheduler.stats()['retried'] == 2
+
+
+def test_handler_raises_client_errors_at_once():
+    sc = FakeOAuth(None, age=60)
+    sc.session.get = lambda url, params: FakeResponse(400)
+    scheduler = RequestScheduler(rate=1000, sleep=lambda s: None)
+
+    with pytest.raises(RuntimeError):
+        session.SessionHandler(sc, scheduler).get('league/1/scoreboard')
+    assert scheduler.stats()['requests'] == 1
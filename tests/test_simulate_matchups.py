@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from src.simulate_matchups import fit_team, simulate_grid, simulate_pairs, team_histories
+
+
+def rows(week, base):
+    return [
+        {'team_key': 'a', 'name': 'A', 'fgm': 50, 'fga': 100, 'ftm': 20, 'fta': 25, '3ptm': base,
+         'pts': 10 * base + week, 'reb': 40, 'ast': 20, 'st': 8, 'blk': 5, 'to': 12},
+        {'team_key': 'b', 'name': 'B', 'fgm': 40, 'fga': 100, 'ftm': 15, 'fta': 25, '3ptm': base - 5,
+         'pts': 10 * base - 20 + 2 * week, 'reb': 42, 'ast': 18, 'st': 8, 'blk': 6, 'to': 15},
+    ]
+
+
+def fits():
+    histories, names = team_histories({w: rows(w, 30 + w) for w in range(1, 5)})
+    assert names == {'a': 'A', 'b': 'B'}
+    return {team_key: fit_team(history) for team_key, history in histories.items()}
+
+
+def test_results_are_reproducible_and_sum_to_one():
+    first = simulate_pairs(fits(), [('a', 'b')], draws=5000, seed=7, max_workers=1)[0]
+    second = simulate_pairs(fits(), [('a', 'b')], draws=5000, seed=7, max_workers=1)[0]
+
+    assert first == second
+    assert first['team1_win'] + first['tie'] + first['team2_win'] == pytest.approx(1.0)
+    # A always shoots better and turns it over less
+    assert first['category_win']['fg_pct'] == 1.0
+    assert first['category_win']['to'] == 1.0
+
+
+def test_grid_is_complementary_across_workers():
+    grid = simulate_grid(fits(), ['a', 'b'], draws=2000, seed=1, max_workers=2)
+    assert np.isnan(grid[0, 0])
+    assert grid[0, 1] + grid[1, 0] == pytest.approx(1.0)
+    assert grid[0, 1] > 0.5
@@ -0,0 +1,5 @@
+from src.benchmark import import_offline_modules
+
+
+def test_offline_modules_do_not_import_network_stack():
+    assert import_offline_modules()['loaded'] == []
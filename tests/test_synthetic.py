@@ -0,0 +1,32 @@
+from src.benchmark import compare_results, run_benchmarks
+from src.scoreboard import parse_scoreboard, team_rows
+from src.synthetic import generate_league, round_robin
+
+
+def test_round_robin_meets_everyone_once():
+    weeks = [round_robin(8, week) for week in range(1, 8)]
+    for pairs in weeks:
+        assert sorted(team for pair in pairs for team in pair) == list(range(8))
+    met = {frozenset(pair) for pairs in weeks for pair in pairs}
+    assert len(met) == 8 * 7 // 2
+
+
+def test_generated_league_parses_and_is_seeded():
+    scoreboards = generate_league(6, 3, seed=1, live_week=3)
+    assert generate_league(6, 3, seed=1, live_week=3) == scoreboards
+    assert sorted(scoreboards) == [1, 2, 3]
+
+    table = parse_scoreboard(scoreboards[3])
+    assert table['week'] == 3 and table['status'] == 'midevent'
+    for row in team_rows(table):
+        assert row['pts'] == 2 * row['fgm'] + row['3ptm'] + row['ftm']
+        assert abs(row['fg_pct'] - row['fgm'] / row['fga']) < 0.001
+
+
+def test_benchmark_document_and_regressions():
+    document = run_benchmarks([4], num_weeks=3, repeat=1, seed=1)
+    assert {r['stage'] for r in document['results']} == {'parse', 'matrix', 'rankings', 'insights', 'predict'}
+
+    slower = {**document, 'results': [dict(r, best=r['best'] * 2) for r in document['results']]}
+    assert compare_results(document, slower) == []
+    assert len(compare_results(slower, document, threshold=1.5)) == 5
@@ -0,0 +1,64 @@
+import numpy as np
+
+from src.deltas import category_lines
+from src.matrix_engine import (
+    all_play_records, category_ranks, matchup_outcomes, possibility_matrices,
+    replace_in_reference, sorted_reference, update_rows,
+)
+from src.trade_impact import evaluate_trade, player_counts, trade_baseline
+
+
+def random_counts(rng, n):
+    counts = rng.integers(5, 60, size=(n, 11)).astype(float)
+    counts[:, 1] = counts[:, 0] + rng.integers(1, 60, size=n)  # fga > fgm
+    counts[:, 3] = counts[:, 2] + rng.integers(1, 30, size=n)  # fta > ftm
+    return counts
+
+
+def test_trade_matches_full_rebuild():
+    rng = np.random.default_rng(5)
+    counts = random_counts(rng, 10)
+    keys = [f't{i}' for i in range(10)]
+    base = trade_baseline(keys, counts)
+    per_week = {1: random_counts(rng, 1)[0] / 3, 2: random_counts(rng, 1)[0] / 3}
+
+    result = evaluate_trade(base, 't2', [1], 't7', [2], per_week)
+
+    traded = counts.copy()
+    traded[2] += per_week[2] - per_week[1]
+    traded[7] += per_week[1] - per_week[2]
+    rebuilt = trade_baseline(keys, traded)
+
+    assert np.array_equal(result['records'], rebuilt['records'])
+    assert np.array_equal(result['ranks'], rebuilt['ranks'][[2, 7]])
+    assert np.array_equal(result['wins'], rebuilt['matrix']['wins'][[2, 7]])
+    # The baseline is untouched, so it can score the next candidate
+    assert np.array_equal(base['counts'], counts)
+
+
+def test_update_rows_and_reference_match_rebuild():
+    rng = np.random.default_rng(8)
+    values = category_lines(random_counts(rng, 8))
+    wins, losses, ties = possibility_matrices(values)
+    matrix = {'wins': wins, 'losses': losses, 'ties': ties}
+    reference = sorted_reference(values)
+
+    new_values = values.copy()
+    new_values[[1, 4]] = category_lines(random_counts(rng, 2))
+    update_rows(matrix, new_values, [1, 4])
+    reference = replace_in_reference(reference, values[[1, 4]], new_values[[1, 4]])
+
+    expected = possibility_matrices(new_values)
+    assert np.array_equal(matrix['wins'], expected[0])
+    assert np.array_equal(matrix['ties'], expected[2])
+    assert all(np.array_equal(a, b) for a, b in zip(reference, sorted_reference(new_values)))
+    assert np.array_equal(category_ranks(new_values, reference),
+                          category_ranks(new_values, sorted_reference(new_values)))
+    assert all_play_records(matchup_outcomes(matrix)).sum(axis=1).tolist() == [7] * 8
+
+
+def test_player_counts_reads_yahoo_names():
+    counts = player_counts({'FGM/A': '40/80', 'FTM/A': '-/-', '3PTM': 12.0, 'PTS': 110.0, 'TO': '-'})
+    assert counts[:4].tolist() == [40, 80, 0, 0]
+    assert counts[4:6].tolist() == [12.0, 110.0]
+    assert counts[-1] == 0.0